@@ -0,0 +1,223 @@
+from array import array
+from . import Util
+from .Vector3 import Vector3
+from .Matrix4 import Matrix4
+from .Vector3Array import Vector3Array
+
+_INF = float('inf')
+
+class AABB(object):
+    '''An axis-aligned bounding box given by its min and max corners.
+
+    A box with min > max on any axis is empty; AABB() is the empty box that
+    grows to fit whatever is added to it. Boxes are closed, so boxes that
+    touch intersect.
+    '''
+    __slots__ = ['min', 'max']
+    __hash__ = None
+
+    def __init__(self, min=None, max=None):
+        assert (min is None) == (max is None)
+        if min is None:
+            self.min = Vector3._new(_INF, _INF, _INF)
+            self.max = Vector3._new(-_INF, -_INF, -_INF)
+        else:
+            assert not Util.VALIDATE or isinstance(min, Vector3) and isinstance(max, Vector3)
+            self.min = min.copy()
+            self.max = max.copy()
+
+    def copy(self):
+        return AABB._new(self.min.x, self.min.y, self.min.z, self.max.x, self.max.y, self.max.z)
+
+    @staticmethod
+    def _new(minx, miny, minz, maxx, maxy, maxz):
+        # trusted constructor for hot paths, the bounds must already be floats
+        b = AABB.__new__(AABB)
+        b.min = Vector3._new(minx, miny, minz)
+        b.max = Vector3._new(maxx, maxy, maxz)
+        return b
+
+    def toBuffer(self, out=None, offset=0):
+        '''Writes min x, y, z, max x, y, z into out at offset, a new array('d') when out is None.'''
+        if out is None:
+            out = array('d', bytes(48))
+        mn = self.min
+        mx = self.max
+        out[offset] = mn.x
+        out[offset + 1] = mn.y
+        out[offset + 2] = mn.z
+        out[offset + 3] = mx.x
+        out[offset + 4] = mx.y
+        out[offset + 5] = mx.z
+        return out
+
+    @staticmethod
+    def fromBuffer(buf, offset=0):
+        '''Reads min x, y, z, max x, y, z from any float buffer or sequence at offset.'''
+        return AABB._new(*[float(v) for v in buf[offset:offset + 6]])
+
+    def __repr__(self):
+        return 'AABB(%r, %r)' % (self.min, self.max)
+
+    def __eq__(self, other):
+        if isinstance(other, AABB):
+            if self.isEmpty or other.isEmpty:
+                return self.isEmpty and other.isEmpty
+            return self.min == other.min and self.max == other.max
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    @property
+    def isEmpty(self):
+        mn = self.min
+        mx = self.max
+        return mn.x > mx.x or mn.y > mx.y or mn.z > mx.z
+
+    @property
+    def center(self):
+        mn = self.min
+        mx = self.max
+        return Vector3._new((mn.x + mx.x) * 0.5, (mn.y + mx.y) * 0.5, (mn.z + mx.z) * 0.5)
+
+    @property
+    def extents(self):
+        '''Half the size along each axis.'''
+        mn = self.min
+        mx = self.max
+        return Vector3._new((mx.x - mn.x) * 0.5, (mx.y - mn.y) * 0.5, (mx.z - mn.z) * 0.5)
+
+    @property
+    def size(self):
+        mn = self.min
+        mx = self.max
+        return Vector3._new(mx.x - mn.x, mx.y - mn.y, mx.z - mn.z)
+
+    def expand(self, point):
+        '''Grows this box in place to contain point.'''
+        assert not Util.VALIDATE or isinstance(point, Vector3)
+        mn = self.min
+        mx = self.max
+        if point.x < mn.x:
+            mn.x = point.x
+        if point.y < mn.y:
+            mn.y = point.y
+        if point.z < mn.z:
+            mn.z = point.z
+        if point.x > mx.x:
+            mx.x = point.x
+        if point.y > mx.y:
+            mx.y = point.y
+        if point.z > mx.z:
+            mx.z = point.z
+        return self
+
+    def union(self, other, out=None):
+        '''The smallest box containing both boxes, written into out when it is given.'''
+        assert not Util.VALIDATE or isinstance(other, AABB)
+        a = self.min
+        b = other.min
+        c = self.max
+        d = other.max
+        if out is None:
+            out = AABB.__new__(AABB)
+            out.min = Vector3.__new__(Vector3)
+            out.max = Vector3.__new__(Vector3)
+        out.min.x = a.x if a.x < b.x else b.x
+        out.min.y = a.y if a.y < b.y else b.y
+        out.min.z = a.z if a.z < b.z else b.z
+        out.max.x = c.x if c.x > d.x else d.x
+        out.max.y = c.y if c.y > d.y else d.y
+        out.max.z = c.z if c.z > d.z else d.z
+        return out
+
+    def contains(self, point):
+        assert not Util.VALIDATE or isinstance(point, Vector3)
+        mn = self.min
+        mx = self.max
+        return mn.x <= point.x <= mx.x and mn.y <= point.y <= mx.y and mn.z <= point.z <= mx.z
+
+    def intersects(self, other):
+        '''True when the boxes overlap or touch, empty boxes intersect nothing.'''
+        assert not Util.VALIDATE or isinstance(other, AABB)
+        a = self.min
+        b = self.max
+        c = other.min
+        d = other.max
+        # a box empty on any axis intersects nothing, like in AABBArray
+        return a.x <= b.x and a.y <= b.y and a.z <= b.z and c.x <= d.x and c.y <= d.y and c.z <= d.z and \
+               a.x <= d.x and c.x <= b.x and a.y <= d.y and c.y <= b.y and a.z <= d.z and c.z <= b.z
+
+    def transform(self, m, out=None):
+        '''The box around this box transformed by m, written into out when it is given.
+
+        Like Matrix4.multiplyPoint the fourth row of m is ignored. The
+        center is transformed and the extents by the absolute values of the
+        upper 3x3 (Arvo), which gives the box of the eight transformed
+        corners, up to rounding, in O(1). An empty box stays empty.
+        '''
+        assert not Util.VALIDATE or isinstance(m, Matrix4)
+        if out is None:
+            out = AABB.__new__(AABB)
+            out.min = Vector3.__new__(Vector3)
+            out.max = Vector3.__new__(Vector3)
+        mn = self.min
+        mx = self.max
+        if self.isEmpty:
+            out.min.set(mn.x, mn.y, mn.z)
+            out.max.set(mx.x, mx.y, mx.z)
+            return out
+        cx = (mn.x + mx.x) * 0.5
+        cy = (mn.y + mx.y) * 0.5
+        cz = (mn.z + mx.z) * 0.5
+        ex = (mx.x - mn.x) * 0.5
+        ey = (mx.y - mn.y) * 0.5
+        ez = (mx.z - mn.z) * 0.5
+        x = m.m11 * cx + m.m12 * cy + m.m13 * cz + m.m14
+        y = m.m21 * cx + m.m22 * cy + m.m23 * cz + m.m24
+        z = m.m31 * cx + m.m32 * cy + m.m33 * cz + m.m34
+        ex, ey, ez = (abs(m.m11) * ex + abs(m.m12) * ey + abs(m.m13) * ez,
+                      abs(m.m21) * ex + abs(m.m22) * ey + abs(m.m23) * ez,
+                      abs(m.m31) * ex + abs(m.m32) * ey + abs(m.m33) * ez)
+        out.min.x = x - ex
+        out.min.y = y - ey
+        out.min.z = z - ez
+        out.max.x = x + ex
+        out.max.y = y + ey
+        out.max.z = z + ez
+        return out
+
+    @staticmethod
+    def empty():
+        return AABB()
+
+    @staticmethod
+    def fromCenterExtents(center, extents):
+        assert not Util.VALIDATE or isinstance(center, Vector3) and isinstance(extents, Vector3)
+        return AABB._new(center.x - extents.x, center.y - extents.y, center.z - extents.z,
+                         center.x + extents.x, center.y + extents.y, center.z + extents.z)
+
+    @staticmethod
+    def fromPoints(points):
+        '''The smallest box containing points, empty when there are none.
+
+        points may be a Vector3Array, a list of Vector3, a flat buffer of
+        x, y, z floats or an Nx3 array.
+        '''
+        if isinstance(points, Vector3Array):
+            points = points.data
+        if not len(points):
+            return AABB()
+        if isinstance(points[0], Vector3):
+            xs = [p.x for p in points]
+            ys = [p.y for p in points]
+            zs = [p.z for p in points]
+        else:
+            d = Util.flatten(points, 3)
+            xs = d[0::3]
+            ys = d[1::3]
+            zs = d[2::3]
+        return AABB._new(float(min(xs)), float(min(ys)), float(min(zs)),
+                         float(max(xs)), float(max(ys)), float(max(zs)))
\ No newline at end of file
@@ -0,0 +1,185 @@
+from array import array
+from itertools import repeat
+from . import Backend, Util
+from .Vector3 import Vector3
+from .Matrix4 import Matrix4
+from .AABB import AABB
+
+class AABBArray(object):
+    '''A packed sequence of axis-aligned boxes.
+
+    Every box is stored as min x, y, z, max x, y, z in a single contiguous
+    array('d'). transform() and overlaps() run through Backend.current(),
+    overlapPairs() finds every overlapping pair with a sort and sweep along
+    x instead of testing all pairs.
+    '''
+    __slots__ = ['data']
+    __hash__ = None
+
+    def __init__(self, data=()):
+        self.data = array('d', data)
+        assert len(self.data) % 6 == 0
+
+    def copy(self):
+        return AABBArray(self.data)
+
+    @property
+    def __array_interface__(self):
+        # lets numpy.asarray share the storage without copying
+        return Util.arrayInterface(self.data, (len(self), 6))
+
+    def __repr__(self):
+        return 'AABBArray(%d)' % len(self)
+
+    def __len__(self):
+        return len(self.data) // 6
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('AABBArray index out of range')
+        j = i * 6
+        d = self.data
+        return AABB._new(d[j], d[j + 1], d[j + 2], d[j + 3], d[j + 4], d[j + 5])
+
+    def __setitem__(self, i, box):
+        assert isinstance(box, AABB)
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('AABBArray index out of range')
+        box.toBuffer(self.data, i * 6)
+
+    def __iter__(self):
+        d = self.data
+        for j in range(0, len(d), 6):
+            yield AABB._new(d[j], d[j + 1], d[j + 2], d[j + 3], d[j + 4], d[j + 5])
+
+    def __eq__(self, other):
+        if isinstance(other, AABBArray):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def append(self, box):
+        assert isinstance(box, AABB)
+        if isinstance(self.data, memoryview):
+            raise TypeError('cannot append to a wrapped buffer, wrapped buffers have a fixed size; append to a copy()')
+        self.data.extend((box.min.x, box.min.y, box.min.z, box.max.x, box.max.y, box.max.z))
+        return self
+
+    def toBoxes(self):
+        '''Returns the content as a list of AABB.'''
+        return list(self)
+
+    @property
+    def bounds(self):
+        '''The box around all boxes, empty boxes are ignored.'''
+        d = self.data
+        xs = [i for i in range(0, len(d), 6)
+              if d[i] <= d[i + 3] and d[i + 1] <= d[i + 4] and d[i + 2] <= d[i + 5]]
+        if not xs:
+            return AABB()
+        return AABB._new(min(d[i] for i in xs), min(d[i + 1] for i in xs), min(d[i + 2] for i in xs),
+                         max(d[i + 3] for i in xs), max(d[i + 4] for i in xs), max(d[i + 5] for i in xs))
+
+    def transform(self, m):
+        '''Every box transformed by m like AABB.transform, as a new AABBArray.'''
+        assert not Util.VALIDATE or isinstance(m, Matrix4)
+        return AABBArray._fromData(Backend.current().transformBoxes(m.toBuffer(), self.data))
+
+    def overlaps(self, box):
+        '''An array('B') holding 1 for every box that intersects box, else 0.'''
+        assert not Util.VALIDATE or isinstance(box, AABB)
+        return Backend.current().overlapBoxes(box.toBuffer(), self.data)
+
+    def overlapPairs(self, other=None):
+        '''The (i, j) index pairs of intersecting boxes, sorted.
+
+        With other, i indexes this array and j other; without, the pairs
+        i < j of this array are returned. The boxes are swept in order of
+        min x, so only boxes whose x ranges overlap are compared.
+        '''
+        if other is None:
+            return sorted(_sweep(self.data, None))
+        assert isinstance(other, AABBArray)
+        return sorted(_sweep(self.data, other.data))
+
+    @staticmethod
+    def fromBoxes(boxes):
+        '''Packs a sequence of AABB.'''
+        data = array('d')
+        for b in boxes:
+            data.extend((b.min.x, b.min.y, b.min.z, b.max.x, b.max.y, b.max.z))
+        return AABBArray._fromData(data)
+
+    @staticmethod
+    def fromBuffer(buf):
+        '''Wraps buf, min x, y, z, max x, y, z floats per box, without copying.
+
+        array('d'), memoryview and NumPy float64 buffers are shared, other
+        inputs are copied. A wrapped buffer has a fixed size.
+        '''
+        return AABBArray._fromData(Util.asBuffer(buf, 6))
+
+    @staticmethod
+    def fromCenterExtents(centers, extents):
+        '''Boxes from packed centers and extents, either may be a single Vector3.'''
+        assert not (isinstance(centers, Vector3) and isinstance(extents, Vector3))
+        data = array('d')
+        extend = data.extend
+        for cx, cy, cz, ex, ey, ez in zip(*(_columns(centers) + _columns(extents))):
+            extend((cx - ex, cy - ey, cz - ez, cx + ex, cy + ey, cz + ez))
+        return AABBArray._fromData(data)
+
+    @staticmethod
+    def _fromData(data):
+        # wraps data without copying
+        assert len(data) % 6 == 0
+        a = AABBArray.__new__(AABBArray)
+        a.data = data
+        return a
+
+
+def _columns(v):
+    # the x, y and z columns of a Vector3Array, a single Vector3 repeats
+    if isinstance(v, Vector3):
+        return [repeat(v.x), repeat(v.y), repeat(v.z)]
+    d = v.data
+    return [d[0::3], d[1::3], d[2::3]]
+
+def _boxes(d, side):
+    # (min x, side, index, min y, min z, max x, max y, max z) of every box
+    return [(d[j], side, j // 6, d[j + 1], d[j + 2], d[j + 3], d[j + 4], d[j + 5])
+            for j in range(0, len(d), 6)]
+
+def _sweep(a, b):
+    # the intersecting pairs of the boxes of a and b, or of a with itself
+    boxes = _boxes(a, 0)
+    if b is not None:
+        boxes += _boxes(b, 1)
+    boxes.sort()
+    # the boxes of each side that may still overlap the current min x
+    active = ([], [])
+    pairs = []
+    for box in boxes:
+        x0, side, i, y0, z0, x1, y1, z1 = box
+        if x0 > x1 or y0 > y1 or z0 > z1:
+            continue
+        others = active[0] if b is None else active[1 - side]
+        others[:] = [c for c in others if c[5] >= x0]
+        for c in others:
+            if c[3] <= y1 and y0 <= c[6] and c[4] <= z1 and z0 <= c[7]:
+                j = c[2]
+                if b is None:
+                    pairs.append((j, i) if j < i else (i, j))
+                else:
+                    pairs.append((j, i) if side else (i, j))
+        active[side].append(box)
+    return pairs
\ No newline at end of file
@@ -0,0 +1,499 @@
+import heapq
+from array import array
+from . import Util
+from .Vector3 import Vector3
+from .Vector3Array import Vector3Array
+from .Ray import Ray, _triangle
+
+_INF = float('inf')
+
+# bins of the surface area heuristic
+_BINS = 16
+
+class BVH(object):
+    '''A bounding volume hierarchy over points or triangles.
+
+    fromPoints and fromTriangles build the tree over a vertex buffer. It is
+    stored in flat arrays: node i has its box (min x, y, z, max x, y, z) at
+    bounds[6i:6i + 6] and (first, count) at nodes[2i:2i + 2]. A leaf holds
+    the primitives order[first:first + count]. An inner node has count 0,
+    its left child at i + 1 and its right child at first. Queries walk the
+    nodes with squared distances on plain floats, creating no Vector3 per
+    visited node. Distances of triangles are to their closest point.
+    '''
+    __slots__ = ['data', 'indices', 'order', 'nodes', 'bounds', 'leafSize']
+    __hash__ = None
+
+    def __repr__(self):
+        return 'BVH(%d %s, %d nodes)' % (len(self), 'triangles' if self.indices is not None else 'points',
+                                        self.nodeCount)
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def nodeCount(self):
+        return len(self.nodes) // 2
+
+    def nearest(self, point, maxDistance=None):
+        '''(index, squared distance) of the primitive nearest to point, None when there is none.
+
+        Only primitives closer than maxDistance are considered when it is given.
+        '''
+        result = self.kNearest(point, 1, maxDistance)
+        return result[0] if result else None
+
+    def kNearest(self, point, k, maxDistance=None):
+        '''The (index, squared distance) pairs of the k primitives nearest to point, nearest first.'''
+        px, py, pz = _xyz(point)
+        limit = _INF if maxDistance is None else maxDistance * maxDistance
+        bounds = self.bounds
+        nodes = self.nodes
+        order = self.order
+        distance = self._distanceSquared
+        # a max-heap of (-squared distance, -index) of the best k so far
+        best = []
+        stack = [0] if len(order) and k > 0 else []
+        while stack:
+            i = stack.pop()
+            if _boxDistanceSquared(bounds, 6 * i, px, py, pz) > limit:
+                continue
+            first = nodes[2 * i]
+            count = nodes[2 * i + 1]
+            if count:
+                for j in order[first:first + count]:
+                    d = distance(j, px, py, pz)
+                    if d <= limit:
+                        if len(best) < k:
+                            heapq.heappush(best, (-d, -j))
+                        elif (-d, -j) > best[0]:
+                            heapq.heapreplace(best, (-d, -j))
+                        if len(best) == k:
+                            limit = -best[0][0]
+            else:
+                # the nearer child is visited first
+                left = i + 1
+                if _boxDistanceSquared(bounds, 6 * left, px, py, pz) <= \
+                   _boxDistanceSquared(bounds, 6 * first, px, py, pz):
+                    stack.append(first)
+                    stack.append(left)
+                else:
+                    stack.append(left)
+                    stack.append(first)
+        return [(-j, -d) for d, j in sorted(best, reverse=True)]
+
+    def withinRadius(self, point, radius):
+        '''The indices of the primitives within radius of point, ascending.'''
+        px, py, pz = _xyz(point)
+        limit = radius * radius
+        bounds = self.bounds
+        nodes = self.nodes
+        order = self.order
+        distance = self._distanceSquared
+        result = []
+        stack = [0] if len(order) else []
+        while stack:
+            i = stack.pop()
+            if _boxDistanceSquared(bounds, 6 * i, px, py, pz) > limit:
+                continue
+            first = nodes[2 * i]
+            count = nodes[2 * i + 1]
+            if count:
+                result.extend(j for j in order[first:first + count] if distance(j, px, py, pz) <= limit)
+            else:
+                stack.append(first)
+                stack.append(i + 1)
+        result.sort()
+        return result
+
+    def raycast(self, origin, direction=None, maxDistance=None):
+        '''(index, t, u, v) of the first triangle hit by the ray origin + t * direction, None on a miss.
+
+        origin may also be a Ray, without direction. Hits with
+        0 <= t <= maxDistance count, t is in units of the length of
+        direction and u, v are the barycentrics of Ray.intersectTriangle.
+        Both sides of a triangle are hit. Only for trees built with
+        fromTriangles.
+        '''
+        if self.indices is None:
+            raise TypeError('raycast needs a BVH of triangles')
+        if isinstance(origin, Ray):
+            assert direction is None
+            origin, direction = origin.origin, origin.direction
+        ox, oy, oz = _xyz(origin)
+        dx, dy, dz = _xyz(direction)
+        ix = 1.0 / dx if dx != 0.0 else _INF
+        iy = 1.0 / dy if dy != 0.0 else _INF
+        iz = 1.0 / dz if dz != 0.0 else _INF
+        limit = _INF if maxDistance is None else maxDistance
+        bounds = self.bounds
+        nodes = self.nodes
+        order = self.order
+        data = self.data
+        indices = self.indices
+        hit = None
+        stack = [0] if len(order) else []
+        while stack:
+            i = stack.pop()
+            if _slab(bounds, 6 * i, ox, oy, oz, ix, iy, iz) > limit:
+                continue
+            first = nodes[2 * i]
+            count = nodes[2 * i + 1]
+            if count:
+                for j in order[first:first + count]:
+                    a = 3 * indices[3 * j]
+                    b = 3 * indices[3 * j + 1]
+                    c = 3 * indices[3 * j + 2]
+                    tuv = _triangle(ox, oy, oz, dx, dy, dz,
+                                    data[a], data[a + 1], data[a + 2],
+                                    data[b], data[b + 1], data[b + 2],
+                                    data[c], data[c + 1], data[c + 2])
+                    if tuv is not None and tuv[0] <= limit:
+                        limit = tuv[0]
+                        hit = (j,) + tuv
+            else:
+                stack.append(first)
+                stack.append(i + 1)
+        return hit
+
+    def refit(self, points=None):
+        '''Recomputes the boxes bottom-up after the vertices moved, keeping the tree.
+
+        The tree sees moves made in place to the buffer it was built from;
+        points replaces the vertex buffer with one of the same size. A
+        refitted tree answers queries correctly, but it slows down when the
+        vertices move far from where it was built.
+        '''
+        if points is not None:
+            data = _vertices(points)
+            assert len(data) == len(self.data)
+            self.data = data
+        bounds = self.bounds
+        nodes = self.nodes
+        # children come after their parent
+        for i in range(self.nodeCount - 1, -1, -1):
+            first = nodes[2 * i]
+            count = nodes[2 * i + 1]
+            k = 6 * i
+            if count:
+                bounds[k:k + 6] = array('d', _union(self._primitiveBounds(j) for j in self.order[first:first + count]))
+            else:
+                bounds[k:k + 6] = array('d', _union((bounds[6 * (i + 1):6 * (i + 2)], bounds[6 * first:6 * first + 6])))
+        return self
+
+    @staticmethod
+    def fromPoints(points, leafSize=4, split='median'):
+        '''Builds a tree over points.
+
+        points is a Vector3Array, whose buffer is shared so refit() sees
+        moved points, a list of Vector3, or a flat buffer of x, y, z floats.
+        split is 'median', which halves every node along its longest axis,
+        or 'sah', the binned surface area heuristic.
+        '''
+        bvh = BVH.__new__(BVH)
+        bvh.data = _vertices(points)
+        bvh.indices = None
+        bvh._build(leafSize, split)
+        return bvh
+
+    @staticmethod
+    def fromTriangles(vertices, indices=None, leafSize=4, split='median'):
+        '''Builds a tree over triangles, see fromPoints.
+
+        indices holds three vertex indices per triangle; without it every
+        three consecutive vertices form a triangle.
+        '''
+        bvh = BVH.__new__(BVH)
+        bvh.data = _vertices(vertices)
+        if indices is None:
+            indices = range(len(bvh.data) // 3)
+        bvh.indices = array('q', indices)
+        assert len(bvh.indices) % 3 == 0
+        bvh._build(leafSize, split)
+        return bvh
+
+    def _build(self, leafSize, split):
+        if split not in ('median', 'sah'):
+            raise ValueError('unknown split %r, expected \'median\' or \'sah\'' % (split,))
+        assert leafSize > 0
+        self.leafSize = leafSize
+        n = len(self.indices) // 3 if self.indices is not None else len(self.data) // 3
+        boxes = array('d')
+        for j in range(n):
+            boxes.extend(self._primitiveBounds(j))
+        centroids = array('d', [(boxes[6 * j + k] + boxes[6 * j + k + 3]) * 0.5
+                                for j in range(n) for k in (0, 1, 2)])
+        order = list(range(n))
+        nodes = array('q')
+        bounds = array('d')
+        # (start, end, parent waiting for its right child or -1), depth first
+        tasks = [(0, n, -1)] if n else []
+        while tasks:
+            start, end, parent = tasks.pop()
+            i = len(nodes) // 2
+            if parent >= 0:
+                nodes[2 * parent] = i
+            bounds.extend(_union(boxes[6 * j:6 * j + 6] for j in order[start:end]))
+            mid = None
+            if end - start > leafSize:
+                mid = _split(order, start, end, centroids, boxes, split)
+            if mid is None:
+                nodes.extend((start, end - start))
+            else:
+                nodes.extend((0, 0))
+                tasks.append((mid, end, i))
+                tasks.append((start, mid, -1))
+        self.order = array('q', order)
+        self.nodes = nodes
+        self.bounds = bounds
+
+    def _primitiveBounds(self, j):
+        d = self.data
+        if self.indices is None:
+            k = 3 * j
+            return (d[k], d[k + 1], d[k + 2], d[k], d[k + 1], d[k + 2])
+        a = 3 * self.indices[3 * j]
+        b = 3 * self.indices[3 * j + 1]
+        c = 3 * self.indices[3 * j + 2]
+        return (min(d[a], d[b], d[c]), min(d[a + 1], d[b + 1], d[c + 1]), min(d[a + 2], d[b + 2], d[c + 2]),
+                max(d[a], d[b], d[c]), max(d[a + 1], d[b + 1], d[c + 1]), max(d[a + 2], d[b + 2], d[c + 2]))
+
+    def _distanceSquared(self, j, px, py, pz):
+        d = self.data
+        if self.indices is None:
+            k = 3 * j
+            # the expression of Vector3.lengthSquared, for identical results
+            return (d[k] - px) ** 2 + (d[k + 1] - py) ** 2 + (d[k + 2] - pz) ** 2
+        a = 3 * self.indices[3 * j]
+        b = 3 * self.indices[3 * j + 1]
+        c = 3 * self.indices[3 * j + 2]
+        return _triangleDistanceSquared(px, py, pz,
+                                        d[a], d[a + 1], d[a + 2],
+                                        d[b], d[b + 1], d[b + 2],
+                                        d[c], d[c + 1], d[c + 2])
+
+
+def _xyz(v):
+    if isinstance(v, Vector3):
+        return v.x, v.y, v.z
+    x, y, z = v
+    return float(x), float(y), float(z)
+
+def _vertices(points):
+    # the flat x, y, z buffer of points, a Vector3Array's is shared
+    if isinstance(points, Vector3Array):
+        return points.data
+    if len(points) and isinstance(points[0], Vector3):
+        return Vector3Array.fromVectors(points).data
+    return Util.asBuffer(points, 3)
+
+def _union(boxes):
+    x0 = y0 = z0 = _INF
+    x1 = y1 = z1 = -_INF
+    for minx, miny, minz, maxx, maxy, maxz in boxes:
+        if minx < x0:
+            x0 = minx
+        if miny < y0:
+            y0 = miny
+        if minz < z0:
+            z0 = minz
+        if maxx > x1:
+            x1 = maxx
+        if maxy > y1:
+            y1 = maxy
+        if maxz > z1:
+            z1 = maxz
+    return (x0, y0, z0, x1, y1, z1)
+
+def _split(order, start, end, centroids, boxes, split):
+    # reorders order[start:end] into two halves, returns where the second
+    # starts, None when the centroids cannot be separated
+    c = _union((centroids[3 * j], centroids[3 * j + 1], centroids[3 * j + 2]) * 2 for j in order[start:end])
+    extents = (c[3] - c[0], c[4] - c[1], c[5] - c[2])
+    axis = extents.index(max(extents))
+    if not extents[axis] > 0.0:
+        return None
+    if split == 'sah':
+        mid = _splitSAH(order, start, end, centroids, boxes, axis, c[axis], extents[axis])
+        if mid is not None:
+            return mid
+    part = order[start:end]
+    part.sort(key=lambda j: centroids[3 * j + axis])
+    order[start:end] = part
+    return (start + end) // 2
+
+def _splitSAH(order, start, end, centroids, boxes, axis, low, extent):
+    # partitions at the bin boundary of the lowest surface area cost
+    scale = _BINS / extent
+    counts = [0] * _BINS
+    binned = [[] for _ in range(_BINS)]
+    bins = []
+    for j in order[start:end]:
+        b = min(_BINS - 1, int((centroids[3 * j + axis] - low) * scale))
+        bins.append(b)
+        counts[b] += 1
+        binned[b].append(boxes[6 * j:6 * j + 6])
+    binBounds = [_union(b) for b in binned]
+    # cost of splitting after bin b, from the left and from the right
+    left = []
+    box = (_INF, _INF, _INF, -_INF, -_INF, -_INF)
+    count = 0
+    for b in range(_BINS - 1):
+        box = _union((box, binBounds[b]))
+        count += counts[b]
+        left.append(_area(box) * count)
+    best = None
+    box = (_INF, _INF, _INF, -_INF, -_INF, -_INF)
+    count = 0
+    for b in range(_BINS - 1, 0, -1):
+        box = _union((box, binBounds[b]))
+        count += counts[b]
+        cost = left[b - 1] + _area(box) * count
+        if count < end - start and (best is None or cost < best[0]):
+            best = (cost, b)
+    if best is None:
+        return None
+    cut = best[1]
+    part = order[start:end]
+    order[start:end] = [j for j, b in zip(part, bins) if b < cut] + [j for j, b in zip(part, bins) if b >= cut]
+    mid = start + sum(counts[:cut])
+    return mid if start < mid < end else None
+
+def _area(box):
+    x = box[3] - box[0]
+    y = box[4] - box[1]
+    z = box[5] - box[2]
+    if x < 0.0:
+        return 0.0
+    return x * y + y * z + z * x
+
+def _boxDistanceSquared(bounds, k, px, py, pz):
+    # squared distance from p to the box at bounds[k], 0 inside
+    d = 0.0
+    v = bounds[k] - px
+    if v > 0.0:
+        d += v * v
+    else:
+        v = px - bounds[k + 3]
+        if v > 0.0:
+            d += v * v
+    v = bounds[k + 1] - py
+    if v > 0.0:
+        d += v * v
+    else:
+        v = py - bounds[k + 4]
+        if v > 0.0:
+            d += v * v
+    v = bounds[k + 2] - pz
+    if v > 0.0:
+        d += v * v
+    else:
+        v = pz - bounds[k + 5]
+        if v > 0.0:
+            d += v * v
+    return d
+
+def _slab(bounds, k, ox, oy, oz, ix, iy, iz):
+    # the entry t of the ray into the box at bounds[k], inf on a miss
+    near = 0.0
+    far = _INF
+    for o, inv, low, high in ((ox, ix, bounds[k], bounds[k + 3]),
+                              (oy, iy, bounds[k + 1], bounds[k + 4]),
+                              (oz, iz, bounds[k + 2], bounds[k + 5])):
+        if inv == _INF:
+            # parallel to the slab
+            if o < low or o > high:
+                return _INF
+            continue
+        t0 = (low - o) * inv
+        t1 = (high - o) * inv
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > near:
+            near = t0
+        if t1 < far:
+            far = t1
+        if near > far:
+            return _INF
+    return near
+
+def _triangleDistanceSquared(px, py, pz, ax, ay, az, bx, by, bz, cx, cy, cz):
+    # squared distance from p to the closest point of triangle a, b, c
+    # (Ericson, Real-Time Collision Detection 5.1.5)
+    abx = bx - ax
+    aby = by - ay
+    abz = bz - az
+    acx = cx - ax
+    acy = cy - ay
+    acz = cz - az
+    if aby * acz == abz * acy and abz * acx == abx * acz and abx * acy == aby * acx:
+        # degenerate triangle, a segment or a point
+        return _edgesDistanceSquared(px, py, pz, ax, ay, az, bx, by, bz, cx, cy, cz)
+    apx = px - ax
+    apy = py - ay
+    apz = pz - az
+    d1 = abx * apx + aby * apy + abz * apz
+    d2 = acx * apx + acy * apy + acz * apz
+    if d1 <= 0.0 and d2 <= 0.0:
+        qx, qy, qz = ax, ay, az
+    else:
+        bpx = px - bx
+        bpy = py - by
+        bpz = pz - bz
+        d3 = abx * bpx + aby * bpy + abz * bpz
+        d4 = acx * bpx + acy * bpy + acz * bpz
+        cpx = px - cx
+        cpy = py - cy
+        cpz = pz - cz
+        d5 = abx * cpx + aby * cpy + abz * cpz
+        d6 = acx * cpx + acy * cpy + acz * cpz
+        vc = d1 * d4 - d3 * d2
+        vb = d5 * d2 - d1 * d6
+        va = d3 * d6 - d5 * d4
+        if d3 >= 0.0 and d4 <= d3:
+            qx, qy, qz = bx, by, bz
+        elif d6 >= 0.0 and d5 <= d6:
+            qx, qy, qz = cx, cy, cz
+        elif vc <= 0.0 and d1 >= 0.0 and d3 <= 0.0:
+            v = d1 / (d1 - d3)
+            qx, qy, qz = ax + v * abx, ay + v * aby, az + v * abz
+        elif vb <= 0.0 and d2 >= 0.0 and d6 <= 0.0:
+            w = d2 / (d2 - d6)
+            qx, qy, qz = ax + w * acx, ay + w * acy, az + w * acz
+        elif va <= 0.0 and d4 - d3 >= 0.0 and d5 - d6 >= 0.0:
+            w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+            qx, qy, qz = bx + w * (cx - bx), by + w * (cy - by), bz + w * (cz - bz)
+        else:
+            denom = va + vb + vc
+            if denom == 0.0:
+                # too thin for the barycentrics
+                return _edgesDistanceSquared(px, py, pz, ax, ay, az, bx, by, bz, cx, cy, cz)
+            v = vb / denom
+            w = vc / denom
+            qx = ax + abx * v + acx * w
+            qy = ay + aby * v + acy * w
+            qz = az + abz * v + acz * w
+    x = px - qx
+    y = py - qy
+    z = pz - qz
+    return x * x + y * y + z * z
+
+def _edgesDistanceSquared(px, py, pz, ax, ay, az, bx, by, bz, cx, cy, cz):
+    # squared distance from p to the nearest edge of triangle a, b, c
+    return min(_segmentDistanceSquared(px, py, pz, ax, ay, az, bx, by, bz),
+               _segmentDistanceSquared(px, py, pz, bx, by, bz, cx, cy, cz),
+               _segmentDistanceSquared(px, py, pz, cx, cy, cz, ax, ay, az))
+
+def _segmentDistanceSquared(px, py, pz, ax, ay, az, bx, by, bz):
+    # squared distance from p to the segment a, b, which may be a point
+    abx = bx - ax
+    aby = by - ay
+    abz = bz - az
+    length = abx * abx + aby * aby + abz * abz
+    t = 0.0
+    if length > 0.0:
+        t = min(max(((px - ax) * abx + (py - ay) * aby + (pz - az) * abz) / length, 0.0), 1.0)
+    x = px - ax - t * abx
+    y = py - ay - t * aby
+    z = pz - az - t * abz
+    return x * x + y * y + z * z
\ No newline at end of file
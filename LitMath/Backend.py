@@ -0,0 +1,72 @@
+'''Selection of the kernels behind the batch types.
+
+Vector2Array, Vector3Array, QuaternionArray and Matrix4Stack run their
+transforms, products, normalization and inverses through current(). The
+first call picks the backend named by the LITMATH_BACKEND environment
+variable, else 'numpy' when NumPy can be imported, else 'python'. use()
+overrides the choice, use() without a name goes back to the automatic one.
+'parallel' splits large batches over a pool of workers running one of the
+other backends, see ParallelBackend; it is only used when asked for.
+'''
+import os
+
+BACKENDS = ('python', 'numpy', 'parallel')
+
+_current = None
+
+def available():
+    '''Names of the backends that can be used here.'''
+    names = ['python']
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        names.append('numpy')
+    names.append('parallel')
+    return names
+
+def create(name, **options):
+    '''Returns a new backend instance of name, options go to its constructor.'''
+    if name == 'python':
+        from .PythonBackend import PythonBackend
+        return PythonBackend(**options)
+    if name == 'numpy':
+        from .NumpyBackend import NumpyBackend
+        return NumpyBackend(**options)
+    if name == 'parallel':
+        from .ParallelBackend import ParallelBackend
+        return ParallelBackend(**options)
+    raise ValueError('unknown backend %r, expected one of %s' % (name, ', '.join(BACKENDS)))
+
+def use(name=None, **options):
+    '''Selects the backend name, or the automatic choice when name is None.
+
+    options are passed to the backend, e.g. use('parallel', workers=4).
+    Returns the selected backend. The replaced backend is closed, which
+    shuts down the worker pool of a ParallelBackend. Raises ValueError for
+    an unknown name and ImportError when the backend's dependency is
+    missing.
+    '''
+    global _current
+    backend = create(name, **options) if name is not None else _auto()
+    previous = _current
+    _current = backend
+    if previous is not None and hasattr(previous, 'close'):
+        previous.close()
+    return _current
+
+def current():
+    '''The selected backend.'''
+    if _current is None:
+        return use()
+    return _current
+
+def _auto():
+    name = os.environ.get('LITMATH_BACKEND')
+    if name:
+        return create(name)
+    try:
+        return create('numpy')
+    except ImportError:
+        return create('python')
\ No newline at end of file
@@ -0,0 +1,75 @@
+from .Matrix3 import Matrix3
+
+class CachedMatrix3(Matrix3):
+    '''A Matrix3 that memoizes its derived values.
+
+    determinant and inverse are computed on the first read and then served
+    from a cache until the matrix changes; see CachedMatrix4.
+    '''
+    __slots__ = ['_version', '_cache']
+
+    def __init__(self, *args):
+        object.__setattr__(self, '_version', 0)
+        object.__setattr__(self, '_cache', None)
+        Matrix3.__init__(self, *args)
+
+    def __setattr__(self, name, value):
+        # instances made without __init__, by pickle or copy, start unset
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+        cache = getattr(self, '_cache', None)
+        if cache:
+            cache.clear()
+
+    def __reduce__(self):
+        # the elements only, a copy must not share the cache
+        return (CachedMatrix3, tuple(self.toBuffer()))
+
+    def copy(self):
+        return CachedMatrix3(self.m11, self.m12, self.m13,
+                             self.m21, self.m22, self.m23,
+                             self.m31, self.m32, self.m33)
+
+    @staticmethod
+    def fromMatrix(m):
+        '''Creates a caching copy of the Matrix3 m.'''
+        return CachedMatrix3(*m.toBuffer())
+
+    @property
+    def version(self):
+        '''Mutation counter, increases on every element write.'''
+        return self._version
+
+    def _cached(self, key, compute):
+        # the cache dict is only allocated once a derived value is read
+        cache = self._cache
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, '_cache', cache)
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = compute(self)
+        return value
+
+    @property
+    def determinant(self):
+        return self._cached('determinant', Matrix3.determinant.fget)
+
+    def getInverse(self, out=None):
+        return _copy(self._cached('inverse', Matrix3.getInverse), out)
+    inverse = property(getInverse)
+
+
+def _copy(m, out):
+    if out is None:
+        out = Matrix3.__new__(Matrix3)
+    out.m11 = m.m11
+    out.m12 = m.m12
+    out.m13 = m.m13
+    out.m21 = m.m21
+    out.m22 = m.m22
+    out.m23 = m.m23
+    out.m31 = m.m31
+    out.m32 = m.m32
+    out.m33 = m.m33
+    return out
\ No newline at end of file
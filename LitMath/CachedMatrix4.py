@@ -0,0 +1,106 @@
+from .Matrix3 import Matrix3
+from .Matrix4 import Matrix4
+
+class CachedMatrix4(Matrix4):
+    '''A Matrix4 that memoizes its derived values.
+
+    determinant, inverse and normalMatrix are computed on the first read
+    and then served from a cache until the matrix changes. transpose is not
+    cached, it is no more work than copying a cached result. Every
+    element write (set, setIdentity, in-place products, out= results or
+    plain attribute assignment) bumps version and drops the cache. Derived
+    matrices are returned as fresh copies, so callers cannot corrupt the
+    cache.
+    '''
+    __slots__ = ['_version', '_cache']
+
+    def __init__(self, *args):
+        object.__setattr__(self, '_version', 0)
+        object.__setattr__(self, '_cache', None)
+        Matrix4.__init__(self, *args)
+
+    def __setattr__(self, name, value):
+        # instances made without __init__, by pickle or copy, start unset
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+        cache = getattr(self, '_cache', None)
+        if cache:
+            cache.clear()
+
+    def __reduce__(self):
+        # the elements only, a copy must not share the cache
+        return (CachedMatrix4, tuple(self.toBuffer()))
+
+    def copy(self):
+        return CachedMatrix4(self.m11, self.m12, self.m13, self.m14,
+                             self.m21, self.m22, self.m23, self.m24,
+                             self.m31, self.m32, self.m33, self.m34,
+                             self.m41, self.m42, self.m43, self.m44)
+
+    @staticmethod
+    def fromMatrix(m):
+        '''Creates a caching copy of the Matrix4 m.'''
+        return CachedMatrix4(*m.toBuffer())
+
+    @property
+    def version(self):
+        '''Mutation counter, increases on every element write.'''
+        return self._version
+
+    def _cached(self, key, compute):
+        # the cache dict is only allocated once a derived value is read
+        cache = self._cache
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, '_cache', cache)
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = compute(self)
+        return value
+
+    @property
+    def determinant(self):
+        return self._cached('determinant', Matrix4.determinant.fget)
+
+    def getInverse(self, out=None):
+        return _copy(self._cached('inverse', Matrix4.getInverse), out)
+    inverse = property(getInverse)
+
+    @property
+    def normalMatrix(self):
+        return _copy3(self._cached('normalMatrix', Matrix4.normalMatrix.fget))
+
+
+def _copy(m, out):
+    if out is None:
+        out = Matrix4.__new__(Matrix4)
+    out.m11 = m.m11
+    out.m12 = m.m12
+    out.m13 = m.m13
+    out.m14 = m.m14
+    out.m21 = m.m21
+    out.m22 = m.m22
+    out.m23 = m.m23
+    out.m24 = m.m24
+    out.m31 = m.m31
+    out.m32 = m.m32
+    out.m33 = m.m33
+    out.m34 = m.m34
+    out.m41 = m.m41
+    out.m42 = m.m42
+    out.m43 = m.m43
+    out.m44 = m.m44
+    return out
+
+def _copy3(m):
+    out = Matrix3.__new__(Matrix3)
+    out.m11 = m.m11
+    out.m12 = m.m12
+    out.m13 = m.m13
+    out.m21 = m.m21
+    out.m22 = m.m22
+    out.m23 = m.m23
+    out.m31 = m.m31
+    out.m32 = m.m32
+    out.m33 = m.m33
+    return out
\ No newline at end of file
@@ -0,0 +1,179 @@
+'''Optional memoization of the rotation factories.
+
+enable() puts a bounded LRU cache in front of Matrix4.rotateX, rotateY,
+rotateZ and axisAngle, Matrix3.rotate and Quaternion.axisAngle. Results
+are cached per argument as immutable tuples of components and every call
+builds a fresh object from them, so callers may modify what they get
+without touching the cache. With table=True,
+integer-degree angles in [-360, 360] for rotateX/Y/Z and Matrix3.rotate
+are built from a precomputed sin/cos table instead and bypass the LRU.
+Both paths give exactly the same values as the uncached factories.
+'''
+import math
+from collections import OrderedDict
+from . import Util
+from .Matrix3 import Matrix3
+from .Matrix4 import Matrix4
+from .Quaternion import Quaternion
+
+class LRUCache(object):
+    '''A bounded mapping that evicts the least recently used entry.'''
+    __slots__ = ['maxsize', 'hits', 'misses', '_data']
+
+    def __init__(self, maxsize=256):
+        assert maxsize > 0
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        '''Returns the value of key or None, counting a hit or a miss.'''
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_cache = None
+_table = None
+# (cls, name) -> (original member, installed member)
+_originals = {}
+# counts the installs; factories of an earlier install only pass through
+_generation = 0
+
+# (sin, cos) of every integer degree in [-360, 360]
+_TABLE_RANGE = 360
+
+def _buildTable():
+    table = {}
+    for d in range(-_TABLE_RANGE, _TABLE_RANGE + 1):
+        r = Util.degreeToRadian(d)
+        table[d] = (math.sin(r), math.cos(r))
+    return table
+
+def _tableEntry(angle):
+    # 45.0 hashes like 45, so integral floats hit the table too
+    return _table.get(angle) if _table is not None else None
+
+def _rotateX(sin, cos):
+    return Matrix4._new(1.0, 0.0,  0.0, 0.0,
+                        0.0, cos, -sin, 0.0,
+                        0.0, sin,  cos, 0.0,
+                        0.0, 0.0,  0.0, 1.0)
+
+def _rotateY(sin, cos):
+    return Matrix4._new(cos, 0.0, sin, 0.0,
+                        0.0, 1.0, 0.0, 0.0,
+                       -sin, 0.0, cos, 0.0,
+                        0.0, 0.0, 0.0, 1.0)
+
+def _rotateZ(sin, cos):
+    return Matrix4._new(cos, -sin, 0.0, 0.0,
+                        sin,  cos, 0.0, 0.0,
+                        0.0,  0.0, 1.0, 0.0,
+                        0.0,  0.0, 0.0, 1.0)
+
+def _rotate2(sin, cos):
+    return Matrix3._new(cos, -sin, 0.0,
+                        sin,  cos, 0.0,
+                        0.0,  0.0, 1.0)
+
+def _angleFactory(cls, name, original, fromTable):
+    generation = _generation
+
+    def factory(angle):
+        if _cache is None or generation != _generation:
+            # disabled, or left behind under another wrapper by disable()
+            return original(angle)
+        entry = _tableEntry(angle)
+        if entry is not None:
+            return fromTable(*entry)
+        key = (name, angle)
+        values = _cache.get(key)
+        if values is None:
+            values = tuple(original(angle).toBuffer())
+            _cache.put(key, values)
+        return cls._new(*values)
+    return factory
+
+def _axisAngleFactory(cls, name, original):
+    generation = _generation
+
+    def factory(axis, angle):
+        if _cache is None or generation != _generation:
+            return original(axis, angle)
+        key = (name, axis.x, axis.y, axis.z, angle)
+        values = _cache.get(key)
+        if values is None:
+            values = tuple(original(axis, angle).toBuffer())
+            _cache.put(key, values)
+        return cls._new(*values)
+    return factory
+
+def _factories():
+    return [(Matrix4, 'rotateX', _angleFactory(Matrix4, 'Matrix4.rotateX', Matrix4.rotateX, _rotateX)),
+            (Matrix4, 'rotateY', _angleFactory(Matrix4, 'Matrix4.rotateY', Matrix4.rotateY, _rotateY)),
+            (Matrix4, 'rotateZ', _angleFactory(Matrix4, 'Matrix4.rotateZ', Matrix4.rotateZ, _rotateZ)),
+            (Matrix3, 'rotate', _angleFactory(Matrix3, 'Matrix3.rotate', Matrix3.rotate, _rotate2)),
+            (Matrix4, 'axisAngle', _axisAngleFactory(Matrix4, 'Matrix4.axisAngle', Matrix4.axisAngle)),
+            (Quaternion, 'axisAngle', _axisAngleFactory(Quaternion, 'Quaternion.axisAngle', Quaternion.axisAngle))]
+
+def enable(maxsize=256, table=False):
+    '''Installs the cache, or resizes and clears it when already enabled.'''
+    global _cache, _table, _generation
+    _cache = LRUCache(maxsize)
+    _table = _buildTable() if table else None
+    if not _originals:
+        # wraps the current members, which may be wrappers of Instrument
+        _generation += 1
+        for cls, name, factory in _factories():
+            installed = staticmethod(factory)
+            _originals[(cls, name)] = (cls.__dict__[name], installed)
+            setattr(cls, name, installed)
+
+def disable():
+    '''Restores the uncached factories.
+
+    A factory that was wrapped again since enable(), by Instrument for
+    instance, stays in place and calls the uncached one from then on.
+    '''
+    global _cache, _table
+    for (cls, name), (original, installed) in _originals.items():
+        if cls.__dict__.get(name) is installed:
+            setattr(cls, name, original)
+    _originals.clear()
+    _cache = None
+    _table = None
+
+def isEnabled():
+    return _cache is not None
+
+def clear():
+    '''Drops every cached entry and resets the counters.'''
+    if _cache is not None:
+        _cache.clear()
+
+def stats():
+    '''Returns hits, misses, size and maxsize of the cache.'''
+    if _cache is None:
+        return {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 0}
+    return {'hits': _cache.hits, 'misses': _cache.misses,
+            'size': len(_cache), 'maxsize': _cache.maxsize}
\ No newline at end of file
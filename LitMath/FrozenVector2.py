@@ -0,0 +1,83 @@
+import math
+from array import array
+from .Vector2 import Vector2
+
+class FrozenVector2(object):
+    '''An immutable, hashable 2D vector, usable as a dict key or set member.
+
+    Equality is exact, unlike the tolerance of Vector2 ==, which cannot be
+    hashed. Use a SpatialHash to find points within a tolerance.
+    '''
+    __slots__ = ['x', 'y']
+
+    def __init__(self, x=0.0, y=0.0):
+        _set(self, float(x), float(y))
+
+    @staticmethod
+    def _new(x, y):
+        # trusted constructor for hot paths, x and y must already be floats
+        v = FrozenVector2.__new__(FrozenVector2)
+        _set(v, x, y)
+        return v
+
+    @staticmethod
+    def fromVector2(v):
+        assert isinstance(v, Vector2)
+        return FrozenVector2._new(v.x, v.y)
+
+    def toVector2(self):
+        '''A mutable copy.'''
+        return Vector2._new(self.x, self.y)
+
+    def toBuffer(self, out=None, offset=0):
+        '''Writes x, y into out at offset, a new array('d') when out is None.'''
+        if out is None:
+            return array('d', (self.x, self.y))
+        out[offset] = self.x
+        out[offset + 1] = self.y
+        return out
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+        return numpy.array((self.x, self.y), dtype=dtype)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenVector2 is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenVector2 is immutable')
+
+    def __reduce__(self):
+        return FrozenVector2, (self.x, self.y)
+
+    def __repr__(self):
+        return 'FrozenVector2(%.2f, %.2f)' % (self.x, self.y)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenVector2):
+            return self.x == other.x and self.y == other.y
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    @property
+    def length(self):
+        return math.sqrt(self.x ** 2 + self.y ** 2)
+
+    @property
+    def lengthSquared(self):
+        return self.x ** 2 + self.y ** 2
+
+
+_setX = FrozenVector2.x.__set__
+_setY = FrozenVector2.y.__set__
+
+def _set(v, x, y):
+    # writes the slots past __setattr__
+    _setX(v, x)
+    _setY(v, y)
\ No newline at end of file
@@ -0,0 +1,87 @@
+import math
+from array import array
+from .Vector3 import Vector3
+
+class FrozenVector3(object):
+    '''An immutable, hashable 3D vector, usable as a dict key or set member.
+
+    Equality is exact, unlike the tolerance of Vector3 ==, which cannot be
+    hashed: vectors within Util.EPSILON of each other are not equal. Use a
+    SpatialHash to find points within a tolerance.
+    '''
+    __slots__ = ['x', 'y', 'z']
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        _set(self, float(x), float(y), float(z))
+
+    @staticmethod
+    def _new(x, y, z):
+        # trusted constructor for hot paths, x, y and z must already be floats
+        v = FrozenVector3.__new__(FrozenVector3)
+        _set(v, x, y, z)
+        return v
+
+    @staticmethod
+    def fromVector3(v):
+        assert isinstance(v, Vector3)
+        return FrozenVector3._new(v.x, v.y, v.z)
+
+    def toVector3(self):
+        '''A mutable copy.'''
+        return Vector3._new(self.x, self.y, self.z)
+
+    def toBuffer(self, out=None, offset=0):
+        '''Writes x, y, z into out at offset, a new array('d') when out is None.'''
+        if out is None:
+            return array('d', (self.x, self.y, self.z))
+        out[offset] = self.x
+        out[offset + 1] = self.y
+        out[offset + 2] = self.z
+        return out
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+        return numpy.array((self.x, self.y, self.z), dtype=dtype)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenVector3 is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenVector3 is immutable')
+
+    def __reduce__(self):
+        return FrozenVector3, (self.x, self.y, self.z)
+
+    def __repr__(self):
+        return 'FrozenVector3(%.2f, %.2f, %.2f)' % (self.x, self.y, self.z)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenVector3):
+            return self.x == other.x and self.y == other.y and self.z == other.z
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.x, self.y, self.z))
+
+    @property
+    def length(self):
+        return math.sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
+
+    @property
+    def lengthSquared(self):
+        return self.x ** 2 + self.y ** 2 + self.z ** 2
+
+
+_setX = FrozenVector3.x.__set__
+_setY = FrozenVector3.y.__set__
+_setZ = FrozenVector3.z.__set__
+
+def _set(v, x, y, z):
+    # writes the slots past __setattr__
+    _setX(v, x)
+    _setY(v, y)
+    _setZ(v, z)
\ No newline at end of file
@@ -0,0 +1,116 @@
+import math
+from array import array
+from . import Backend, Util
+from .Vector3 import Vector3
+from .Matrix4 import Matrix4
+from .Vector3Array import Vector3Array
+from .AABB import AABB
+from .AABBArray import AABBArray
+
+class Frustum(object):
+    '''The six planes of a view frustum, extracted from a view-projection Matrix4.
+
+    data holds the planes left, right, bottom, top, near and far as a, b, c,
+    d with a unit normal (a, b, c) pointing inwards, so a*x + b*y + c*z + d
+    is the distance of a point in front of the plane. The tests are
+    conservative: an object is culled only when it lies entirely behind one
+    plane, so objects just outside a corner of the frustum may be reported
+    visible.
+    '''
+    __slots__ = ['data']
+    __hash__ = None
+
+    def __init__(self, m):
+        '''The frustum of m, a projection or projection * view matrix.
+
+        Points inside satisfy -w <= x, y, z <= w after the transform, the
+        clip space of Matrix4.perspective and Matrix4.orthographic.
+        '''
+        assert not Util.VALIDATE or isinstance(m, Matrix4)
+        self.data = array('d')
+        for a, b, c, d in ((m.m41 + m.m11, m.m42 + m.m12, m.m43 + m.m13, m.m44 + m.m14),
+                           (m.m41 - m.m11, m.m42 - m.m12, m.m43 - m.m13, m.m44 - m.m14),
+                           (m.m41 + m.m21, m.m42 + m.m22, m.m43 + m.m23, m.m44 + m.m24),
+                           (m.m41 - m.m21, m.m42 - m.m22, m.m43 - m.m23, m.m44 - m.m24),
+                           (m.m41 + m.m31, m.m42 + m.m32, m.m43 + m.m33, m.m44 + m.m34),
+                           (m.m41 - m.m31, m.m42 - m.m32, m.m43 - m.m33, m.m44 - m.m34)):
+            length = math.sqrt(a * a + b * b + c * c)
+            if length != 0:
+                a /= length
+                b /= length
+                c /= length
+                d /= length
+            self.data.extend((a, b, c, d))
+
+    def __repr__(self):
+        return 'Frustum(%s)' % ', '.join('(%.2f, %.2f, %.2f, %.2f)' % p for p in self.planes)
+
+    @property
+    def planes(self):
+        '''The planes as six (a, b, c, d) tuples.'''
+        d = self.data
+        return [tuple(d[k:k + 4]) for k in range(0, 24, 4)]
+
+    def containsPoint(self, point):
+        assert not Util.VALIDATE or isinstance(point, Vector3)
+        return self.intersectsSphere(point, 0.0)
+
+    def intersectsSphere(self, center, radius):
+        '''False when the sphere is entirely outside one plane.'''
+        assert not Util.VALIDATE or isinstance(center, Vector3)
+        x = center.x
+        y = center.y
+        z = center.z
+        for a, b, c, d in self.planes:
+            if a * x + b * y + c * z + d < -radius:
+                return False
+        return True
+
+    def intersectsAABB(self, box):
+        '''False when box is empty or entirely outside one plane.'''
+        assert not Util.VALIDATE or isinstance(box, AABB)
+        if box.isEmpty:
+            return False
+        mn = box.min
+        mx = box.max
+        cx = (mn.x + mx.x) * 0.5
+        cy = (mn.y + mx.y) * 0.5
+        cz = (mn.z + mx.z) * 0.5
+        ex = (mx.x - mn.x) * 0.5
+        ey = (mx.y - mn.y) * 0.5
+        ez = (mx.z - mn.z) * 0.5
+        for a, b, c, d in self.planes:
+            # the distance of the corner furthest along the normal
+            if a * cx + b * cy + c * cz + d + (abs(a) * ex + abs(b) * ey + abs(c) * ez) < 0:
+                return False
+        return True
+
+    def visibleSpheres(self, centers, radii):
+        '''The intersectsSphere results of many spheres as an array('B') of 1 and 0.
+
+        centers may be a Vector3Array, a list of Vector3, a flat buffer of
+        x, y, z floats or an Nx3 array, radii one radius for all spheres or
+        one per sphere.
+        '''
+        if isinstance(centers, Vector3Array):
+            data = centers.data
+        elif len(centers) and isinstance(centers[0], Vector3):
+            data = Vector3Array.fromVectors(centers).data
+        else:
+            data = Util.asBuffer(centers, 3)
+        n = len(data) // 3
+        if type(radii) in (int, float):
+            radii = array('d', (float(radii),))
+        else:
+            radii = Util.asBuffer(radii, 1)
+            assert len(radii) == n
+        return Backend.current().cullSpheres(self.data, data, radii, n)
+
+    def visibleBoxes(self, boxes):
+        '''The intersectsAABB results of an AABBArray as an array('B') of 1 and 0.'''
+        assert isinstance(boxes, AABBArray)
+        return Backend.current().cullBoxes(self.data, boxes.data)
+
+    @staticmethod
+    def fromMatrix(m):
+        return Frustum(m)
\ No newline at end of file
@@ -0,0 +1,131 @@
+'''Per-operation call counts, time and allocations.
+
+Nothing is wrapped until enable() is called, or the package is imported
+with the LITMATH_INSTRUMENT environment variable set, so the library runs
+at full speed otherwise. enable() replaces the public methods, operators,
+properties and static factories of Vector2, Vector3, Matrix3, Matrix4 and
+Quaternion and the functions of Util with counting wrappers; disable()
+puts the originals back.
+
+Times are inclusive, an operation that calls another one is charged for
+both. Allocations are the objects still alive when a call returns
+(sys.getallocatedblocks before and after), usually its result.
+'''
+import sys
+import time
+import types
+from functools import wraps
+from . import Util
+from .Vector2 import Vector2
+from .Vector3 import Vector3
+from .Matrix3 import Matrix3
+from .Matrix4 import Matrix4
+from .Quaternion import Quaternion
+
+_CLASSES = (Vector2, Vector3, Matrix3, Matrix4, Quaternion)
+
+# dunders that are not operations of the library
+_SKIP = frozenset(['__repr__', '__str__', '__array__', '__buffer__'])
+
+# name -> [calls, seconds, allocated objects]
+_stats = {}
+# (owner, name, original member, installed wrapper)
+_originals = []
+# set by enable(), only the wrappers made for it count
+_active = None
+
+def enable():
+    '''Wraps every public operation, does nothing when already enabled.'''
+    global _active
+    if _originals:
+        return
+    _active = token = object()
+    for cls in _CLASSES:
+        for name, attr in list(cls.__dict__.items()):
+            wrapped = _wrapMember('%s.%s' % (cls.__name__, name), name, attr, token)
+            if wrapped is not None:
+                _originals.append((cls, name, attr, wrapped))
+                setattr(cls, name, wrapped)
+    for name, attr in list(vars(Util).items()):
+        if not name.startswith('_') and isinstance(attr, types.FunctionType) and \
+           attr.__module__ == Util.__name__:
+            wrapped = _wrap('Util.' + name, attr, token)
+            _originals.append((Util, name, attr, wrapped))
+            setattr(Util, name, wrapped)
+
+def disable():
+    '''Restores the original operations, the statistics are kept.
+
+    A member that was replaced since enable(), by FactoryCache for
+    instance, is left alone; the wrapper it calls stops counting.
+    '''
+    global _active
+    _active = None
+    while _originals:
+        owner, name, attr, wrapped = _originals.pop()
+        if vars(owner).get(name) is wrapped:
+            setattr(owner, name, attr)
+
+def isEnabled():
+    return bool(_originals)
+
+def reset():
+    '''Zeroes all statistics.'''
+    for stat in _stats.values():
+        stat[0] = 0
+        stat[1] = 0.0
+        stat[2] = 0
+
+def snapshot():
+    '''Returns {name: {'calls', 'time', 'allocs'}} for every operation that was called.'''
+    return dict((name, {'calls': calls, 'time': seconds, 'allocs': allocs})
+                for name, (calls, seconds, allocs) in _stats.items() if calls)
+
+def report(sort='time', limit=None):
+    '''A text table of snapshot(), sorted by 'time', 'calls' or 'allocs'.'''
+    assert sort in ('time', 'calls', 'allocs')
+    rows = sorted(snapshot().items(), key=lambda item: (-item[1][sort], item[0]))
+    if limit is not None:
+        rows = rows[:limit]
+    lines = ['%-36s %10s %12s %10s %12s' % ('operation', 'calls', 'time (ms)', 'us/call', 'allocs/call')]
+    for name, s in rows:
+        calls = s['calls']
+        lines.append('%-36s %10d %12.3f %10.3f %12.2f' % (name, calls, s['time'] * 1e3,
+                                                          s['time'] * 1e6 / calls,
+                                                          float(s['allocs']) / calls))
+    return '\n'.join(lines)
+
+def _wrapMember(qualname, name, attr, token):
+    if name.startswith('_') and not (name.startswith('__') and name.endswith('__')):
+        return None
+    if name in _SKIP:
+        return None
+    if isinstance(attr, staticmethod):
+        return staticmethod(_wrap(qualname, attr.__func__, token))
+    if isinstance(attr, property):
+        if attr.fget is None:
+            return None
+        return property(_wrap(qualname, attr.fget, token), attr.fset, attr.fdel, attr.__doc__)
+    if isinstance(attr, types.FunctionType):
+        return _wrap(qualname, attr, token)
+    return None
+
+def _wrap(qualname, fn, token):
+    stat = _stats.setdefault(qualname, [0, 0.0, 0])
+    blocks = sys.getallocatedblocks
+    clock = time.perf_counter
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _active is not token:
+            # disabled, or left behind under another wrapper by disable()
+            return fn(*args, **kwargs)
+        before = blocks()
+        start = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stat[1] += clock() - start
+            stat[2] += blocks() - before
+            stat[0] += 1
+    return wrapper
\ No newline at end of file
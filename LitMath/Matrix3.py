@@ -1,5 +1,8 @@
 import math
-from . import Util
+from array import array
+from . import Backend, Util
+from .Vector2 import Vector2
+from .Vector2Array import Vector2Array
 
 class Matrix3(object):
     __slots__ = ['m11', 'm12', 'm13',
@@ -35,8 +38,63 @@ class Matrix3(object):
         return self
         
     def copy(self):
-        import copy
-        return copy.copy(self)
+        # keeps the type of subclasses, like copy.copy did
+        cls = type(self)
+        m = cls.__new__(cls)
+        m.m11 = self.m11
+        m.m12 = self.m12
+        m.m13 = self.m13
+        m.m21 = self.m21
+        m.m22 = self.m22
+        m.m23 = self.m23
+        m.m31 = self.m31
+        m.m32 = self.m32
+        m.m33 = self.m33
+        return m
+        
+    @staticmethod
+    def _new(m11, m12, m13,
+             m21, m22, m23,
+             m31, m32, m33):
+        # trusted constructor for hot paths, the elements must already be floats
+        m = Matrix3.__new__(Matrix3)
+        m.m11 = m11
+        m.m12 = m12
+        m.m13 = m13
+        m.m21 = m21
+        m.m22 = m22
+        m.m23 = m23
+        m.m31 = m31
+        m.m32 = m32
+        m.m33 = m33
+        return m
+        
+    def toBuffer(self, out=None, offset=0, columnMajor=False):
+        '''Writes the 9 elements into out at offset, a new array('d') when out is None.
+        
+        The layout is row-major (m11, m12, ...) unless columnMajor is set.
+        '''
+        values = (self.m11, self.m12, self.m13,
+                  self.m21, self.m22, self.m23,
+                  self.m31, self.m32, self.m33)
+        if columnMajor:
+            values = values[0::3] + values[1::3] + values[2::3]
+        if out is None:
+            return array('d', values)
+        out[offset:offset + 9] = values if isinstance(out, list) else array('d', values)
+        return out
+        
+    @staticmethod
+    def fromBuffer(buf, offset=0, columnMajor=False):
+        '''Reads 9 elements from any float buffer or sequence at offset.'''
+        values = buf[offset:offset + 9]
+        if columnMajor:
+            return Matrix3(*[values[i + j] for j in range(3) for i in range(0, 9, 3)])
+        return Matrix3(*values)
+        
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+        return numpy.array(self.toBuffer(), dtype=dtype).reshape(3, 3)
     
     def __repr__(self):
         return ('Matrix3(%8.2f %8.2f %8.2f\n' \
@@ -63,20 +121,36 @@ class Matrix3(object):
     def __ne__(self, other):
         return not self.__eq__(other)
                             
-    def __mul__(self, other):
-        '''Multiplies two matrices.'''
-        assert isinstance(other, Matrix3)
-        M = Matrix3()
-        M.m11 = float(self.m11 * other.m11 + self.m12 * other.m21 + self.m13 * other.m31)
-        M.m12 = float(self.m11 * other.m12 + self.m12 * other.m22 + self.m13 * other.m32)
-        M.m13 = float(self.m11 * other.m13 + self.m12 * other.m23 + self.m13 * other.m33)
-        M.m21 = float(self.m21 * other.m11 + self.m22 * other.m21 + self.m23 * other.m31)
-        M.m22 = float(self.m21 * other.m12 + self.m22 * other.m22 + self.m23 * other.m32)
-        M.m23 = float(self.m21 * other.m13 + self.m22 * other.m23 + self.m23 * other.m33)
-        M.m31 = float(self.m31 * other.m11 + self.m32 * other.m21 + self.m33 * other.m31)
-        M.m32 = float(self.m31 * other.m12 + self.m32 * other.m22 + self.m33 * other.m32)
-        M.m33 = float(self.m31 * other.m13 + self.m32 * other.m23 + self.m33 * other.m33)
-        return M
+    def multiply(self, other, out=None):
+        '''Multiplies two matrices, the result is written into out when it is given.'''
+        assert not Util.VALIDATE or isinstance(other, Matrix3)
+        
+        m11 = self.m11 * other.m11 + self.m12 * other.m21 + self.m13 * other.m31
+        m12 = self.m11 * other.m12 + self.m12 * other.m22 + self.m13 * other.m32
+        m13 = self.m11 * other.m13 + self.m12 * other.m23 + self.m13 * other.m33
+        m21 = self.m21 * other.m11 + self.m22 * other.m21 + self.m23 * other.m31
+        m22 = self.m21 * other.m12 + self.m22 * other.m22 + self.m23 * other.m32
+        m23 = self.m21 * other.m13 + self.m22 * other.m23 + self.m23 * other.m33
+        m31 = self.m31 * other.m11 + self.m32 * other.m21 + self.m33 * other.m31
+        m32 = self.m31 * other.m12 + self.m32 * other.m22 + self.m33 * other.m32
+        m33 = self.m31 * other.m13 + self.m32 * other.m23 + self.m33 * other.m33
+        
+        if out is None:
+            out = Matrix3.__new__(Matrix3)
+        out.m11 = m11
+        out.m12 = m12
+        out.m13 = m13
+        out.m21 = m21
+        out.m22 = m22
+        out.m23 = m23
+        out.m31 = m31
+        out.m32 = m32
+        out.m33 = m33
+        return out
+    __mul__ = multiply
+    
+    def __imul__(self, other):
+        return self.multiply(other, self)
     
     @property    
     def determinant(self):
@@ -88,53 +162,117 @@ class Matrix3(object):
                      self.m12 * self.m21 * self.m33 - \
                      self.m13 * self.m22 * self.m31)
     
-    @property    
-    def inverse(self):
-        '''The inverse of this matrix.'''
+    def getInverse(self, out=None):
+        '''The inverse of this matrix, written into out when it is given.'''
         d = self.determinant
         
         # determinant equals zero, means no inverse, return identity
         if d == 0:
-            return Matrix3.identity()
-        
-        tmp = Matrix3()
-        tmp.m11 = (self.m22 * self.m33 - self.m23 * self.m32) / d
-        tmp.m12 = (self.m13 * self.m32 - self.m12 * self.m33) / d
-        tmp.m13 = (self.m12 * self.m23 - self.m13 * self.m22) / d
-        tmp.m21 = (self.m23 * self.m31 - self.m21 * self.m33) / d
-        tmp.m22 = (self.m11 * self.m33 - self.m13 * self.m31) / d
-        tmp.m23 = (self.m13 * self.m21 - self.m11 * self.m23) / d
-        tmp.m31 = (self.m21 * self.m32 - self.m22 * self.m31) / d
-        tmp.m32 = (self.m12 * self.m31 - self.m11 * self.m32) / d
-        tmp.m33 = (self.m11 * self.m22 - self.m12 * self.m21) / d
-        return tmp
-        
-    @property
-    def transpose(self):
-        '''Returns the transpose of this matrix.'''
-        return Matrix3(self.m11, self.m21, self.m31,
-                       self.m12, self.m22, self.m32,
-                       self.m13, self.m23, self.m33)
-        
-    def multiplyPoint(self, pnt):
-        '''Transforms a position by this matrix.'''
-        from . import Vector2
-        assert isinstance(pnt, Vector2.Vector2)
-        
-        p = Vector2.Vector2()
-        p.x = self.m11 * pnt.x + self.m12 * pnt.y + self.m13
-        p.y = self.m21 * pnt.x + self.m22 * pnt.y + self.m23
-        return p
-        
-    def multiplyVector(self, vec):
-        '''Transforms a direction by this matrix.'''
-        from . import Vector2
-        assert isinstance(vec, Vector2.Vector2)
-        
-        p = Vector2.Vector2()
-        p.x = self.m11 * vec.x + self.m12 * vec.y
-        p.y = self.m21 * vec.x + self.m22 * vec.y
-        return p
+            if out is None:
+                return Matrix3.identity()
+            return out.setIdentity()
+        
+        m11 = (self.m22 * self.m33 - self.m23 * self.m32) / d
+        m12 = (self.m13 * self.m32 - self.m12 * self.m33) / d
+        m13 = (self.m12 * self.m23 - self.m13 * self.m22) / d
+        m21 = (self.m23 * self.m31 - self.m21 * self.m33) / d
+        m22 = (self.m11 * self.m33 - self.m13 * self.m31) / d
+        m23 = (self.m13 * self.m21 - self.m11 * self.m23) / d
+        m31 = (self.m21 * self.m32 - self.m22 * self.m31) / d
+        m32 = (self.m12 * self.m31 - self.m11 * self.m32) / d
+        m33 = (self.m11 * self.m22 - self.m12 * self.m21) / d
+        if out is None:
+            out = Matrix3.__new__(Matrix3)
+        out.m11 = m11
+        out.m12 = m12
+        out.m13 = m13
+        out.m21 = m21
+        out.m22 = m22
+        out.m23 = m23
+        out.m31 = m31
+        out.m32 = m32
+        out.m33 = m33
+        return out
+    inverse = property(getInverse)
+    
+    def getTranspose(self, out=None):
+        '''Returns the transpose of this matrix, written into out when it is given.'''
+        values = (self.m11, self.m21, self.m31,
+                  self.m12, self.m22, self.m32,
+                  self.m13, self.m23, self.m33)
+        if out is None:
+            out = Matrix3.__new__(Matrix3)
+        (out.m11, out.m12, out.m13,
+         out.m21, out.m22, out.m23,
+         out.m31, out.m32, out.m33) = values
+        return out
+    transpose = property(getTranspose)
+        
+    def multiplyPoint(self, pnt, out=None):
+        '''Transforms a position by this matrix, into out when it is given.'''
+        assert not Util.VALIDATE or isinstance(pnt, Vector2)
+        
+        x = self.m11 * pnt.x + self.m12 * pnt.y + self.m13
+        y = self.m21 * pnt.x + self.m22 * pnt.y + self.m23
+        if out is None:
+            out = Vector2.__new__(Vector2)
+        out.x = x
+        out.y = y
+        return out
+        
+    def multiplyVector(self, vec, out=None):
+        '''Transforms a direction by this matrix, into out when it is given.'''
+        assert not Util.VALIDATE or isinstance(vec, Vector2)
+        
+        x = self.m11 * vec.x + self.m12 * vec.y
+        y = self.m21 * vec.x + self.m22 * vec.y
+        if out is None:
+            out = Vector2.__new__(Vector2)
+        out.x = x
+        out.y = y
+        return out
+        
+    def multiplyPoints(self, points, out=None, homogeneous=False):
+        '''Transforms many positions by this matrix.
+        
+        points may be a Vector2Array, a list of Vector2, a flat buffer of
+        x, y floats or an Nx2 array. A Vector2Array or a list of Vector2
+        gives the same kind back, anything else gives a flat array('d').
+        The result is written into out when it is given. homogeneous divides
+        by the third row, for projective matrices; points where it is 0, on
+        the plane through the eye, are left undivided rather than becoming
+        inf or nan.
+        '''
+        return self._transform(points, out, True, homogeneous)
+        
+    def multiplyVectors(self, vecs, out=None):
+        '''Transforms many directions by this matrix, see multiplyPoints.'''
+        return self._transform(vecs, out, False, False)
+        
+    def _transform(self, values, out, translate, homogeneous):
+        if isinstance(values, Vector2Array):
+            data = values.data
+        elif len(values) and isinstance(values[0], Vector2):
+            if not isinstance(out, Vector2Array):
+                if out is None:
+                    out = [Vector2.__new__(Vector2) for _ in range(len(values))]
+                assert len(out) == len(values)
+                assert not Util.VALIDATE or all(isinstance(p, Vector2) for p in out)
+                _transformVectors2(self, values, out, translate, homogeneous)
+                return out
+            data = Vector2Array.fromVectors(values).data
+        else:
+            data = Util.flatten(values, 2)
+        
+        data = Backend.current().transform2(self.toBuffer(), data, translate, homogeneous)
+        if isinstance(out, Vector2Array):
+            # written through the buffer, iterating out only yields copies
+            assert len(out.data) == len(data)
+            Util.copyInto(out.data, data)
+            return out
+        if out is None:
+            return Vector2Array._fromData(data) if isinstance(values, Vector2Array) else data
+        return Util.copyInto(out, data)
         
     def setIdentity(self):
         return self.set(1.0, 0.0, 0.0,
@@ -144,16 +282,16 @@ class Matrix3(object):
     @staticmethod
     def identity():
         '''Returns the identity matrix.'''
-        return Matrix3(1.0, 0.0, 0.0,
-                       0.0, 1.0, 0.0,
-                       0.0, 0.0, 1.0)
+        return Matrix3._new(1.0, 0.0, 0.0,
+                            0.0, 1.0, 0.0,
+                            0.0, 0.0, 1.0)
                        
     @staticmethod
     def zero():
         '''Returns a matrix with all elements set to zero.'''
-        return Matrix3(0.0, 0.0, 0.0,
-                       0.0, 0.0, 0.0,
-                       0.0, 0.0, 0.0)
+        return Matrix3._new(0.0, 0.0, 0.0,
+                            0.0, 0.0, 0.0,
+                            0.0, 0.0, 0.0)
                        
     @staticmethod
     def translate(x, y):
@@ -172,13 +310,32 @@ class Matrix3(object):
         '''Creates a rotation matrix, angle is in radian.'''
         cos = math.cos(angle)
         sin = math.sin(angle)
-        return Matrix3(cos, -sin, 0.0,
-                       sin,  cos, 0.0,
-                       0.0,  0.0, 1.0)
+        return Matrix3._new(cos, -sin, 0.0,
+                            sin,  cos, 0.0,
+                            0.0,  0.0, 1.0)
         
     @staticmethod
     def scale(sx, sy):
         '''Creates a scale matrix.'''
         return Matrix3(sx,  0.0, 0.0,
                        0.0, sy,  0.0,
-                       0.0, 0.0, 1.0)
\ No newline at end of file
+                       0.0, 0.0, 1.0)
+
+
+def _transformVectors2(m, values, out, translate, homogeneous):
+    # transforms a sequence of Vector2 into the Vector2 objects of out
+    m11, m12 = m.m11, m.m12
+    m21, m22 = m.m21, m.m22
+    m13, m23 = (m.m13, m.m23) if translate else (0.0, 0.0)
+    m31, m32, m33 = m.m31, m.m32, m.m33
+    for v, p in zip(values, out):
+        x = v.x
+        y = v.y
+        rx = m11 * x + m12 * y + m13
+        ry = m21 * x + m22 * y + m23
+        if homogeneous:
+            w = (m31 * x + m32 * y + m33) or 1.0
+            rx /= w
+            ry /= w
+        p.x = rx
+        p.y = ry
\ No newline at end of file
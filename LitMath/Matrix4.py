@@ -1,5 +1,9 @@
 import math
-from . import Util
+from array import array
+from . import Backend, Util
+from .Vector3 import Vector3
+from .Matrix3 import Matrix3
+from .Vector3Array import Vector3Array
 
 class Matrix4(object):
     __slots__ = ['m11', 'm12', 'm13', 'm14',
@@ -52,8 +56,79 @@ class Matrix4(object):
         return self
         
     def copy(self):
-        import copy
-        return copy.copy(self)
+        # keeps the type of subclasses, like copy.copy did
+        cls = type(self)
+        m = cls.__new__(cls)
+        m.m11 = self.m11
+        m.m12 = self.m12
+        m.m13 = self.m13
+        m.m14 = self.m14
+        m.m21 = self.m21
+        m.m22 = self.m22
+        m.m23 = self.m23
+        m.m24 = self.m24
+        m.m31 = self.m31
+        m.m32 = self.m32
+        m.m33 = self.m33
+        m.m34 = self.m34
+        m.m41 = self.m41
+        m.m42 = self.m42
+        m.m43 = self.m43
+        m.m44 = self.m44
+        return m
+        
+    @staticmethod
+    def _new(m11, m12, m13, m14,
+             m21, m22, m23, m24,
+             m31, m32, m33, m34,
+             m41, m42, m43, m44):
+        # trusted constructor for hot paths, the elements must already be floats
+        m = Matrix4.__new__(Matrix4)
+        m.m11 = m11
+        m.m12 = m12
+        m.m13 = m13
+        m.m14 = m14
+        m.m21 = m21
+        m.m22 = m22
+        m.m23 = m23
+        m.m24 = m24
+        m.m31 = m31
+        m.m32 = m32
+        m.m33 = m33
+        m.m34 = m34
+        m.m41 = m41
+        m.m42 = m42
+        m.m43 = m43
+        m.m44 = m44
+        return m
+        
+    def toBuffer(self, out=None, offset=0, columnMajor=False):
+        '''Writes the 16 elements into out at offset, a new array('d') when out is None.
+        
+        The layout is row-major (m11, m12, ...) unless columnMajor is set.
+        '''
+        values = (self.m11, self.m12, self.m13, self.m14,
+                  self.m21, self.m22, self.m23, self.m24,
+                  self.m31, self.m32, self.m33, self.m34,
+                  self.m41, self.m42, self.m43, self.m44)
+        if columnMajor:
+            values = values[0::4] + values[1::4] + values[2::4] + values[3::4]
+        if out is None:
+            return array('d', values)
+        out[offset:offset + 16] = values if isinstance(out, list) else array('d', values)
+        return out
+        
+    @staticmethod
+    def fromBuffer(buf, offset=0, columnMajor=False):
+        '''Reads 16 elements from any float buffer or sequence at offset.'''
+        values = buf[offset:offset + 16]
+        if columnMajor:
+            return Matrix4(*[values[i + j] for j in range(4) for i in range(0, 16, 4)])
+        return Matrix4(*values)
+        
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+        return numpy.array(self.toBuffer(), dtype=dtype).reshape(4, 4)
     
     def __repr__(self):
         return ('Matrix4(%8.2f %8.2f %8.2f %8.2f\n' \
@@ -89,32 +164,53 @@ class Matrix4(object):
     def __ne__(self, other):
         return not self.__eq__(other)
                    
-    def __mul__(self, other):
-        '''Multiplies two matrices.'''
-        assert isinstance(other, Matrix4)
-        
-        M = Matrix4()
-        M.m11 = float(self.m11 * other.m11 + self.m12 * other.m21 + self.m13 * other.m31 + self.m14 * other.m41)
-        M.m12 = float(self.m11 * other.m12 + self.m12 * other.m22 + self.m13 * other.m32 + self.m14 * other.m42)
-        M.m13 = float(self.m11 * other.m13 + self.m12 * other.m23 + self.m13 * other.m33 + self.m14 * other.m43)
-        M.m14 = float(self.m11 * other.m14 + self.m12 * other.m24 + self.m13 * other.m34 + self.m14 * other.m44)
-        
-        M.m21 = float(self.m21 * other.m11 + self.m22 * other.m21 + self.m23 * other.m31 + self.m24 * other.m41)
-        M.m22 = float(self.m21 * other.m12 + self.m22 * other.m22 + self.m23 * other.m32 + self.m24 * other.m42)
-        M.m23 = float(self.m21 * other.m13 + self.m22 * other.m23 + self.m23 * other.m33 + self.m24 * other.m43)
-        M.m24 = float(self.m21 * other.m14 + self.m22 * other.m24 + self.m23 * other.m34 + self.m24 * other.m44)
-        
-        M.m31 = float(self.m31 * other.m11 + self.m32 * other.m21 + self.m33 * other.m31 + self.m34 * other.m41)
-        M.m32 = float(self.m31 * other.m12 + self.m32 * other.m22 + self.m33 * other.m32 + self.m34 * other.m42)
-        M.m33 = float(self.m31 * other.m13 + self.m32 * other.m23 + self.m33 * other.m33 + self.m34 * other.m43)
-        M.m34 = float(self.m31 * other.m14 + self.m32 * other.m24 + self.m33 * other.m34 + self.m34 * other.m44)
-        
-        M.m41 = float(self.m41 * other.m11 + self.m42 * other.m21 + self.m43 * other.m31 + self.m44 * other.m41)
-        M.m42 = float(self.m41 * other.m12 + self.m42 * other.m22 + self.m43 * other.m32 + self.m44 * other.m42)
-        M.m43 = float(self.m41 * other.m13 + self.m42 * other.m23 + self.m43 * other.m33 + self.m44 * other.m43)
-        M.m44 = float(self.m41 * other.m14 + self.m42 * other.m24 + self.m43 * other.m34 + self.m44 * other.m44)
-        
-        return M
+    def multiply(self, other, out=None):
+        '''Multiplies two matrices, the result is written into out when it is given.'''
+        assert not Util.VALIDATE or isinstance(other, Matrix4)
+        
+        m11 = self.m11 * other.m11 + self.m12 * other.m21 + self.m13 * other.m31 + self.m14 * other.m41
+        m12 = self.m11 * other.m12 + self.m12 * other.m22 + self.m13 * other.m32 + self.m14 * other.m42
+        m13 = self.m11 * other.m13 + self.m12 * other.m23 + self.m13 * other.m33 + self.m14 * other.m43
+        m14 = self.m11 * other.m14 + self.m12 * other.m24 + self.m13 * other.m34 + self.m14 * other.m44
+        
+        m21 = self.m21 * other.m11 + self.m22 * other.m21 + self.m23 * other.m31 + self.m24 * other.m41
+        m22 = self.m21 * other.m12 + self.m22 * other.m22 + self.m23 * other.m32 + self.m24 * other.m42
+        m23 = self.m21 * other.m13 + self.m22 * other.m23 + self.m23 * other.m33 + self.m24 * other.m43
+        m24 = self.m21 * other.m14 + self.m22 * other.m24 + self.m23 * other.m34 + self.m24 * other.m44
+        
+        m31 = self.m31 * other.m11 + self.m32 * other.m21 + self.m33 * other.m31 + self.m34 * other.m41
+        m32 = self.m31 * other.m12 + self.m32 * other.m22 + self.m33 * other.m32 + self.m34 * other.m42
+        m33 = self.m31 * other.m13 + self.m32 * other.m23 + self.m33 * other.m33 + self.m34 * other.m43
+        m34 = self.m31 * other.m14 + self.m32 * other.m24 + self.m33 * other.m34 + self.m34 * other.m44
+        
+        m41 = self.m41 * other.m11 + self.m42 * other.m21 + self.m43 * other.m31 + self.m44 * other.m41
+        m42 = self.m41 * other.m12 + self.m42 * other.m22 + self.m43 * other.m32 + self.m44 * other.m42
+        m43 = self.m41 * other.m13 + self.m42 * other.m23 + self.m43 * other.m33 + self.m44 * other.m43
+        m44 = self.m41 * other.m14 + self.m42 * other.m24 + self.m43 * other.m34 + self.m44 * other.m44
+        
+        if out is None:
+            out = Matrix4.__new__(Matrix4)
+        out.m11 = m11
+        out.m12 = m12
+        out.m13 = m13
+        out.m14 = m14
+        out.m21 = m21
+        out.m22 = m22
+        out.m23 = m23
+        out.m24 = m24
+        out.m31 = m31
+        out.m32 = m32
+        out.m33 = m33
+        out.m34 = m34
+        out.m41 = m41
+        out.m42 = m42
+        out.m43 = m43
+        out.m44 = m44
+        return out
+    __mul__ = multiply
+    
+    def __imul__(self, other):
+        return self.multiply(other, self)
     
     @property
     def determinant(self):
@@ -134,79 +230,234 @@ class Matrix4(object):
         
         return float(A0*B5 - A1*B4 + A2*B3 + A3*B2 - A4*B1 + A5*B0)
     
-    @property
-    def inverse(self):
-        '''The inverse of this matrix.'''
-        d = self.determinant
+    def getInverse(self, out=None):
+        '''The inverse of this matrix, written into out when it is given.
+        
+        Affine matrices (last row 0, 0, 0, 1) take the cheaper
+        getInverseAffine path, anything else the general inverse.
+        '''
+        if self.m41 == 0.0 and self.m42 == 0.0 and self.m43 == 0.0 and self.m44 == 1.0:
+            return self.getInverseAffine(out)
+        
+        m11, m12, m13, m14 = self.m11, self.m12, self.m13, self.m14
+        m21, m22, m23, m24 = self.m21, self.m22, self.m23, self.m24
+        m31, m32, m33, m34 = self.m31, self.m32, self.m33, self.m34
+        m41, m42, m43, m44 = self.m41, self.m42, self.m43, self.m44
+        
+        # the 2x2 minors of determinant, shared by all cofactors
+        A0 = m11 * m22 - m12 * m21
+        A1 = m11 * m23 - m13 * m21
+        A2 = m11 * m24 - m14 * m21
+        A3 = m12 * m23 - m13 * m22
+        A4 = m12 * m24 - m14 * m22
+        A5 = m13 * m24 - m14 * m23
+        B0 = m31 * m42 - m32 * m41
+        B1 = m31 * m43 - m33 * m41
+        B2 = m31 * m44 - m34 * m41
+        B3 = m32 * m43 - m33 * m42
+        B4 = m32 * m44 - m34 * m42
+        B5 = m33 * m44 - m34 * m43
+        d = A0*B5 - A1*B4 + A2*B3 + A3*B2 - A4*B1 + A5*B0
+        
+        # determinant equals zero, means no inverse, return identity
+        if d == 0:
+            if out is None:
+                return Matrix4.identity()
+            return out.setIdentity()
+        
+        if out is None:
+            out = Matrix4.__new__(Matrix4)
+        out.m11 = ( m22*B5 - m23*B4 + m24*B3) / d
+        out.m12 = (-m12*B5 + m13*B4 - m14*B3) / d
+        out.m13 = ( m42*A5 - m43*A4 + m44*A3) / d
+        out.m14 = (-m32*A5 + m33*A4 - m34*A3) / d
+        out.m21 = (-m21*B5 + m23*B2 - m24*B1) / d
+        out.m22 = ( m11*B5 - m13*B2 + m14*B1) / d
+        out.m23 = (-m41*A5 + m43*A2 - m44*A1) / d
+        out.m24 = ( m31*A5 - m33*A2 + m34*A1) / d
+        out.m31 = ( m21*B4 - m22*B2 + m24*B0) / d
+        out.m32 = (-m11*B4 + m12*B2 - m14*B0) / d
+        out.m33 = ( m41*A4 - m42*A2 + m44*A0) / d
+        out.m34 = (-m31*A4 + m32*A2 - m34*A0) / d
+        out.m41 = (-m21*B3 + m22*B1 - m23*B0) / d
+        out.m42 = ( m11*B3 - m12*B1 + m13*B0) / d
+        out.m43 = (-m41*A3 + m42*A1 - m43*A0) / d
+        out.m44 = ( m31*A3 - m32*A1 + m33*A0) / d
+        return out
+    inverse = property(getInverse)
+    
+    def getInverseAffine(self, out=None):
+        '''The inverse of an affine matrix, written into out when it is given.
+        
+        The last row is assumed to be 0, 0, 0, 1: the upper 3x3 is inverted
+        and the translation is mapped through it.
+        '''
+        m11, m12, m13 = self.m11, self.m12, self.m13
+        m21, m22, m23 = self.m21, self.m22, self.m23
+        m31, m32, m33 = self.m31, self.m32, self.m33
+        
+        c11 = m22 * m33 - m23 * m32
+        c12 = m13 * m32 - m12 * m33
+        c13 = m12 * m23 - m13 * m22
+        d = m11 * c11 + m21 * c12 + m31 * c13
         
         # determinant equals zero, means no inverse, return identity
         if d == 0:
-            return Matrix4.identity()
-        
-        M = Matrix4()
-        M.m11 = (self.m23*self.m34*self.m42 - self.m24*self.m33*self.m42 + self.m24*self.m32*self.m43 - \
-                self.m22*self.m34*self.m43 - self.m23*self.m32*self.m44 + self.m22*self.m33*self.m44) / d
-        M.m12 = (self.m14*self.m33*self.m42 - self.m13*self.m34*self.m42 - self.m14*self.m32*self.m43 + \
-                self.m12*self.m34*self.m43 + self.m13*self.m32*self.m44 - self.m12*self.m33*self.m44) / d
-        M.m13 = (self.m13*self.m24*self.m42 - self.m14*self.m23*self.m42 + self.m14*self.m22*self.m43 - \
-                self.m12*self.m24*self.m43 - self.m13*self.m22*self.m44 + self.m12*self.m23*self.m44) / d
-        M.m14 = (self.m14*self.m23*self.m32 - self.m13*self.m24*self.m32 - self.m14*self.m22*self.m33 + \
-                self.m12*self.m24*self.m33 + self.m13*self.m22*self.m34 - self.m12*self.m23*self.m34) / d
-        M.m21 = (self.m24*self.m33*self.m41 - self.m23*self.m34*self.m41 - self.m24*self.m31*self.m43 + \
-                self.m21*self.m34*self.m43 + self.m23*self.m31*self.m44 - self.m21*self.m33*self.m44) / d
-        M.m22 = (self.m13*self.m34*self.m41 - self.m14*self.m33*self.m41 + self.m14*self.m31*self.m43 - \
-                self.m11*self.m34*self.m43 - self.m13*self.m31*self.m44 + self.m11*self.m33*self.m44) / d
-        M.m23 = (self.m14*self.m23*self.m41 - self.m13*self.m24*self.m41 - self.m14*self.m21*self.m43 + \
-                self.m11*self.m24*self.m43 + self.m13*self.m21*self.m44 - self.m11*self.m23*self.m44) / d
-        M.m24 = (self.m13*self.m24*self.m31 - self.m14*self.m23*self.m31 + self.m14*self.m21*self.m33 - \
-                self.m11*self.m24*self.m33 - self.m13*self.m21*self.m34 + self.m11*self.m23*self.m34) / d
-        M.m31 = (self.m22*self.m34*self.m41 - self.m24*self.m32*self.m41 + self.m24*self.m31*self.m42 - \
-                self.m21*self.m34*self.m42 - self.m22*self.m31*self.m44 + self.m21*self.m32*self.m44) / d
-        M.m32 = (self.m14*self.m32*self.m41 - self.m12*self.m34*self.m41 - self.m14*self.m31*self.m42 + \
-                self.m11*self.m34*self.m42 + self.m12*self.m31*self.m44 - self.m11*self.m32*self.m44) / d
-        M.m33 = (self.m12*self.m24*self.m41 - self.m14*self.m22*self.m41 + self.m14*self.m21*self.m42 - \
-                self.m11*self.m24*self.m42 - self.m12*self.m21*self.m44 + self.m11*self.m22*self.m44) / d
-        M.m34 = (self.m14*self.m22*self.m31 - self.m12*self.m24*self.m31 - self.m14*self.m21*self.m32 + \
-                self.m11*self.m24*self.m32 + self.m12*self.m21*self.m34 - self.m11*self.m22*self.m34) / d
-        M.m41 = (self.m23*self.m32*self.m41 - self.m22*self.m33*self.m41 - self.m23*self.m31*self.m42 + \
-                self.m21*self.m33*self.m42 + self.m22*self.m31*self.m43 - self.m21*self.m32*self.m43) / d
-        M.m42 = (self.m12*self.m33*self.m41 - self.m13*self.m32*self.m41 + self.m13*self.m31*self.m42 - \
-                self.m11*self.m33*self.m42 - self.m12*self.m31*self.m43 + self.m11*self.m32*self.m43) / d
-        M.m43 = (self.m13*self.m22*self.m41 - self.m12*self.m23*self.m41 - self.m13*self.m21*self.m42 + \
-                self.m11*self.m23*self.m42 + self.m12*self.m21*self.m43 - self.m11*self.m22*self.m43) / d
-        M.m44 = (self.m12*self.m23*self.m31 - self.m13*self.m22*self.m31 + self.m13*self.m21*self.m32 - \
-                self.m11*self.m23*self.m32 - self.m12*self.m21*self.m33 + self.m11*self.m22*self.m33) / d
-        return M
+            if out is None:
+                return Matrix4.identity()
+            return out.setIdentity()
+        
+        i11 = c11 / d
+        i12 = c12 / d
+        i13 = c13 / d
+        i21 = (m23 * m31 - m21 * m33) / d
+        i22 = (m11 * m33 - m13 * m31) / d
+        i23 = (m13 * m21 - m11 * m23) / d
+        i31 = (m21 * m32 - m22 * m31) / d
+        i32 = (m12 * m31 - m11 * m32) / d
+        i33 = (m11 * m22 - m12 * m21) / d
+        return _setAffine(out, i11, i12, i13, i21, i22, i23, i31, i32, i33,
+                          self.m14, self.m24, self.m34)
+    inverseAffine = property(getInverseAffine)
     
-    @property    
-    def transpose(self):
-        '''Returns the transpose of this matrix.'''
-        return Matrix4(self.m11, self.m21, self.m31, self.m41,
-                       self.m12, self.m22, self.m32, self.m42,
-                       self.m13, self.m23, self.m33, self.m43,
-                       self.m14, self.m24, self.m34, self.m44)
-                       
-    def multiplyPoint(self, pnt):
-        '''Transforms a position by this matrix.'''
-        from . import Vector3
-        assert isinstance(pnt, Vector3.Vector3)
-        
-        p = Vector3.Vector3()
-        p.x = self.m11 * pnt.x + self.m12 * pnt.y + self.m13 * pnt.z + self.m14
-        p.y = self.m21 * pnt.x + self.m22 * pnt.y + self.m23 * pnt.z + self.m24
-        p.z = self.m31 * pnt.x + self.m32 * pnt.y + self.m33 * pnt.z + self.m34
-        return p
-        
-    def multiplyVector(self, vec):
-        '''Transforms a direction by this matrix.'''
-        from . import Vector3
-        assert isinstance(vec, Vector3.Vector3)
-        
-        v = Vector3.Vector3()
-        v.x = self.m11 * vec.x + self.m12 * vec.y + self.m13 * vec.z
-        v.y = self.m21 * vec.x + self.m22 * vec.y + self.m23 * vec.z
-        v.z = self.m31 * vec.x + self.m32 * vec.y + self.m33 * vec.z
-        return v
+    def getInverseRigid(self, out=None):
+        '''The inverse of a rigid matrix, written into out when it is given.
+        
+        The upper 3x3 is assumed to be a pure rotation and the last row
+        0, 0, 0, 1, so the inverse is the transposed rotation with the
+        translation rotated back and negated.
+        '''
+        return _setAffine(out, self.m11, self.m21, self.m31,
+                          self.m12, self.m22, self.m32,
+                          self.m13, self.m23, self.m33,
+                          self.m14, self.m24, self.m34)
+    inverseRigid = property(getInverseRigid)
+    
+    def getTranspose(self, out=None):
+        '''Returns the transpose of this matrix, written into out when it is given.'''
+        values = (self.m11, self.m21, self.m31, self.m41,
+                  self.m12, self.m22, self.m32, self.m42,
+                  self.m13, self.m23, self.m33, self.m43,
+                  self.m14, self.m24, self.m34, self.m44)
+        if out is None:
+            out = Matrix4.__new__(Matrix4)
+        (out.m11, out.m12, out.m13, out.m14,
+         out.m21, out.m22, out.m23, out.m24,
+         out.m31, out.m32, out.m33, out.m34,
+         out.m41, out.m42, out.m43, out.m44) = values
+        return out
+    transpose = property(getTranspose)
+    
+    @property
+    def normalMatrix(self):
+        '''The inverse transpose of the upper 3x3, for transforming normals.
+        
+        Returns the identity when the upper 3x3 is singular.
+        '''
+        m11, m12, m13 = self.m11, self.m12, self.m13
+        m21, m22, m23 = self.m21, self.m22, self.m23
+        m31, m32, m33 = self.m31, self.m32, self.m33
+        
+        # the cofactor matrix divided by the determinant
+        c11 = m22 * m33 - m23 * m32
+        c12 = m23 * m31 - m21 * m33
+        c13 = m21 * m32 - m22 * m31
+        d = m11 * c11 + m12 * c12 + m13 * c13
+        if d == 0:
+            return Matrix3.identity()
+        
+        return Matrix3(c11 / d, c12 / d, c13 / d,
+                       (m13 * m32 - m12 * m33) / d,
+                       (m11 * m33 - m13 * m31) / d,
+                       (m12 * m31 - m11 * m32) / d,
+                       (m12 * m23 - m13 * m22) / d,
+                       (m13 * m21 - m11 * m23) / d,
+                       (m11 * m22 - m12 * m21) / d)
+        
+    def decomposeTRS(self):
+        '''Splits an affine matrix without shear into (translation, rotation, scale).
+        
+        The inverse of fromTRS: translation and scale are Vector3 and rotation
+        is a Quaternion, computed like Quaternion.matrix4. A negative
+        determinant is folded into the x scale.
+        '''
+        # Quaternion imports this module
+        from .Quaternion import Quaternion
+        
+        tx, ty, tz, x, y, z, w, sx, sy, sz = _decomposeTRS(self.m11, self.m12, self.m13, self.m14,
+                                                           self.m21, self.m22, self.m23, self.m24,
+                                                           self.m31, self.m32, self.m33, self.m34)
+        return Vector3._new(tx, ty, tz), Quaternion._new(x, y, z, w), Vector3._new(sx, sy, sz)
+        
+    def multiplyPoint(self, pnt, out=None):
+        '''Transforms a position by this matrix, into out when it is given.'''
+        assert not Util.VALIDATE or isinstance(pnt, Vector3)
+        
+        x = self.m11 * pnt.x + self.m12 * pnt.y + self.m13 * pnt.z + self.m14
+        y = self.m21 * pnt.x + self.m22 * pnt.y + self.m23 * pnt.z + self.m24
+        z = self.m31 * pnt.x + self.m32 * pnt.y + self.m33 * pnt.z + self.m34
+        if out is None:
+            out = Vector3.__new__(Vector3)
+        out.x = x
+        out.y = y
+        out.z = z
+        return out
+        
+    def multiplyVector(self, vec, out=None):
+        '''Transforms a direction by this matrix, into out when it is given.'''
+        assert not Util.VALIDATE or isinstance(vec, Vector3)
+        
+        x = self.m11 * vec.x + self.m12 * vec.y + self.m13 * vec.z
+        y = self.m21 * vec.x + self.m22 * vec.y + self.m23 * vec.z
+        z = self.m31 * vec.x + self.m32 * vec.y + self.m33 * vec.z
+        if out is None:
+            out = Vector3.__new__(Vector3)
+        out.x = x
+        out.y = y
+        out.z = z
+        return out
+        
+    def multiplyPoints(self, points, out=None, homogeneous=False):
+        '''Transforms many positions by this matrix.
+        
+        points may be a Vector3Array, a list of Vector3, a flat buffer of
+        x, y, z floats or an Nx3 array. A Vector3Array or a list of Vector3
+        gives the same kind back, anything else gives a flat array('d').
+        The result is written into out when it is given. homogeneous divides
+        by the fourth row, for projective matrices; points where it is 0, on
+        the plane through the eye, are left undivided rather than becoming
+        inf or nan.
+        '''
+        return self._transform(points, out, True, homogeneous)
+        
+    def multiplyVectors(self, vecs, out=None):
+        '''Transforms many directions by this matrix, see multiplyPoints.'''
+        return self._transform(vecs, out, False, False)
+        
+    def _transform(self, values, out, translate, homogeneous):
+        if isinstance(values, Vector3Array):
+            data = values.data
+        elif len(values) and isinstance(values[0], Vector3):
+            if not isinstance(out, Vector3Array):
+                if out is None:
+                    out = [Vector3.__new__(Vector3) for _ in range(len(values))]
+                assert len(out) == len(values)
+                assert not Util.VALIDATE or all(isinstance(p, Vector3) for p in out)
+                _transformVectors3(self, values, out, translate, homogeneous)
+                return out
+            data = Vector3Array.fromVectors(values).data
+        else:
+            data = Util.flatten(values, 3)
+        
+        data = Backend.current().transform3(self.toBuffer(), data, translate, homogeneous)
+        if isinstance(out, Vector3Array):
+            # written through the buffer, iterating out only yields copies
+            assert len(out.data) == len(data)
+            Util.copyInto(out.data, data)
+            return out
+        if out is None:
+            return Vector3Array._fromData(data) if isinstance(values, Vector3Array) else data
+        return Util.copyInto(out, data)
         
     def setIdentity(self):
         return self.set(1.0, 0.0, 0.0, 0.0,
@@ -217,18 +468,18 @@ class Matrix4(object):
     @staticmethod
     def identity():
         '''Returns the identity matrix.'''
-        return Matrix4(1.0, 0.0, 0.0, 0.0,
-                       0.0, 1.0, 0.0, 0.0,
-                       0.0, 0.0, 1.0, 0.0,
-                       0.0, 0.0, 0.0, 1.0)
+        return Matrix4._new(1.0, 0.0, 0.0, 0.0,
+                            0.0, 1.0, 0.0, 0.0,
+                            0.0, 0.0, 1.0, 0.0,
+                            0.0, 0.0, 0.0, 1.0)
                
     @staticmethod
     def zero():
         '''Returns a matrix with all elements set to zero.'''
-        return Matrix4(0.0, 0.0, 0.0, 0.0,
-                       0.0, 0.0, 0.0, 0.0,
-                       0.0, 0.0, 0.0, 0.0,
-                       0.0, 0.0, 0.0, 0.0)
+        return Matrix4._new(0.0, 0.0, 0.0, 0.0,
+                            0.0, 0.0, 0.0, 0.0,
+                            0.0, 0.0, 0.0, 0.0,
+                            0.0, 0.0, 0.0, 0.0)
                        
     @staticmethod
     def translate(tx, ty, tz):
@@ -246,10 +497,10 @@ class Matrix4(object):
     def rotateXInRadian(x):
         cos = math.cos(x)
         sin = math.sin(x)
-        return Matrix4(1.0, 0.0,  0.0, 0.0,
-                       0.0, cos, -sin, 0.0,
-                       0.0, sin,  cos, 0.0,
-                       0.0, 0.0,  0.0, 1.0)
+        return Matrix4._new(1.0, 0.0,  0.0, 0.0,
+                            0.0, cos, -sin, 0.0,
+                            0.0, sin,  cos, 0.0,
+                            0.0, 0.0,  0.0, 1.0)
         
     @staticmethod
     def rotateY(y):
@@ -259,10 +510,10 @@ class Matrix4(object):
     def rotateYInRadian(y):
         cos = math.cos(y)
         sin = math.sin(y)
-        return Matrix4(cos, 0.0, sin, 0.0,
-                       0.0, 1.0, 0.0, 0.0,
-                      -sin, 0.0, cos, 0.0,
-                       0.0, 0.0, 0.0, 1.0)
+        return Matrix4._new(cos, 0.0, sin, 0.0,
+                            0.0, 1.0, 0.0, 0.0,
+                           -sin, 0.0, cos, 0.0,
+                            0.0, 0.0, 0.0, 1.0)
         
     @staticmethod
     def rotateZ(z):
@@ -272,10 +523,10 @@ class Matrix4(object):
     def rotateZInRadian(z):
         cos = math.cos(z)
         sin = math.sin(z)
-        return Matrix4(cos, -sin, 0.0, 0.0,
-                       sin,  cos, 0.0, 0.0,
-                       0.0,  0.0, 1.0, 0.0,
-                       0.0,  0.0, 0.0, 1.0)
+        return Matrix4._new(cos, -sin, 0.0, 0.0,
+                            sin,  cos, 0.0, 0.0,
+                            0.0,  0.0, 1.0, 0.0,
+                            0.0,  0.0, 0.0, 1.0)
                        
     @staticmethod
     def scale(sx, sy, sz):
@@ -284,14 +535,33 @@ class Matrix4(object):
                        0.0, 0.0,  sz, 0.0,
                        0.0, 0.0, 0.0, 1.0)
                        
+    @staticmethod
+    def fromTRS(translation, rotation, scale, out=None):
+        '''Creates translate * rotation * scale, written into out when it is given.
+        
+        translation and scale are Vector3, rotation is a unit Quaternion. The
+        elements are computed directly, with the same values as the product of
+        Matrix4.translate, rotation.toMatrix4() and Matrix4.scale.
+        '''
+        assert not Util.VALIDATE or isinstance(translation, Vector3) and isinstance(scale, Vector3)
+        
+        if out is None:
+            out = Matrix4.__new__(Matrix4)
+        (out.m11, out.m12, out.m13, out.m14,
+         out.m21, out.m22, out.m23, out.m24,
+         out.m31, out.m32, out.m33, out.m34,
+         out.m41, out.m42, out.m43, out.m44) = _composeTRS(translation.x, translation.y, translation.z,
+                                                           rotation.x, rotation.y, rotation.z, rotation.w,
+                                                           scale.x, scale.y, scale.z)
+        return out
+        
     @staticmethod
     def axisAngle(axis, angle):
         return Matrix4.axisAngleInRadian(axis, Util.degreeToRadian(angle))
         
     @staticmethod
     def axisAngleInRadian(axis, angle):
-        from . import Vector3
-        assert isinstance(axis, Vector3.Vector3) and type(angle) in (int, int, float)
+        assert not Util.VALIDATE or isinstance(axis, Vector3) and type(angle) in (int, int, float)
         
         n = axis.normalized
         x = n.x
@@ -301,14 +571,141 @@ class Matrix4(object):
         cos = math.cos(angle)
         l_cos = 1.0 - cos
         
-        M = Matrix4()
-        M.m11 = x * x * l_cos + cos
-        M.m12 = x * y * l_cos - z * sin
-        M.m13 = x * z * l_cos + y * sin
-        M.m21 = y * x * l_cos + z * sin
-        M.m22 = y * y * l_cos + cos
-        M.m23 = y * z * l_cos - x * sin
-        M.m31 = x * z * l_cos - y * sin
-        M.m32 = y * z * l_cos + x * sin
-        M.m33 = z * z * l_cos + cos
-        return M
\ No newline at end of file
+        return Matrix4._new(x * x * l_cos + cos, x * y * l_cos - z * sin, x * z * l_cos + y * sin, 0.0,
+                            y * x * l_cos + z * sin, y * y * l_cos + cos, y * z * l_cos - x * sin, 0.0,
+                            x * z * l_cos - y * sin, y * z * l_cos + x * sin, z * z * l_cos + cos, 0.0,
+                            0.0, 0.0, 0.0, 1.0)
+        
+    @staticmethod
+    def perspective(fovy, aspect, near, far):
+        return Matrix4.perspectiveInRadian(Util.degreeToRadian(fovy), aspect, near, far)
+        
+    @staticmethod
+    def perspectiveInRadian(fovy, aspect, near, far):
+        '''Creates a projection with vertical field of view fovy, like gluPerspective.
+        
+        The camera looks down -z, and near and far, both positive, map to
+        z = -1 and z = 1 after the division by w.
+        '''
+        assert near > 0 and far > near and aspect > 0
+        f = 1.0 / math.tan(fovy * 0.5)
+        d = near - far
+        return Matrix4._new(f / aspect, 0.0, 0.0, 0.0,
+                            0.0, f, 0.0, 0.0,
+                            0.0, 0.0, (far + near) / d, 2.0 * far * near / d,
+                            0.0, 0.0, -1.0, 0.0)
+        
+    @staticmethod
+    def orthographic(left, right, bottom, top, near, far):
+        '''Creates a parallel projection of the given box to -1..1, like glOrtho.'''
+        assert right != left and top != bottom and far != near
+        w = right - left
+        h = top - bottom
+        d = far - near
+        return Matrix4._new(2.0 / w, 0.0, 0.0, -(right + left) / w,
+                            0.0, 2.0 / h, 0.0, -(top + bottom) / h,
+                            0.0, 0.0, -2.0 / d, -(far + near) / d,
+                            0.0, 0.0, 0.0, 1.0)
+        
+    @staticmethod
+    def lookAt(eye, target, up):
+        '''Creates the view matrix of a camera at eye looking at target, like gluLookAt.
+        
+        The camera looks down -z with up along +y in view space. up must
+        not be parallel to target - eye.
+        '''
+        assert not Util.VALIDATE or isinstance(eye, Vector3) and isinstance(target, Vector3) \
+                                   and isinstance(up, Vector3)
+        
+        f = (target - eye).normalize()
+        s = Vector3.cross(f, up).normalize()
+        u = Vector3.cross(s, f)
+        return Matrix4._new(s.x, s.y, s.z, -Vector3.dot(s, eye),
+                            u.x, u.y, u.z, -Vector3.dot(u, eye),
+                            -f.x, -f.y, -f.z, Vector3.dot(f, eye),
+                            0.0, 0.0, 0.0, 1.0)
+
+
+def _transformVectors3(m, values, out, translate, homogeneous):
+    # transforms a sequence of Vector3 into the Vector3 objects of out
+    m11, m12, m13 = m.m11, m.m12, m.m13
+    m21, m22, m23 = m.m21, m.m22, m.m23
+    m31, m32, m33 = m.m31, m.m32, m.m33
+    m14, m24, m34 = (m.m14, m.m24, m.m34) if translate else (0.0, 0.0, 0.0)
+    m41, m42, m43, m44 = m.m41, m.m42, m.m43, m.m44
+    for v, p in zip(values, out):
+        x = v.x
+        y = v.y
+        z = v.z
+        rx = m11 * x + m12 * y + m13 * z + m14
+        ry = m21 * x + m22 * y + m23 * z + m24
+        rz = m31 * x + m32 * y + m33 * z + m34
+        if homogeneous:
+            w = (m41 * x + m42 * y + m43 * z + m44) or 1.0
+            rx /= w
+            ry /= w
+            rz /= w
+        p.x = rx
+        p.y = ry
+        p.z = rz
+
+def _setAffine(out, m11, m12, m13, m21, m22, m23, m31, m32, m33, tx, ty, tz):
+    # writes the affine matrix with rotation part m and translation -m * t
+    if out is None:
+        out = Matrix4.__new__(Matrix4)
+    out.m11 = m11
+    out.m12 = m12
+    out.m13 = m13
+    out.m14 = -(m11 * tx + m12 * ty + m13 * tz)
+    out.m21 = m21
+    out.m22 = m22
+    out.m23 = m23
+    out.m24 = -(m21 * tx + m22 * ty + m23 * tz)
+    out.m31 = m31
+    out.m32 = m32
+    out.m33 = m33
+    out.m34 = -(m31 * tx + m32 * ty + m33 * tz)
+    out.m41 = 0.0
+    out.m42 = 0.0
+    out.m43 = 0.0
+    out.m44 = 1.0
+    return out
+
+def _composeTRS(tx, ty, tz, x, y, z, w, sx, sy, sz):
+    # translate * rotation * scale, the rotation as in Quaternion.toMatrix4
+    return ((1.0-2.0*(y*y+z*z)) * sx, 2.0*(x*y-z*w) * sy, 2.0*(x*z+y*w) * sz, tx,
+            2.0*(x*y+z*w) * sx, (1.0-2.0*(x*x+z*z)) * sy, 2.0*(y*z-x*w) * sz, ty,
+            2.0*(x*z-y*w) * sx, 2.0*(y*z+x*w) * sy, (1.0-2.0*(x*x+y*y)) * sz, tz,
+            0.0, 0.0, 0.0, 1.0)
+
+def _decomposeTRS(m11, m12, m13, m14, m21, m22, m23, m24, m31, m32, m33, m34):
+    # (tx, ty, tz, x, y, z, w, sx, sy, sz) of an affine matrix without shear
+    sx = math.sqrt(m11 * m11 + m21 * m21 + m31 * m31)
+    sy = math.sqrt(m12 * m12 + m22 * m22 + m32 * m32)
+    sz = math.sqrt(m13 * m13 + m23 * m23 + m33 * m33)
+    if m11 * (m22 * m33 - m23 * m32) + m21 * (m13 * m32 - m12 * m33) + m31 * (m12 * m23 - m13 * m22) < 0:
+        sx = -sx
+    
+    # a column scaled to zero has no direction, the identity's is used
+    r11, r21, r31 = (m11 / sx, m21 / sx, m31 / sx) if sx else (1.0, 0.0, 0.0)
+    r12, r22, r32 = (m12 / sy, m22 / sy, m32 / sy) if sy else (0.0, 1.0, 0.0)
+    r13, r23, r33 = (m13 / sz, m23 / sz, m33 / sz) if sz else (0.0, 0.0, 1.0)
+    x, y, z, w = _quaternion(r11, r12, r13, r21, r22, r23, r31, r32, r33)
+    return m14, m24, m34, x, y, z, w, sx, sy, sz
+
+def _quaternion(m11, m12, m13, m21, m22, m23, m31, m32, m33):
+    # (x, y, z, w) of the rotation matrix m, used by Quaternion.matrix4
+    trace = m11 + m22 + m33
+
+    if trace > 0:
+        s = 0.5 / math.sqrt(trace + 1.0)
+        return (m32 - m23) * s, (m13 - m31) * s, (m21 - m12) * s, 0.25 / s
+    elif m11 > m22 and m11 > m33:
+        s = 2.0 * math.sqrt(1.0 + m11 - m22 - m33)
+        return 0.25 * s, (m12 + m21) / s, (m13 + m31) / s, (m32 - m23) / s
+    elif m22 > m33:
+        s = 2.0 * math.sqrt(1.0 + m22 - m11 - m33)
+        return (m12 + m21) / s, 0.25 * s, (m23 + m32) / s, (m13 - m31) / s
+    else:
+        s = 2.0 * math.sqrt(1.0 + m33 - m11 - m22)
+        return (m13 + m31) / s, (m23 + m32) / s, 0.25 * s, (m21 - m12) / s
\ No newline at end of file
@@ -0,0 +1,372 @@
+import math
+from array import array
+from itertools import repeat
+from . import Backend, Util
+from .Vector3 import Vector3
+from .Vector3Array import Vector3Array
+from .Quaternion import Quaternion
+from .Matrix4 import Matrix4, _composeTRS, _decomposeTRS
+
+_IDENTITY = (1.0, 0.0, 0.0, 0.0,
+             0.0, 1.0, 0.0, 0.0,
+             0.0, 0.0, 1.0, 0.0,
+             0.0, 0.0, 0.0, 1.0)
+
+class Matrix4Stack(object):
+    '''A packed sequence of 4x4 matrices.
+
+    Matrices are stored row-major, 16 floats per matrix (m11, m12, ...,
+    m44), in a single contiguous array('d'). Every operation uses the same
+    arithmetic as Matrix4 and gives the same result matrix for matrix.
+    '''
+    __slots__ = ['data']
+    __hash__ = None
+
+    def __init__(self, data=()):
+        self.data = array('d', data)
+        assert len(self.data) % 16 == 0
+
+    def copy(self):
+        return Matrix4Stack(self.data)
+
+    @property
+    def __array_interface__(self):
+        # lets numpy.asarray share the storage without copying
+        return Util.arrayInterface(self.data, (len(self), 4, 4))
+
+    def __buffer__(self, flags):
+        return self.view()
+
+    def view(self):
+        '''A memoryview of shape (n, 4, 4) sharing the storage, 1D when empty.'''
+        view = memoryview(self.data)
+        return view.cast('B').cast('d', (len(self), 4, 4)) if len(view) else view
+
+    def __repr__(self):
+        return 'Matrix4Stack(%d)' % len(self)
+
+    def __len__(self):
+        return len(self.data) // 16
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('Matrix4Stack index out of range')
+        j = i * 16
+        return Matrix4._new(*self.data[j:j + 16])
+
+    def __setitem__(self, i, m):
+        assert isinstance(m, Matrix4)
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('Matrix4Stack index out of range')
+        j = i * 16
+        self.data[j:j + 16] = array('d', _elements(m))
+
+    def __iter__(self):
+        d = self.data
+        for j in range(0, len(d), 16):
+            yield Matrix4._new(*d[j:j + 16])
+
+    def __eq__(self, other):
+        if isinstance(other, Matrix4Stack):
+            return len(self.data) == len(other.data) and \
+                   all(Util.isEqual(a, b) for a, b in zip(self.data, other.data))
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def append(self, m):
+        assert isinstance(m, Matrix4)
+        if isinstance(self.data, memoryview):
+            raise TypeError('cannot append to a wrapped buffer, wrapped buffers have a fixed size; append to a copy()')
+        self.data.extend(_elements(m))
+        return self
+
+    def toMatrices(self):
+        '''Returns the content as a list of Matrix4.'''
+        return list(self)
+
+    def __mul__(self, other):
+        '''Multiplies pairwise, or every matrix by a single Matrix4.'''
+        return Matrix4Stack.multiply(self, other)
+
+    @property
+    def determinant(self):
+        '''The determinant of every matrix, as an array('d').'''
+        return array('d', [_determinant(*m) for m in _rows(self.data)])
+
+    @property
+    def inverse(self):
+        '''The inverse of every matrix, singular matrices give the identity.'''
+        return Matrix4Stack._fromData(Backend.current().inverse4(self.data))
+
+    @property
+    def transpose(self):
+        '''The transpose of every matrix.'''
+        data = array('d')
+        extend = data.extend
+        for (m11, m12, m13, m14, m21, m22, m23, m24,
+             m31, m32, m33, m34, m41, m42, m43, m44) in _rows(self.data):
+            extend((m11, m21, m31, m41,
+                    m12, m22, m32, m42,
+                    m13, m23, m33, m43,
+                    m14, m24, m34, m44))
+        return Matrix4Stack._fromData(data)
+
+    def decomposeTRS(self):
+        '''Splits every matrix like Matrix4.decomposeTRS.
+
+        Returns (translations, rotations, scales) as a Vector3Array, a
+        QuaternionArray and a Vector3Array.
+        '''
+        # QuaternionArray imports this module
+        from .QuaternionArray import QuaternionArray
+
+        translations = array('d')
+        rotations = array('d')
+        scales = array('d')
+        for m in _rows(self.data):
+            tx, ty, tz, x, y, z, w, sx, sy, sz = _decomposeTRS(*m[:12])
+            translations.extend((tx, ty, tz))
+            rotations.extend((x, y, z, w))
+            scales.extend((sx, sy, sz))
+        return (Vector3Array._fromData(translations), QuaternionArray._fromData(rotations),
+                Vector3Array._fromData(scales))
+
+    @staticmethod
+    def identity(n):
+        '''Returns n identity matrices.'''
+        return Matrix4Stack._fromData(array('d', _IDENTITY) * n)
+
+    @staticmethod
+    def fromMatrices(matrices):
+        '''Packs a sequence of Matrix4.'''
+        data = array('d')
+        for m in matrices:
+            data.extend(_elements(m))
+        return Matrix4Stack._fromData(data)
+
+    @staticmethod
+    def fromBuffer(buf, columnMajor=False):
+        '''Wraps buf, 16 floats per matrix, without copying.
+
+        The layout is row-major (m11, m12, m13, m14, m21, ...) unless
+        columnMajor is set, as used by OpenGL, which costs a transposed
+        copy. array('d'), memoryview and NumPy float64 buffers are shared,
+        so writes show through both ways; other inputs are copied. A wrapped
+        buffer has a fixed size.
+        '''
+        stack = Matrix4Stack._fromData(Util.asBuffer(buf, 16))
+        return stack.transpose if columnMajor else stack
+
+    @staticmethod
+    def _fromData(data):
+        # wraps data without copying
+        assert len(data) % 16 == 0
+        a = Matrix4Stack.__new__(Matrix4Stack)
+        a.data = data
+        return a
+
+    @staticmethod
+    def multiply(a, b):
+        '''Products a * b, either may be a single Matrix4.'''
+        if isinstance(a, Matrix4Stack):
+            n = len(a)
+            if isinstance(b, Matrix4Stack):
+                assert len(b) == n
+        else:
+            assert isinstance(b, Matrix4Stack)
+            n = len(b)
+
+        return Matrix4Stack._fromData(Backend.current().multiply4(_operand(a), _operand(b), n))
+
+    @staticmethod
+    def translate(translations):
+        '''Creates translation matrices from a Vector3Array or an x, y, z buffer.'''
+        data = array('d')
+        extend = data.extend
+        for tx, ty, tz in _vectors(translations):
+            extend((1.0, 0.0, 0.0, tx,
+                    0.0, 1.0, 0.0, ty,
+                    0.0, 0.0, 1.0, tz,
+                    0.0, 0.0, 0.0, 1.0))
+        return Matrix4Stack._fromData(data)
+
+    @staticmethod
+    def scale(scales):
+        '''Creates scale matrices from a Vector3Array or an x, y, z buffer.'''
+        data = array('d')
+        extend = data.extend
+        for sx, sy, sz in _vectors(scales):
+            extend(( sx, 0.0, 0.0, 0.0,
+                    0.0,  sy, 0.0, 0.0,
+                    0.0, 0.0,  sz, 0.0,
+                    0.0, 0.0, 0.0, 1.0))
+        return Matrix4Stack._fromData(data)
+
+    @staticmethod
+    def fromTRS(translations, rotations, scales):
+        '''Creates translate * rotation * scale matrices like Matrix4.fromTRS.
+
+        translations and scales are Vector3Arrays, lists of Vector3 or x, y, z
+        buffers, rotations a QuaternionArray, a list of Quaternion or an
+        x, y, z, w buffer, all of the same length.
+        '''
+        translations = _vectors(translations)
+        rotations = _quaternions(rotations)
+        scales = _vectors(scales)
+        assert len(translations) == len(rotations) == len(scales)
+
+        data = array('d')
+        extend = data.extend
+        for (tx, ty, tz), (x, y, z, w), (sx, sy, sz) in zip(translations, rotations, scales):
+            extend(_composeTRS(tx, ty, tz, x, y, z, w, sx, sy, sz))
+        return Matrix4Stack._fromData(data)
+
+    @staticmethod
+    def rotateX(angles):
+        return Matrix4Stack.rotateXInRadian(_radians(angles))
+
+    @staticmethod
+    def rotateXInRadian(angles):
+        data = array('d')
+        extend = data.extend
+        for x in angles:
+            cos = math.cos(x)
+            sin = math.sin(x)
+            extend((1.0, 0.0,  0.0, 0.0,
+                    0.0, cos, -sin, 0.0,
+                    0.0, sin,  cos, 0.0,
+                    0.0, 0.0,  0.0, 1.0))
+        return Matrix4Stack._fromData(data)
+
+    @staticmethod
+    def rotateY(angles):
+        return Matrix4Stack.rotateYInRadian(_radians(angles))
+
+    @staticmethod
+    def rotateYInRadian(angles):
+        data = array('d')
+        extend = data.extend
+        for y in angles:
+            cos = math.cos(y)
+            sin = math.sin(y)
+            extend(( cos, 0.0, sin, 0.0,
+                     0.0, 1.0, 0.0, 0.0,
+                    -sin, 0.0, cos, 0.0,
+                     0.0, 0.0, 0.0, 1.0))
+        return Matrix4Stack._fromData(data)
+
+    @staticmethod
+    def rotateZ(angles):
+        return Matrix4Stack.rotateZInRadian(_radians(angles))
+
+    @staticmethod
+    def rotateZInRadian(angles):
+        data = array('d')
+        extend = data.extend
+        for z in angles:
+            cos = math.cos(z)
+            sin = math.sin(z)
+            extend((cos, -sin, 0.0, 0.0,
+                    sin,  cos, 0.0, 0.0,
+                    0.0,  0.0, 1.0, 0.0,
+                    0.0,  0.0, 0.0, 1.0))
+        return Matrix4Stack._fromData(data)
+
+    @staticmethod
+    def axisAngle(axes, angles):
+        '''Creates rotations of angles degrees around axes, a single Vector3 axis is shared.'''
+        return Matrix4Stack.axisAngleInRadian(axes, _radians(angles))
+
+    @staticmethod
+    def axisAngleInRadian(axes, angles):
+        '''Creates rotations of angles radians around axes, a single Vector3 axis is shared.'''
+        if isinstance(axes, Vector3):
+            axes = repeat((axes.x, axes.y, axes.z), len(angles))
+        else:
+            axes = _vectors(axes)
+            assert len(axes) == len(angles)
+
+        sqrt = math.sqrt
+        data = array('d')
+        extend = data.extend
+        for (x, y, z), angle in zip(axes, angles):
+            # same as Vector3.normalized
+            m = sqrt(x ** 2 + y ** 2 + z ** 2)
+            if m != 0:
+                x, y, z = x / m, y / m, z / m
+            sin = math.sin(angle)
+            cos = math.cos(angle)
+            l_cos = 1.0 - cos
+            extend((x * x * l_cos + cos, x * y * l_cos - z * sin, x * z * l_cos + y * sin, 0.0,
+                    y * x * l_cos + z * sin, y * y * l_cos + cos, y * z * l_cos - x * sin, 0.0,
+                    x * z * l_cos - y * sin, y * z * l_cos + x * sin, z * z * l_cos + cos, 0.0,
+                    0.0, 0.0, 0.0, 1.0))
+        return Matrix4Stack._fromData(data)
+
+
+def _elements(m):
+    return (m.m11, m.m12, m.m13, m.m14,
+            m.m21, m.m22, m.m23, m.m24,
+            m.m31, m.m32, m.m33, m.m34,
+            m.m41, m.m42, m.m43, m.m44)
+
+def _rows(d):
+    # the 16 elements of every matrix packed in d
+    return zip(*[d[k::16] for k in range(16)])
+
+def _operand(m):
+    # the packed data of a stack, or the 16 elements of a single Matrix4
+    if isinstance(m, Matrix4Stack):
+        return m.data
+    assert isinstance(m, Matrix4)
+    return _elements(m)
+
+def _vectors(values):
+    # (x, y, z) triples of a Vector3Array, a list of Vector3 or a flat buffer
+    if isinstance(values, Vector3Array):
+        d = values.data
+    elif len(values) and isinstance(values[0], Vector3):
+        d = Vector3Array.fromVectors(values).data
+    else:
+        d = Util.flatten(values, 3)
+    return list(zip(d[0::3], d[1::3], d[2::3]))
+
+def _quaternions(values):
+    # (x, y, z, w) tuples of a QuaternionArray, a list of Quaternion or a flat buffer
+    from .QuaternionArray import QuaternionArray
+    if isinstance(values, QuaternionArray):
+        d = values.data
+    elif len(values) and isinstance(values[0], Quaternion):
+        return [(q.x, q.y, q.z, q.w) for q in values]
+    else:
+        d = Util.flatten(values, 4)
+    return list(zip(d[0::4], d[1::4], d[2::4], d[3::4]))
+
+def _radians(angles):
+    return [Util.degreeToRadian(a) for a in angles]
+
+def _determinant(m11, m12, m13, m14, m21, m22, m23, m24,
+                 m31, m32, m33, m34, m41, m42, m43, m44):
+    # same arithmetic as Matrix4.determinant
+    A0 = m11 * m22 - m12 * m21
+    A1 = m11 * m23 - m13 * m21
+    A2 = m11 * m24 - m14 * m21
+    A3 = m12 * m23 - m13 * m22
+    A4 = m12 * m24 - m14 * m22
+    A5 = m13 * m24 - m14 * m23
+    B0 = m31 * m42 - m32 * m41
+    B1 = m31 * m43 - m33 * m41
+    B2 = m31 * m44 - m34 * m41
+    B3 = m32 * m43 - m33 * m42
+    B4 = m32 * m44 - m34 * m42
+    B5 = m33 * m44 - m34 * m43
+    return A0*B5 - A1*B4 + A2*B3 + A3*B2 - A4*B1 + A5*B0
\ No newline at end of file
@@ -0,0 +1,343 @@
+from array import array
+import numpy
+from .PythonBackend import PythonBackend
+
+class NumpyBackend(PythonBackend):
+    '''Vectorized kernels on NumPy, see PythonBackend for the interface.
+
+    Inputs are viewed as float64 arrays without copying where possible and
+    results are returned as array('d') like the reference kernels. Every
+    expression is evaluated in the order of the scalar code, so results
+    agree with PythonBackend. Batches shorter than threshold elements go
+    to the pure-Python kernels, which are faster there.
+    '''
+    name = 'numpy'
+    releasesGIL = True
+
+    def __init__(self, threshold=16):
+        self.threshold = threshold
+
+    def transform2(self, m, src, translate, homogeneous):
+        if len(src) < 2 * self.threshold:
+            return PythonBackend.transform2(self, m, src, translate, homogeneous)
+        v = _view(src, 2)
+        x = v[:, 0]
+        y = v[:, 1]
+        m11, m12, m13, m21, m22, m23, m31, m32, m33 = m
+        result = numpy.empty(v.shape)
+        if translate:
+            result[:, 0] = m11 * x + m12 * y + m13
+            result[:, 1] = m21 * x + m22 * y + m23
+        else:
+            result[:, 0] = m11 * x + m12 * y
+            result[:, 1] = m21 * x + m22 * y
+        if homogeneous:
+            w = m31 * x + m32 * y + m33
+            w[w == 0.0] = 1.0
+            result /= w[:, None]
+        return _result(result)
+
+    def transform3(self, m, src, translate, homogeneous):
+        if len(src) < 3 * self.threshold:
+            return PythonBackend.transform3(self, m, src, translate, homogeneous)
+        v = _view(src, 3)
+        x = v[:, 0]
+        y = v[:, 1]
+        z = v[:, 2]
+        (m11, m12, m13, m14, m21, m22, m23, m24,
+         m31, m32, m33, m34, m41, m42, m43, m44) = m
+        result = numpy.empty(v.shape)
+        if translate:
+            result[:, 0] = m11 * x + m12 * y + m13 * z + m14
+            result[:, 1] = m21 * x + m22 * y + m23 * z + m24
+            result[:, 2] = m31 * x + m32 * y + m33 * z + m34
+        else:
+            result[:, 0] = m11 * x + m12 * y + m13 * z
+            result[:, 1] = m21 * x + m22 * y + m23 * z
+            result[:, 2] = m31 * x + m32 * y + m33 * z
+        if homogeneous:
+            w = m41 * x + m42 * y + m43 * z + m44
+            w[w == 0.0] = 1.0
+            result /= w[:, None]
+        return _result(result)
+
+    def multiply4(self, a, b, n):
+        if n < self.threshold:
+            return PythonBackend.multiply4(self, a, b, n)
+        a = _view(a, 16).reshape(-1, 4, 4)
+        b = _view(b, 16).reshape(-1, 4, 4)
+        # the four terms are added left to right like the scalar product
+        result = a[:, :, 0, None] * b[:, None, 0, :] + \
+                 a[:, :, 1, None] * b[:, None, 1, :] + \
+                 a[:, :, 2, None] * b[:, None, 2, :] + \
+                 a[:, :, 3, None] * b[:, None, 3, :]
+        return _result(numpy.broadcast_to(result, (n, 4, 4)))
+
+    def inverse4(self, data):
+        n = len(data) // 16
+        if n < self.threshold:
+            return PythonBackend.inverse4(self, data)
+        m = _view(data, 16)
+        (m11, m12, m13, m14, m21, m22, m23, m24,
+         m31, m32, m33, m34, m41, m42, m43, m44) = m.T
+        result = numpy.empty((n, 16))
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            A0 = m11 * m22 - m12 * m21
+            A1 = m11 * m23 - m13 * m21
+            A2 = m11 * m24 - m14 * m21
+            A3 = m12 * m23 - m13 * m22
+            A4 = m12 * m24 - m14 * m22
+            A5 = m13 * m24 - m14 * m23
+            B0 = m31 * m42 - m32 * m41
+            B1 = m31 * m43 - m33 * m41
+            B2 = m31 * m44 - m34 * m41
+            B3 = m32 * m43 - m33 * m42
+            B4 = m32 * m44 - m34 * m42
+            B5 = m33 * m44 - m34 * m43
+            d = A0*B5 - A1*B4 + A2*B3 + A3*B2 - A4*B1 + A5*B0
+            result[:, 0] = ( m22*B5 - m23*B4 + m24*B3) / d
+            result[:, 1] = (-m12*B5 + m13*B4 - m14*B3) / d
+            result[:, 2] = ( m42*A5 - m43*A4 + m44*A3) / d
+            result[:, 3] = (-m32*A5 + m33*A4 - m34*A3) / d
+            result[:, 4] = (-m21*B5 + m23*B2 - m24*B1) / d
+            result[:, 5] = ( m11*B5 - m13*B2 + m14*B1) / d
+            result[:, 6] = (-m41*A5 + m43*A2 - m44*A1) / d
+            result[:, 7] = ( m31*A5 - m33*A2 + m34*A1) / d
+            result[:, 8] = ( m21*B4 - m22*B2 + m24*B0) / d
+            result[:, 9] = (-m11*B4 + m12*B2 - m14*B0) / d
+            result[:, 10] = ( m41*A4 - m42*A2 + m44*A0) / d
+            result[:, 11] = (-m31*A4 + m32*A2 - m34*A0) / d
+            result[:, 12] = (-m21*B3 + m22*B1 - m23*B0) / d
+            result[:, 13] = ( m11*B3 - m12*B1 + m13*B0) / d
+            result[:, 14] = (-m41*A3 + m42*A1 - m43*A0) / d
+            result[:, 15] = ( m31*A3 - m32*A1 + m33*A0) / d
+            singular = d == 0
+
+            # the affine fast path of Matrix4.getInverse
+            affine = (m41 == 0.0) & (m42 == 0.0) & (m43 == 0.0) & (m44 == 1.0)
+            if affine.any():
+                c11 = m22 * m33 - m23 * m32
+                c12 = m13 * m32 - m12 * m33
+                c13 = m12 * m23 - m13 * m22
+                d = m11 * c11 + m21 * c12 + m31 * c13
+                i11 = c11 / d
+                i12 = c12 / d
+                i13 = c13 / d
+                i21 = (m23 * m31 - m21 * m33) / d
+                i22 = (m11 * m33 - m13 * m31) / d
+                i23 = (m13 * m21 - m11 * m23) / d
+                i31 = (m21 * m32 - m22 * m31) / d
+                i32 = (m12 * m31 - m11 * m32) / d
+                i33 = (m11 * m22 - m12 * m21) / d
+                fast = numpy.stack((i11, i12, i13, -(i11 * m14 + i12 * m24 + i13 * m34),
+                                    i21, i22, i23, -(i21 * m14 + i22 * m24 + i23 * m34),
+                                    i31, i32, i33, -(i31 * m14 + i32 * m24 + i33 * m34),
+                                    numpy.zeros(n), numpy.zeros(n), numpy.zeros(n), numpy.ones(n)),
+                                   axis=1)
+                result[affine] = fast[affine]
+                singular = numpy.where(affine, d == 0, singular)
+
+        # determinant equals zero, means no inverse, return identity
+        result[singular] = numpy.eye(4).ravel()
+        return _result(result)
+
+    def normalize(self, data, size):
+        if len(data) < size * self.threshold:
+            return PythonBackend.normalize(self, data, size)
+        v = _view(data, size)
+        squared = v[:, 0] * v[:, 0]
+        for k in range(1, size):
+            squared = squared + v[:, k] * v[:, k]
+        m = numpy.sqrt(squared)
+        m[m == 0.0] = 1.0
+        return _result(v / m[:, None])
+
+    def multiplyQuaternions(self, a, b, n):
+        if n < self.threshold:
+            return PythonBackend.multiplyQuaternions(self, a, b, n)
+        x1, y1, z1, w1 = _view(a, 4).T
+        x2, y2, z2, w2 = _view(b, 4).T
+        result = numpy.empty((n, 4))
+        result[:, 0] = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+        result[:, 1] = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+        result[:, 2] = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+        result[:, 3] = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+        return _result(result)
+
+    def normalizeQuaternions(self, data):
+        if len(data) < 4 * self.threshold:
+            return PythonBackend.normalizeQuaternions(self, data)
+        v = _view(data, 4)
+        x, y, z, w = v.T
+        m = numpy.sqrt(x ** 2 + y ** 2 + z ** 2 + w ** 2)
+        m[m == 0.0] = 1.0
+        return _result(v / m[:, None])
+
+    def rotatePoints(self, quats, points, n):
+        if n < self.threshold:
+            return PythonBackend.rotatePoints(self, quats, points, n)
+        x, y, z, w = _view(quats, 4).T
+        px, py, pz = _view(points, 3).T
+        x2 = x * x
+        y2 = y * y
+        z2 = z * z
+        w2 = w * w
+        result = numpy.empty((n, 3))
+        result[:, 0] = (x2+w2-y2-z2)*px + 2.0*(x*y-z*w)*py + 2.0*(x*z+y*w)*pz
+        result[:, 1] = 2.0*(x*y+z*w)*px + (w2-x2+y2-z2)*py + 2.0*(y*z-x*w)*pz
+        result[:, 2] = 2.0*(x*z-y*w)*px + 2.0*(x*w+y*z)*py + (w2-x2-y2+z2)*pz
+        return _result(result)
+
+    def transformBoxes(self, m, data):
+        if len(data) < 6 * self.threshold:
+            return PythonBackend.transformBoxes(self, m, data)
+        v = _view(data, 6)
+        minx, miny, minz, maxx, maxy, maxz = v.T
+        (m11, m12, m13, m14, m21, m22, m23, m24,
+         m31, m32, m33, m34, m41, m42, m43, m44) = m
+        a11 = abs(m11)
+        a12 = abs(m12)
+        a13 = abs(m13)
+        a21 = abs(m21)
+        a22 = abs(m22)
+        a23 = abs(m23)
+        a31 = abs(m31)
+        a32 = abs(m32)
+        a33 = abs(m33)
+        with numpy.errstate(invalid='ignore'):
+            # empty boxes give nan here, they are copied over below
+            cx = (minx + maxx) * 0.5
+            cy = (miny + maxy) * 0.5
+            cz = (minz + maxz) * 0.5
+            ex = (maxx - minx) * 0.5
+            ey = (maxy - miny) * 0.5
+            ez = (maxz - minz) * 0.5
+            x = m11 * cx + m12 * cy + m13 * cz + m14
+            y = m21 * cx + m22 * cy + m23 * cz + m24
+            z = m31 * cx + m32 * cy + m33 * cz + m34
+            rx = a11 * ex + a12 * ey + a13 * ez
+            ry = a21 * ex + a22 * ey + a23 * ez
+            rz = a31 * ex + a32 * ey + a33 * ez
+        result = numpy.stack((x - rx, y - ry, z - rz, x + rx, y + ry, z + rz), axis=1)
+        # an empty box stays empty
+        empty = (minx > maxx) | (miny > maxy) | (minz > maxz)
+        result[empty] = v[empty]
+        return _result(result)
+
+    def overlapBoxes(self, box, data):
+        if len(data) < 6 * self.threshold:
+            return PythonBackend.overlapBoxes(self, box, data)
+        x0, y0, z0, x1, y1, z1 = _view(data, 6).T
+        minx, miny, minz, maxx, maxy, maxz = box
+        if not (minx <= maxx and miny <= maxy and minz <= maxz):
+            return _mask(numpy.zeros(len(data) // 6, dtype=bool))
+        return _mask((x0 <= x1) & (y0 <= y1) & (z0 <= z1) &
+                     (minx <= x1) & (x0 <= maxx) & (miny <= y1) & (y0 <= maxy) & (minz <= z1) & (z0 <= maxz))
+
+    def cullSpheres(self, planes, centers, radii, n):
+        if n < self.threshold:
+            return PythonBackend.cullSpheres(self, planes, centers, radii, n)
+        x, y, z = _view(centers, 3).T
+        r = -_view(radii, 1)[:, 0]
+        outside = numpy.zeros(n, dtype=bool)
+        for k in range(0, 24, 4):
+            a, b, c, d = planes[k:k + 4]
+            outside |= a * x + b * y + c * z + d < r
+        return _mask(~outside)
+
+    def cullBoxes(self, planes, boxes):
+        n = len(boxes) // 6
+        if n < self.threshold:
+            return PythonBackend.cullBoxes(self, planes, boxes)
+        minx, miny, minz, maxx, maxy, maxz = _view(boxes, 6).T
+        outside = (minx > maxx) | (miny > maxy) | (minz > maxz)
+        with numpy.errstate(invalid='ignore'):
+            # empty boxes give nan here, they are already outside
+            cx = (minx + maxx) * 0.5
+            cy = (miny + maxy) * 0.5
+            cz = (minz + maxz) * 0.5
+            ex = (maxx - minx) * 0.5
+            ey = (maxy - miny) * 0.5
+            ez = (maxz - minz) * 0.5
+            for k in range(0, 24, 4):
+                a, b, c, d = planes[k:k + 4]
+                outside |= a * cx + b * cy + c * cz + d + (abs(a) * ex + abs(b) * ey + abs(c) * ez) < 0
+        return _mask(~outside)
+
+    def intersectTriangles(self, rays, triangles, n):
+        if n < self.threshold:
+            return PythonBackend.intersectTriangles(self, rays, triangles, n)
+        # a single ray or triangle broadcasts against the others
+        ox, oy, oz, dx, dy, dz = _view(rays, 6).T
+        ax, ay, az, bx, by, bz, cx, cy, cz = _view(triangles, 9).T
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            # parallel rays divide by zero here, they are masked below
+            e1x = bx - ax
+            e1y = by - ay
+            e1z = bz - az
+            e2x = cx - ax
+            e2y = cy - ay
+            e2z = cz - az
+            px = dy * e2z - dz * e2y
+            py = dz * e2x - dx * e2z
+            pz = dx * e2y - dy * e2x
+            det = e1x * px + e1y * py + e1z * pz
+            inv = 1.0 / det
+            sx = ox - ax
+            sy = oy - ay
+            sz = oz - az
+            u = (sx * px + sy * py + sz * pz) * inv
+            qx = sy * e1z - sz * e1y
+            qy = sz * e1x - sx * e1z
+            qz = sx * e1y - sy * e1x
+            v = (dx * qx + dy * qy + dz * qz) * inv
+            t = (e2x * qx + e2y * qy + e2z * qz) * inv
+            hit = (det != 0.0) & (0.0 <= u) & (u <= 1.0) & (v >= 0.0) & (u + v <= 1.0) & (t >= 0.0)
+        result = numpy.empty((n, 3))
+        result[:, 0] = numpy.where(hit, t, numpy.inf)
+        result[:, 1] = numpy.where(hit, u, 0.0)
+        result[:, 2] = numpy.where(hit, v, 0.0)
+        return _result(result)
+
+    def intersectBoxes(self, rays, boxes, n):
+        if n < self.threshold:
+            return PythonBackend.intersectBoxes(self, rays, boxes, n)
+        ox, oy, oz, dx, dy, dz = _view(rays, 6).T
+        minx, miny, minz, maxx, maxy, maxz = _view(boxes, 6).T
+        hit = numpy.ones(n, dtype=bool)
+        hit &= (minx <= maxx) & (miny <= maxy) & (minz <= maxz)
+        near = numpy.zeros(n)
+        far = numpy.full(n, numpy.inf)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            # the slabs of parallel rays are not used, the selections below
+            # follow the comparisons of PythonBackend, also for nan
+            for o, d, low, high in ((ox, dx, minx, maxx), (oy, dy, miny, maxy), (oz, dz, minz, maxz)):
+                parallel = d == 0.0
+                hit &= ~(parallel & ((o < low) | (o > high)))
+                inv = 1.0 / d
+                t0 = (low - o) * inv
+                t1 = (high - o) * inv
+                swap = t0 > t1
+                t0, t1 = numpy.where(swap, t1, t0), numpy.where(swap, t0, t1)
+                near = numpy.where(~parallel & (t0 > near), t0, near)
+                far = numpy.where(~parallel & (t1 < far), t1, far)
+        return _result(numpy.where(hit & (near <= far), near, numpy.inf))
+
+
+def _view(data, size):
+    # data as an (n, size) float64 array, sharing float64 buffers
+    try:
+        v = numpy.frombuffer(data, dtype=numpy.float64)
+    except (TypeError, ValueError):
+        v = numpy.asarray(data, dtype=numpy.float64)
+    return v.reshape(-1, size)
+
+def _result(values):
+    result = array('d')
+    result.frombytes(numpy.ascontiguousarray(values, dtype=numpy.float64).tobytes())
+    return result
+
+def _mask(values):
+    result = array('B')
+    result.frombytes(numpy.ascontiguousarray(values, dtype=numpy.uint8).tobytes())
+    return result
\ No newline at end of file
@@ -0,0 +1,206 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from . import Backend
+
+MODES = ('auto', 'process', 'thread')
+
+# argument roles: a positive role is the floats per element of an operand
+# that is split, 0 passes the argument unchanged and _COUNT is replaced by
+# the element count of the part
+_COUNT = -1
+
+class ParallelBackend(object):
+    '''Runs the kernels of an inner backend on parts of a batch in parallel.
+
+    Batches of at least threshold elements are cut into parts of chunkSize
+    elements, one part per worker by default, and the parts run on a pool
+    of workers. In 'process' mode the operands and the result live in one
+    multiprocessing.shared_memory block, so no buffer is pickled; 'thread'
+    mode runs the parts on threads, which only pays off when the inner
+    backend releases the GIL, as NumPy does. 'auto' picks threads for such a
+    backend and processes otherwise. Each element is computed by the inner
+    kernel, so results equal the inner backend's bit for bit.
+    '''
+    name = 'parallel'
+
+    def __init__(self, workers=None, chunkSize=None, mode='auto', inner=None, threshold=8192):
+        if mode not in MODES:
+            raise ValueError('unknown mode %r, expected one of %s' % (mode, ', '.join(MODES)))
+        if inner is None:
+            inner = 'numpy' if 'numpy' in Backend.available() else 'python'
+        self.inner = Backend.create(inner) if isinstance(inner, str) else inner
+        self.workers = workers or os.cpu_count() or 1
+        self.chunkSize = chunkSize
+        self.threshold = threshold
+        self.mode = _resolve(mode, self.inner)
+        self._pool = None
+        assert self.workers > 0 and (chunkSize is None or chunkSize > 0)
+
+    @property
+    def releasesGIL(self):
+        return self.inner.releasesGIL
+
+    def close(self):
+        '''Shuts the worker pool down, a later call starts a new one.'''
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def transform2(self, m, src, translate, homogeneous):
+        return self._run('transform2', len(src) // 2, 2, (m, src, translate, homogeneous), (0, 2, 0, 0))
+
+    def transform3(self, m, src, translate, homogeneous):
+        return self._run('transform3', len(src) // 3, 3, (m, src, translate, homogeneous), (0, 3, 0, 0))
+
+    def multiply4(self, a, b, n):
+        return self._run('multiply4', n, 16, (a, b, n), (16, 16, _COUNT))
+
+    def inverse4(self, data):
+        return self._run('inverse4', len(data) // 16, 16, (data,), (16,))
+
+    def normalize(self, data, size):
+        return self._run('normalize', len(data) // size, size, (data, size), (size, 0))
+
+    def multiplyQuaternions(self, a, b, n):
+        return self._run('multiplyQuaternions', n, 4, (a, b, n), (4, 4, _COUNT))
+
+    def normalizeQuaternions(self, data):
+        return self._run('normalizeQuaternions', len(data) // 4, 4, (data,), (4,))
+
+    def rotatePoints(self, quats, points, n):
+        return self._run('rotatePoints', n, 3, (quats, points, n), (4, 3, _COUNT))
+
+    def transformBoxes(self, m, data):
+        return self._run('transformBoxes', len(data) // 6, 6, (m, data), (0, 6))
+
+    def intersectTriangles(self, rays, triangles, n):
+        return self._run('intersectTriangles', n, 3, (rays, triangles, n), (6, 9, _COUNT))
+
+    def intersectBoxes(self, rays, boxes, n):
+        return self._run('intersectBoxes', n, 1, (rays, boxes, n), (6, 6, _COUNT))
+
+    # the tests below are cheap per element and give masks, they are not
+    # worth sending to the pool
+
+    def overlapBoxes(self, box, data):
+        return self.inner.overlapBoxes(box, data)
+
+    def cullSpheres(self, planes, centers, radii, n):
+        return self.inner.cullSpheres(planes, centers, radii, n)
+
+    def cullBoxes(self, planes, boxes):
+        return self.inner.cullBoxes(planes, boxes)
+
+    def _parts(self, n):
+        # (start, stop) element ranges of the parts of a batch of n elements
+        if n < self.threshold or self.workers == 1:
+            return [(0, n)]
+        size = self.chunkSize or -(-n // self.workers)
+        return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+    def _run(self, kernel, n, size, args, roles):
+        parts = self._parts(n)
+        if len(parts) == 1:
+            return getattr(self.inner, kernel)(*args)
+        # an operand holding a single element is repeated, not split
+        roles = tuple(0 if role > 0 and len(arg) == role else role for arg, role in zip(args, roles))
+        args = tuple(_buffer(arg) if role > 0 else arg for arg, role in zip(args, roles))
+        if self.mode == 'process':
+            return self._runProcesses(kernel, n, size, args, roles, parts)
+        return self._runThreads(kernel, n, size, args, roles, parts)
+
+    def _runThreads(self, kernel, n, size, args, roles, parts):
+        result = array('d', bytes(8 * size * n))
+        target = memoryview(result)
+        apply = getattr(self.inner, kernel)
+
+        def run(part):
+            start, stop = part
+            target[start * size:stop * size] = apply(*_slice(args, roles, start, stop))
+
+        try:
+            for _ in self._executor().map(run, parts):
+                pass
+        finally:
+            target.release()
+        return result
+
+    def _runProcesses(self, kernel, n, size, args, roles, parts):
+        from multiprocessing import shared_memory
+        # the split operands back to back, then the result, offsets in floats
+        offsets = []
+        offset = 0
+        for arg, role in zip(args, roles):
+            offsets.append(offset)
+            if role > 0:
+                offset += len(arg)
+        block = shared_memory.SharedMemory(create=True, size=8 * (offset + size * n) or 8)
+        try:
+            for arg, role, start in zip(args, roles, offsets):
+                if role > 0:
+                    block.buf[8 * start:8 * (start + len(arg))] = arg.cast('B')
+            shared = tuple(start if role > 0 else arg for arg, role, start in zip(args, roles, offsets))
+            pool = self._executor()
+            futures = [pool.submit(_work, self.inner, kernel, block.name, shared, roles,
+                                   offset, size, start, stop) for start, stop in parts]
+            for future in futures:
+                future.result()
+            result = array('d')
+            result.frombytes(block.buf[8 * offset:8 * (offset + size * n)])
+            return result
+        finally:
+            block.close()
+            block.unlink()
+
+    def _executor(self):
+        if self._pool is None:
+            if self.mode == 'process':
+                self._pool = ProcessPoolExecutor(self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='LitMath')
+        return self._pool
+
+
+def _resolve(mode, inner):
+    if mode != 'auto':
+        return mode
+    if inner.releasesGIL:
+        return 'thread'
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        return 'thread'
+    return 'process'
+
+def _buffer(data):
+    # data as a flat float64 memoryview, copying only what is not one
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return memoryview(array('d', data))
+    if view.format == 'd' and view.c_contiguous:
+        return view.cast('B').cast('d')
+    return memoryview(array('d', data))
+
+def _slice(args, roles, start, stop):
+    return [arg[start * role:stop * role] if role > 0 else stop - start if role == _COUNT else arg
+            for arg, role in zip(args, roles)]
+
+def _work(inner, kernel, name, args, roles, output, size, start, stop):
+    # runs in a pool process: offsets in args address the shared block
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name=name)
+    floats = block.buf.cast('d')
+    operands = [floats[arg:] if role > 0 else arg for arg, role in zip(args, roles)]
+    try:
+        values = getattr(inner, kernel)(*_slice(operands, roles, start, stop))
+        floats[output + start * size:output + stop * size] = values
+    finally:
+        operands = None
+        floats.release()
+        try:
+            block.close()
+        except BufferError:
+            # a raised error still references views of the block
+            pass
\ No newline at end of file
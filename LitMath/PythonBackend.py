@@ -0,0 +1,382 @@
+import math
+import operator
+from array import array
+from itertools import repeat
+
+_IDENTITY = (1.0, 0.0, 0.0, 0.0,
+             0.0, 1.0, 0.0, 0.0,
+             0.0, 0.0, 1.0, 0.0,
+             0.0, 0.0, 0.0, 1.0)
+
+_INF = float('inf')
+
+# t, u, v of a ray missing a triangle
+_MISS = (_INF, 0.0, 0.0)
+
+class PythonBackend(object):
+    '''The dependency-free reference kernels of the batch types.
+
+    Every kernel takes flat, interleaved float sequences (array('d'),
+    memoryview, list) and returns a new array('d'). Matrices are row-major
+    tuples or buffers. An operand holding a single element where a kernel
+    takes n is repeated n times. The arithmetic is the one of the scalar
+    types, so results agree with Vector3, Matrix4 and Quaternion bit for bit.
+    '''
+    name = 'python'
+    releasesGIL = False
+
+    def transform2(self, m, src, translate, homogeneous):
+        '''Transforms the interleaved x, y floats of src by the 3x3 matrix m.'''
+        xs = src[0::2]
+        ys = src[1::2]
+        m11, m12, m13, m21, m22, m23, m31, m32, m33 = m
+        if translate:
+            rx = [m11 * x + m12 * y + m13 for x, y in zip(xs, ys)]
+            ry = [m21 * x + m22 * y + m23 for x, y in zip(xs, ys)]
+        else:
+            rx = [m11 * x + m12 * y for x, y in zip(xs, ys)]
+            ry = [m21 * x + m22 * y for x, y in zip(xs, ys)]
+        if homogeneous:
+            ws = [(m31 * x + m32 * y + m33) or 1.0 for x, y in zip(xs, ys)]
+            rx = [v / w for v, w in zip(rx, ws)]
+            ry = [v / w for v, w in zip(ry, ws)]
+
+        data = array('d', bytes(8 * len(rx) * 2))
+        data[0::2] = array('d', rx)
+        data[1::2] = array('d', ry)
+        return data
+
+    def transform3(self, m, src, translate, homogeneous):
+        '''Transforms the interleaved x, y, z floats of src by the 4x4 matrix m.'''
+        xs = src[0::3]
+        ys = src[1::3]
+        zs = src[2::3]
+        (m11, m12, m13, m14, m21, m22, m23, m24,
+         m31, m32, m33, m34, m41, m42, m43, m44) = m
+        if translate:
+            rx = [m11 * x + m12 * y + m13 * z + m14 for x, y, z in zip(xs, ys, zs)]
+            ry = [m21 * x + m22 * y + m23 * z + m24 for x, y, z in zip(xs, ys, zs)]
+            rz = [m31 * x + m32 * y + m33 * z + m34 for x, y, z in zip(xs, ys, zs)]
+        else:
+            rx = [m11 * x + m12 * y + m13 * z for x, y, z in zip(xs, ys, zs)]
+            ry = [m21 * x + m22 * y + m23 * z for x, y, z in zip(xs, ys, zs)]
+            rz = [m31 * x + m32 * y + m33 * z for x, y, z in zip(xs, ys, zs)]
+        if homogeneous:
+            ws = [(m41 * x + m42 * y + m43 * z + m44) or 1.0 for x, y, z in zip(xs, ys, zs)]
+            rx = [v / w for v, w in zip(rx, ws)]
+            ry = [v / w for v, w in zip(ry, ws)]
+            rz = [v / w for v, w in zip(rz, ws)]
+
+        data = array('d', bytes(8 * len(rx) * 3))
+        data[0::3] = array('d', rx)
+        data[1::3] = array('d', ry)
+        data[2::3] = array('d', rz)
+        return data
+
+    def multiply4(self, a, b, n):
+        '''The n products of the 4x4 matrices of a and b.'''
+        data = array('d')
+        extend = data.extend
+        for (a11, a12, a13, a14, a21, a22, a23, a24,
+             a31, a32, a33, a34, a41, a42, a43, a44), \
+            (b11, b12, b13, b14, b21, b22, b23, b24,
+             b31, b32, b33, b34, b41, b42, b43, b44) in zip(_rows(a, 16, n), _rows(b, 16, n)):
+            extend((a11 * b11 + a12 * b21 + a13 * b31 + a14 * b41,
+                    a11 * b12 + a12 * b22 + a13 * b32 + a14 * b42,
+                    a11 * b13 + a12 * b23 + a13 * b33 + a14 * b43,
+                    a11 * b14 + a12 * b24 + a13 * b34 + a14 * b44,
+                    a21 * b11 + a22 * b21 + a23 * b31 + a24 * b41,
+                    a21 * b12 + a22 * b22 + a23 * b32 + a24 * b42,
+                    a21 * b13 + a22 * b23 + a23 * b33 + a24 * b43,
+                    a21 * b14 + a22 * b24 + a23 * b34 + a24 * b44,
+                    a31 * b11 + a32 * b21 + a33 * b31 + a34 * b41,
+                    a31 * b12 + a32 * b22 + a33 * b32 + a34 * b42,
+                    a31 * b13 + a32 * b23 + a33 * b33 + a34 * b43,
+                    a31 * b14 + a32 * b24 + a33 * b34 + a34 * b44,
+                    a41 * b11 + a42 * b21 + a43 * b31 + a44 * b41,
+                    a41 * b12 + a42 * b22 + a43 * b32 + a44 * b42,
+                    a41 * b13 + a42 * b23 + a43 * b33 + a44 * b43,
+                    a41 * b14 + a42 * b24 + a43 * b34 + a44 * b44))
+        return data
+
+    def inverse4(self, data):
+        '''The inverses of the 4x4 matrices of data, singular matrices give the identity.'''
+        result = array('d')
+        extend = result.extend
+        for m in _rows(data, 16, len(data) // 16):
+            extend(_inverse(*m))
+        return result
+
+    def normalize(self, data, size):
+        '''Normalizes the interleaved vectors of size 2 or 3, zero vectors are unchanged.'''
+        columns = [data[k::size] for k in range(size)]
+        if size == 2:
+            ms = [math.sqrt(x * x + y * y) or 1.0 for x, y in zip(*columns)]
+        else:
+            ms = [math.sqrt(x * x + y * y + z * z) or 1.0 for x, y, z in zip(*columns)]
+        result = array('d', bytes(8 * len(data)))
+        for k, column in enumerate(columns):
+            result[k::size] = array('d', map(operator.truediv, column, ms))
+        return result
+
+    def multiplyQuaternions(self, a, b, n):
+        '''The n Hamilton products of the x, y, z, w quaternions of a and b.'''
+        data = array('d')
+        extend = data.extend
+        for (x1, y1, z1, w1), (x2, y2, z2, w2) in zip(_rows(a, 4, n), _rows(b, 4, n)):
+            extend((w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                    w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                    w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+                    w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2))
+        return data
+
+    def normalizeQuaternions(self, data):
+        '''Normalizes the x, y, z, w quaternions of data, zero quaternions are unchanged.'''
+        sqrt = math.sqrt
+        result = array('d')
+        extend = result.extend
+        for x, y, z, w in _rows(data, 4, len(data) // 4):
+            m = sqrt(x ** 2 + y ** 2 + z ** 2 + w ** 2)
+            if m != 0:
+                extend((x / m, y / m, z / m, w / m))
+            else:
+                extend((x, y, z, w))
+        return result
+
+    def rotatePoints(self, quats, points, n):
+        '''Rotates the n points of points by the n quaternions of quats.'''
+        result = array('d')
+        extend = result.extend
+        for (x, y, z, w), (px, py, pz) in zip(_rows(quats, 4, n), _rows(points, 3, n)):
+            x2 = x * x
+            y2 = y * y
+            z2 = z * z
+            w2 = w * w
+            extend(((x2+w2-y2-z2)*px + 2.0*(x*y-z*w)*py + 2.0*(x*z+y*w)*pz,
+                    2.0*(x*y+z*w)*px + (w2-x2+y2-z2)*py + 2.0*(y*z-x*w)*pz,
+                    2.0*(x*z-y*w)*px + 2.0*(x*w+y*z)*py + (w2-x2-y2+z2)*pz))
+        return result
+
+    def transformBoxes(self, m, data):
+        '''Transforms the boxes of data, min x, y, z, max x, y, z each, by the affine part of m.'''
+        (m11, m12, m13, m14, m21, m22, m23, m24,
+         m31, m32, m33, m34, m41, m42, m43, m44) = m
+        a11 = abs(m11)
+        a12 = abs(m12)
+        a13 = abs(m13)
+        a21 = abs(m21)
+        a22 = abs(m22)
+        a23 = abs(m23)
+        a31 = abs(m31)
+        a32 = abs(m32)
+        a33 = abs(m33)
+        result = array('d')
+        extend = result.extend
+        for box in _rows(data, 6, len(data) // 6):
+            minx, miny, minz, maxx, maxy, maxz = box
+            if minx > maxx or miny > maxy or minz > maxz:
+                # an empty box stays empty
+                extend(box)
+                continue
+            cx = (minx + maxx) * 0.5
+            cy = (miny + maxy) * 0.5
+            cz = (minz + maxz) * 0.5
+            ex = (maxx - minx) * 0.5
+            ey = (maxy - miny) * 0.5
+            ez = (maxz - minz) * 0.5
+            x = m11 * cx + m12 * cy + m13 * cz + m14
+            y = m21 * cx + m22 * cy + m23 * cz + m24
+            z = m31 * cx + m32 * cy + m33 * cz + m34
+            rx = a11 * ex + a12 * ey + a13 * ez
+            ry = a21 * ex + a22 * ey + a23 * ez
+            rz = a31 * ex + a32 * ey + a33 * ez
+            extend((x - rx, y - ry, z - rz, x + rx, y + ry, z + rz))
+        return result
+
+    def overlapBoxes(self, box, data):
+        '''An array('B') of 1 for every box of data that overlaps or touches box, else 0.
+
+        Boxes empty on any axis overlap nothing.
+        '''
+        minx, miny, minz, maxx, maxy, maxz = box
+        n = len(data) // 6
+        if not (minx <= maxx and miny <= maxy and minz <= maxz):
+            return array('B', bytes(n))
+        return array('B', [x0 <= x1 and y0 <= y1 and z0 <= z1 and
+                           minx <= x1 and x0 <= maxx and miny <= y1 and y0 <= maxy and
+                           minz <= z1 and z0 <= maxz
+                           for x0, y0, z0, x1, y1, z1 in _rows(data, 6, n)])
+
+    def cullSpheres(self, planes, centers, radii, n):
+        '''An array('B') of 0 for every sphere entirely behind one of the planes, else 1.
+
+        planes holds six a, b, c, d planes, radii one radius per sphere or a
+        single one for all.
+        '''
+        planes = [tuple(planes[k:k + 4]) for k in range(0, 24, 4)]
+        visible = array('B', bytes(n))
+        for i, ((x, y, z), (r,)) in enumerate(zip(_rows(centers, 3, n), _rows(radii, 1, n))):
+            for a, b, c, d in planes:
+                if a * x + b * y + c * z + d < -r:
+                    break
+            else:
+                visible[i] = 1
+        return visible
+
+    def cullBoxes(self, planes, boxes):
+        '''An array('B') of 0 for every box that is empty or entirely behind one of the planes, else 1.'''
+        planes = [tuple(planes[k:k + 4]) + (abs(planes[k]), abs(planes[k + 1]), abs(planes[k + 2]))
+                  for k in range(0, 24, 4)]
+        n = len(boxes) // 6
+        visible = array('B', bytes(n))
+        for i, (minx, miny, minz, maxx, maxy, maxz) in enumerate(_rows(boxes, 6, n)):
+            if minx > maxx or miny > maxy or minz > maxz:
+                continue
+            cx = (minx + maxx) * 0.5
+            cy = (miny + maxy) * 0.5
+            cz = (minz + maxz) * 0.5
+            ex = (maxx - minx) * 0.5
+            ey = (maxy - miny) * 0.5
+            ez = (maxz - minz) * 0.5
+            for a, b, c, d, aa, ab, ac in planes:
+                if a * cx + b * cy + c * cz + d + (aa * ex + ab * ey + ac * ez) < 0:
+                    break
+            else:
+                visible[i] = 1
+        return visible
+
+    def intersectTriangles(self, rays, triangles, n):
+        '''t, u, v of every ray hitting its triangle, inf, 0, 0 on a miss.
+
+        rays holds origin x, y, z, direction x, y, z per ray, triangles the
+        corners a, b, c as x, y, z each. The test is Moller-Trumbore and hits
+        both sides; the hit is origin + t * direction with t >= 0 and
+        a * (1 - u - v) + b * u + c * v.
+        '''
+        result = array('d')
+        extend = result.extend
+        for (ox, oy, oz, dx, dy, dz), (ax, ay, az, bx, by, bz, cx, cy, cz) in \
+                zip(_rows(rays, 6, n), _rows(triangles, 9, n)):
+            e1x = bx - ax
+            e1y = by - ay
+            e1z = bz - az
+            e2x = cx - ax
+            e2y = cy - ay
+            e2z = cz - az
+            px = dy * e2z - dz * e2y
+            py = dz * e2x - dx * e2z
+            pz = dx * e2y - dy * e2x
+            det = e1x * px + e1y * py + e1z * pz
+            if det != 0.0:
+                inv = 1.0 / det
+                sx = ox - ax
+                sy = oy - ay
+                sz = oz - az
+                u = (sx * px + sy * py + sz * pz) * inv
+                if 0.0 <= u <= 1.0:
+                    qx = sy * e1z - sz * e1y
+                    qy = sz * e1x - sx * e1z
+                    qz = sx * e1y - sy * e1x
+                    v = (dx * qx + dy * qy + dz * qz) * inv
+                    if v >= 0.0 and u + v <= 1.0:
+                        t = (e2x * qx + e2y * qy + e2z * qz) * inv
+                        if t >= 0.0:
+                            extend((t, u, v))
+                            continue
+            extend(_MISS)
+        return result
+
+    def intersectBoxes(self, rays, boxes, n):
+        '''The t where every ray enters its box, 0 from inside, inf on a miss or an empty box.'''
+        result = array('d', bytes(8 * n))
+        for i, ((ox, oy, oz, dx, dy, dz), (minx, miny, minz, maxx, maxy, maxz)) in \
+                enumerate(zip(_rows(rays, 6, n), _rows(boxes, 6, n))):
+            hit = minx <= maxx and miny <= maxy and minz <= maxz
+            near = 0.0
+            far = _INF
+            for o, d, low, high in ((ox, dx, minx, maxx), (oy, dy, miny, maxy), (oz, dz, minz, maxz)):
+                if d == 0.0:
+                    # parallel to the slab
+                    if o < low or o > high:
+                        hit = False
+                    continue
+                inv = 1.0 / d
+                t0 = (low - o) * inv
+                t1 = (high - o) * inv
+                if t0 > t1:
+                    t0, t1 = t1, t0
+                if t0 > near:
+                    near = t0
+                if t1 < far:
+                    far = t1
+            result[i] = near if hit and near <= far else _INF
+        return result
+
+
+def _rows(d, size, n):
+    # the size-long elements packed in d, a single element is repeated n times
+    if len(d) == size and n != 1:
+        return repeat(tuple(d), n)
+    return zip(*[d[k::size] for k in range(size)])
+
+def _inverse(m11, m12, m13, m14, m21, m22, m23, m24,
+             m31, m32, m33, m34, m41, m42, m43, m44):
+    # same arithmetic as Matrix4.getInverse
+    if m41 == 0.0 and m42 == 0.0 and m43 == 0.0 and m44 == 1.0:
+        c11 = m22 * m33 - m23 * m32
+        c12 = m13 * m32 - m12 * m33
+        c13 = m12 * m23 - m13 * m22
+        d = m11 * c11 + m21 * c12 + m31 * c13
+
+        # determinant equals zero, means no inverse, return identity
+        if d == 0:
+            return _IDENTITY
+
+        i11 = c11 / d
+        i12 = c12 / d
+        i13 = c13 / d
+        i21 = (m23 * m31 - m21 * m33) / d
+        i22 = (m11 * m33 - m13 * m31) / d
+        i23 = (m13 * m21 - m11 * m23) / d
+        i31 = (m21 * m32 - m22 * m31) / d
+        i32 = (m12 * m31 - m11 * m32) / d
+        i33 = (m11 * m22 - m12 * m21) / d
+        return (i11, i12, i13, -(i11 * m14 + i12 * m24 + i13 * m34),
+                i21, i22, i23, -(i21 * m14 + i22 * m24 + i23 * m34),
+                i31, i32, i33, -(i31 * m14 + i32 * m24 + i33 * m34),
+                0.0, 0.0, 0.0, 1.0)
+
+    A0 = m11 * m22 - m12 * m21
+    A1 = m11 * m23 - m13 * m21
+    A2 = m11 * m24 - m14 * m21
+    A3 = m12 * m23 - m13 * m22
+    A4 = m12 * m24 - m14 * m22
+    A5 = m13 * m24 - m14 * m23
+    B0 = m31 * m42 - m32 * m41
+    B1 = m31 * m43 - m33 * m41
+    B2 = m31 * m44 - m34 * m41
+    B3 = m32 * m43 - m33 * m42
+    B4 = m32 * m44 - m34 * m42
+    B5 = m33 * m44 - m34 * m43
+    d = A0*B5 - A1*B4 + A2*B3 + A3*B2 - A4*B1 + A5*B0
+
+    # determinant equals zero, means no inverse, return identity
+    if d == 0:
+        return _IDENTITY
+
+    return (( m22*B5 - m23*B4 + m24*B3) / d,
+            (-m12*B5 + m13*B4 - m14*B3) / d,
+            ( m42*A5 - m43*A4 + m44*A3) / d,
+            (-m32*A5 + m33*A4 - m34*A3) / d,
+            (-m21*B5 + m23*B2 - m24*B1) / d,
+            ( m11*B5 - m13*B2 + m14*B1) / d,
+            (-m41*A5 + m43*A2 - m44*A1) / d,
+            ( m31*A5 - m33*A2 + m34*A1) / d,
+            ( m21*B4 - m22*B2 + m24*B0) / d,
+            (-m11*B4 + m12*B2 - m14*B0) / d,
+            ( m41*A4 - m42*A2 + m44*A0) / d,
+            (-m31*A4 + m32*A2 - m34*A0) / d,
+            (-m21*B3 + m22*B1 - m23*B0) / d,
+            ( m11*B3 - m12*B1 + m13*B0) / d,
+            (-m41*A3 + m42*A1 - m43*A0) / d,
+            ( m31*A3 - m32*A1 + m33*A0) / d)
\ No newline at end of file
@@ -1,5 +1,8 @@
 import math
+from array import array
 from . import Util
+from .Vector3 import Vector3
+from .Matrix4 import Matrix4, _quaternion
 
 class Quaternion(object):
     __slots__ = ['x', 'y', 'z', 'w']
@@ -19,8 +22,43 @@ class Quaternion(object):
         return self
         
     def copy(self):
-        import copy
-        return copy.copy(self)
+        # keeps the type of subclasses, like copy.copy did
+        cls = type(self)
+        q = cls.__new__(cls)
+        q.x = self.x
+        q.y = self.y
+        q.z = self.z
+        q.w = self.w
+        return q
+        
+    @staticmethod
+    def _new(x, y, z, w):
+        # trusted constructor for hot paths, the components must already be floats
+        q = Quaternion.__new__(Quaternion)
+        q.x = x
+        q.y = y
+        q.z = z
+        q.w = w
+        return q
+        
+    def toBuffer(self, out=None, offset=0):
+        '''Writes x, y, z, w into out at offset, a new array('d') when out is None.'''
+        if out is None:
+            return array('d', (self.x, self.y, self.z, self.w))
+        out[offset] = self.x
+        out[offset + 1] = self.y
+        out[offset + 2] = self.z
+        out[offset + 3] = self.w
+        return out
+        
+    @staticmethod
+    def fromBuffer(buf, offset=0):
+        '''Reads x, y, z, w from any float buffer or sequence at offset.'''
+        return Quaternion(buf[offset], buf[offset + 1], buf[offset + 2], buf[offset + 3])
+        
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+        return numpy.array((self.x, self.y, self.z, self.w), dtype=dtype)
     
     def __repr__(self):
         return 'Quaternion( %.2f, %.2f, %.2f, %.2f )' % \
@@ -54,13 +92,23 @@ class Quaternion(object):
             self.w /= len   
         return self
     
-    @property
-    def normalized(self):
+    def getNormalized(self, out=None):
+        '''Returns a normalized copy, written into out when it is given.'''
         len = self.magnitude
+        if out is None:
+            out = Quaternion.__new__(Quaternion)
         if len == 0:
-            return self.copy()
+            out.x = self.x
+            out.y = self.y
+            out.z = self.z
+            out.w = self.w
         else:
-            return Quaternion(self.x / len, self.y / len, self.z / len, self.w / len)
+            out.x = self.x / len
+            out.y = self.y / len
+            out.z = self.z / len
+            out.w = self.w / len
+        return out
+    normalized = property(getNormalized)
             
     def invert(self):
         self.x = -self.x
@@ -68,23 +116,39 @@ class Quaternion(object):
         self.z = -self.z
         return self
     
-    @property    
-    def inverse(self):
-        return Quaternion(-self.x, -self.y, -self.z, self.w)
+    def getInverse(self, out=None):
+        '''Returns the inverse, written into out when it is given.'''
+        if out is None:
+            return Quaternion._new(-self.x, -self.y, -self.z, self.w)
+        out.x = -self.x
+        out.y = -self.y
+        out.z = -self.z
+        out.w = self.w
+        return out
+    inverse = property(getInverse)
                
-    def __mul__(self, other):
-        '''Multiplies two quaternions.'''
-        assert isinstance(other, Quaternion)
-        return Quaternion(
-            self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y,
-            self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x,
-            self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w,
-            self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z)
+    def multiply(self, other, out=None):
+        '''Multiplies two quaternions, the result is written into out when it is given.'''
+        assert not Util.VALIDATE or isinstance(other, Quaternion)
+        x = self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y
+        y = self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x
+        z = self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w
+        w = self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z
+        if out is None:
+            return Quaternion._new(x, y, z, w)
+        out.x = x
+        out.y = y
+        out.z = z
+        out.w = w
+        return out
+    __mul__ = multiply
+    
+    def __imul__(self, other):
+        return self.multiply(other, self)
             
-    def multiplyPoint(self, pnt):
-        '''Rotates the point pnt by this quaternion.'''
-        from . import Vector3
-        assert isinstance(pnt, Vector3.Vector3)
+    def multiplyPoint(self, pnt, out=None):
+        '''Rotates the point pnt by this quaternion, into out when it is given.'''
+        assert not Util.VALIDATE or isinstance(pnt, Vector3)
         
         x = self.x
         y = self.y
@@ -99,7 +163,35 @@ class Quaternion(object):
         dy = 2.0*(x*y+z*w)*pnt.x + (w2-x2+y2-z2)*pnt.y + 2.0*(y*z-x*w)*pnt.z
         dz = 2.0*(x*z-y*w)*pnt.x + 2.0*(x*w+y*z)*pnt.y + (w2-x2-y2+z2)*pnt.z
         
-        return Vector3.Vector3(dx, dy, dz)
+        if out is None:
+            return Vector3._new(dx, dy, dz)
+        out.x = dx
+        out.y = dy
+        out.z = dz
+        return out
+        
+    def multiplyPoints(self, points, out=None):
+        '''Rotates many points by this quaternion.
+        
+        points may be anything Matrix4.multiplyPoints accepts and the result
+        has the same form. Each point gets exactly the result of
+        multiplyPoint.
+        '''
+        x = self.x
+        y = self.y
+        z = self.z
+        w = self.w
+        x2 = self.x * self.x
+        y2 = self.y * self.y
+        z2 = self.z * self.z
+        w2 = self.w * self.w
+        
+        # the coefficients of multiplyPoint, which is a linear map
+        M = Matrix4._new((x2+w2-y2-z2), 2.0*(x*y-z*w), 2.0*(x*z+y*w), 0.0,
+                         2.0*(x*y+z*w), (w2-x2+y2-z2), 2.0*(y*z-x*w), 0.0,
+                         2.0*(x*z-y*w), 2.0*(x*w+y*z), (w2-x2-y2+z2), 0.0,
+                         0.0, 0.0, 0.0, 1.0)
+        return M.multiplyVectors(points, out)
         
     def toMatrix4(self):
         '''Converts a rotation to 4x4 matrix.'''
@@ -109,8 +201,7 @@ class Quaternion(object):
         z = self.z
         w = self.w
         
-        from . import Matrix4
-        matrix = Matrix4.Matrix4()
+        matrix = Matrix4.__new__(Matrix4)
         matrix.m11 = 1.0-2.0*(y*y+z*z)
         matrix.m12 = 2.0*(x*y-z*w)
         matrix.m13 = 2.0*(x*z+y*w)
@@ -140,18 +231,17 @@ class Quaternion(object):
         
     def toAxisAngleInRadian(self):
         '''Converts a rotation to axis-angle representation(angle in radian).'''
-        from . import Vector3
         # reference:FreeCAD Rotation.cpp
         if self.w > -1.0 and self.w < 1.0:
             t = math.acos(self.w)
             scale = math.sin(t)
             if Util.isEqualZero(scale):
-                return Vector3.Vector3(0,0,1), 0.0
+                return Vector3(0,0,1), 0.0
             else:
-                axis = Vector3.Vector3(self.x / scale, self.y / scale, self.z / scale)
+                axis = Vector3(self.x / scale, self.y / scale, self.z / scale)
                 return axis, 2*t
         else:
-            return Vector3.Vector3(0,0,1), 0.0
+            return Vector3(0,0,1), 0.0
         
     def setIdentity(self):
         self.set(0.0, 0.0, 0.0, 1.0)
@@ -162,41 +252,55 @@ class Quaternion(object):
         '''Returns the identity quaternion.'''
         return Quaternion(0.0, 0.0, 0.0, 1.0)
         
+    @staticmethod
+    def dot(a, b):
+        '''The 4D dot product of two quaternions.'''
+        assert not Util.VALIDATE or isinstance(a, Quaternion) and isinstance(b, Quaternion)
+        return a.x * b.x + a.y * b.y + a.z * b.z + a.w * b.w
+        
+    @staticmethod
+    def nlerp(a, b, t):
+        '''Normalized linear interpolation from a to b along the shortest path.'''
+        assert not Util.VALIDATE or isinstance(a, Quaternion) and isinstance(b, Quaternion)
+        s = 1.0 - t
+        if Quaternion.dot(a, b) < 0:
+            t = -t
+        return Quaternion._new(a.x * s + b.x * t,
+                               a.y * s + b.y * t,
+                               a.z * s + b.z * t,
+                               a.w * s + b.w * t).normalize()
+        
+    @staticmethod
+    def slerp(a, b, t):
+        '''Spherical linear interpolation from a to b along the shortest path.'''
+        assert not Util.VALIDATE or isinstance(a, Quaternion) and isinstance(b, Quaternion)
+        dot = Quaternion.dot(a, b)
+        sign = 1.0
+        if dot < 0:
+            dot = -dot
+            sign = -1.0
+            
+        # nearly parallel, fall back to nlerp
+        if dot > 1.0 - Util.EPSILON:
+            return Quaternion.nlerp(a, b, t)
+            
+        theta = math.acos(dot)
+        sin = math.sin(theta)
+        s0 = math.sin((1.0 - t) * theta) / sin
+        s1 = sign * math.sin(t * theta) / sin
+        return Quaternion._new(a.x * s0 + b.x * s1,
+                               a.y * s0 + b.y * s1,
+                               a.z * s0 + b.z * s1,
+                               a.w * s0 + b.w * s1)
+        
     @staticmethod
     def matrix4(matrix):
-        from . import Matrix4
-        assert isinstance(matrix, Matrix4.Matrix4)
+        assert not Util.VALIDATE or isinstance(matrix, Matrix4)
 
-        quat = Quaternion()
         M = matrix
-        trace = M.m11 + M.m22 + M.m33
-
-        if trace > 0:
-            s = 0.5 / math.sqrt(trace + 1.0)
-            quat.w = 0.25 / s
-            quat.x = (M.m32 - M.m23 ) * s
-            quat.y = (M.m13 - M.m31 ) * s
-            quat.z = (M.m21 - M.m12 ) * s
-        elif M.m11 > M.m22 and M.m11 > M.m33:
-            s = 2.0 * math.sqrt(1.0 + M.m11 - M.m22 - M.m33)
-            quat.w = (M.m32 - M.m23) / s
-            quat.x = 0.25 * s
-            quat.y = (M.m12 + M.m21) / s
-            quat.z = (M.m13 + M.m31) / s
-        elif M.m22 > M.m33:
-            s = 2.0 * math.sqrt(1.0 + M.m22 - M.m11 - M.m33)
-            quat.w = (M.m13 - M.m31) / s
-            quat.x = (M.m12 + M.m21) / s
-            quat.y = 0.25 * s;
-            quat.z = (M.m23 + M.m32) / s
-        else:
-            s = 2.0 * math.sqrt(1.0 + M.m33 - M.m11 - M.m22)
-            quat.w = (M.m21 - M.m12) / s
-            quat.x = (M.m13 + M.m31) / s
-            quat.y = (M.m23 + M.m32) / s
-            quat.z = 0.25 * s
-            
-        return quat
+        return Quaternion._new(*_quaternion(M.m11, M.m12, M.m13,
+                                            M.m21, M.m22, M.m23,
+                                            M.m31, M.m32, M.m33))
         
     @staticmethod
     def axisAngle(axis, angle):
@@ -206,26 +310,21 @@ class Quaternion(object):
     @staticmethod
     def axisAngleInRadian(axis, angle):
         '''Creates a rotation which rotates angle degrees around axis.'''
-        from . import Vector3
-        assert isinstance(axis, Vector3.Vector3) and \
+        assert not Util.VALIDATE or isinstance(axis, Vector3) and \
                type(angle) in (int, int, float)
         
         axis = axis.normalized
         scale = math.sin(angle / 2)
         
-        quat = Quaternion()
-        quat.w = math.cos(angle / 2)
-        quat.x = axis.x * scale
-        quat.y = axis.y * scale
-        quat.z = axis.z * scale
-        
-        return quat
+        return Quaternion._new(axis.x * scale,
+                               axis.y * scale,
+                               axis.z * scale,
+                               math.cos(angle / 2))
         
     @staticmethod
     def fromToRotation(f, to):
         '''Creates a rotation which rotates from from(Vector) to to(Vector).'''
-        from .Vector3 import Vector3
-        assert isinstance(f, Vector3) and isinstance(to, Vector3)
+        assert not Util.VALIDATE or isinstance(f, Vector3) and isinstance(to, Vector3)
         
         # reference:FreeCAD Rotation.cpp
         u = f.normalized
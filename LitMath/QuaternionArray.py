@@ -0,0 +1,304 @@
+import math
+from array import array
+from itertools import repeat
+from . import Backend, Util
+from .Vector3 import Vector3
+from .Vector3Array import Vector3Array
+from .Quaternion import Quaternion
+from .Matrix4Stack import Matrix4Stack
+
+class QuaternionArray(object):
+    '''A packed sequence of quaternions.
+
+    Components are stored interleaved (x0, y0, z0, w0, x1, ...) in a single
+    contiguous array('d'). Every operation follows the conventions of
+    Quaternion and gives the same result element for element.
+    '''
+    __slots__ = ['data']
+    __hash__ = None
+
+    def __init__(self, data=()):
+        self.data = array('d', data)
+        assert len(self.data) % 4 == 0
+
+    def copy(self):
+        return QuaternionArray(self.data)
+
+    @property
+    def __array_interface__(self):
+        # lets numpy.asarray share the storage without copying
+        return Util.arrayInterface(self.data, (len(self), 4))
+
+    def __buffer__(self, flags):
+        return self.view()
+
+    def view(self):
+        '''A memoryview of shape (n, 4) sharing the storage, 1D when empty.'''
+        view = memoryview(self.data)
+        return view.cast('B').cast('d', (len(self), 4)) if len(view) else view
+
+    def __repr__(self):
+        return 'QuaternionArray(%d)' % len(self)
+
+    def __len__(self):
+        return len(self.data) // 4
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('QuaternionArray index out of range')
+        j = i * 4
+        d = self.data
+        return Quaternion._new(d[j], d[j + 1], d[j + 2], d[j + 3])
+
+    def __setitem__(self, i, q):
+        assert isinstance(q, Quaternion)
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('QuaternionArray index out of range')
+        j = i * 4
+        d = self.data
+        d[j] = q.x
+        d[j + 1] = q.y
+        d[j + 2] = q.z
+        d[j + 3] = q.w
+
+    def __iter__(self):
+        d = self.data
+        for j in range(0, len(d), 4):
+            yield Quaternion._new(d[j], d[j + 1], d[j + 2], d[j + 3])
+
+    def __eq__(self, other):
+        if isinstance(other, QuaternionArray):
+            return len(self.data) == len(other.data) and \
+                   all(Util.isEqual(a, b) for a, b in zip(self.data, other.data))
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def append(self, q):
+        assert isinstance(q, Quaternion)
+        if isinstance(self.data, memoryview):
+            raise TypeError('cannot append to a wrapped buffer, wrapped buffers have a fixed size; append to a copy()')
+        self.data.extend((q.x, q.y, q.z, q.w))
+        return self
+
+    def toQuaternions(self):
+        '''Returns the content as a list of Quaternion.'''
+        return list(self)
+
+    @property
+    def magnitude(self):
+        '''The magnitude of every quaternion, as an array('d').'''
+        sqrt = math.sqrt
+        d = self.data
+        return array('d', [sqrt(x ** 2 + y ** 2 + z ** 2 + w ** 2)
+                           for x, y, z, w in zip(d[0::4], d[1::4], d[2::4], d[3::4])])
+
+    def normalize(self):
+        '''Normalizes every quaternion in place, zero quaternions are left unchanged.'''
+        self.data[:] = Backend.current().normalizeQuaternions(self.data)
+        return self
+
+    @property
+    def normalized(self):
+        return self.copy().normalize()
+
+    def invert(self):
+        '''Inverts every quaternion in place.'''
+        d = self.data
+        for k in (0, 1, 2):
+            d[k::4] = array('d', [-v for v in d[k::4]])
+        return self
+
+    @property
+    def inverse(self):
+        return self.copy().invert()
+
+    def __mul__(self, other):
+        '''Multiplies pairwise, or every quaternion by a single Quaternion.'''
+        return QuaternionArray.multiply(self, other)
+
+    def multiplyPoints(self, points, out=None):
+        '''Rotates the i-th point by the i-th quaternion.
+
+        points may be a Vector3Array, a list of Vector3 or a flat x, y, z
+        buffer, a single Vector3 is rotated by every quaternion. The result
+        is a Vector3Array, written into out when it is given.
+        '''
+        n = len(self)
+        if isinstance(points, Vector3):
+            flat = (points.x, points.y, points.z)
+        else:
+            if isinstance(points, Vector3Array):
+                flat = points.data
+            elif len(points) and isinstance(points[0], Vector3):
+                flat = Vector3Array.fromVectors(points).data
+            else:
+                flat = Util.flatten(points, 3)
+            assert len(flat) == n * 3
+
+        result = Backend.current().rotatePoints(self.data, flat, n)
+        if out is None:
+            return Vector3Array._fromData(result)
+        assert len(out) == n
+        Util.copyInto(out.data, result)
+        return out
+
+    def toMatrix4(self):
+        '''Converts every rotation to a 4x4 matrix, as a Matrix4Stack.'''
+        d = self.data
+        result = array('d')
+        extend = result.extend
+        for x, y, z, w in zip(d[0::4], d[1::4], d[2::4], d[3::4]):
+            extend((1.0-2.0*(y*y+z*z), 2.0*(x*y-z*w), 2.0*(x*z+y*w), 0.0,
+                    2.0*(x*y+z*w), 1.0-2.0*(x*x+z*z), 2.0*(y*z-x*w), 0.0,
+                    2.0*(x*z-y*w), 2.0*(y*z+x*w), 1.0-2.0*(x*x+y*y), 0.0,
+                    0.0, 0.0, 0.0, 1.0))
+        return Matrix4Stack._fromData(result)
+
+    @staticmethod
+    def identity(n):
+        '''Returns n identity quaternions.'''
+        return QuaternionArray._fromData(array('d', (0.0, 0.0, 0.0, 1.0)) * n)
+
+    @staticmethod
+    def fromQuaternions(quats):
+        '''Packs a sequence of Quaternion.'''
+        data = array('d')
+        for q in quats:
+            data.extend((q.x, q.y, q.z, q.w))
+        return QuaternionArray._fromData(data)
+
+    @staticmethod
+    def fromBuffer(buf):
+        '''Wraps buf, interleaved x, y, z, w floats, without copying.
+
+        array('d'), memoryview and NumPy float64 buffers are shared, so
+        writes show through both ways; other inputs are copied. A wrapped
+        buffer has a fixed size.
+        '''
+        return QuaternionArray._fromData(Util.asBuffer(buf, 4))
+
+    @staticmethod
+    def _fromData(data):
+        # wraps data without copying
+        assert len(data) % 4 == 0
+        a = QuaternionArray.__new__(QuaternionArray)
+        a.data = data
+        return a
+
+    @staticmethod
+    def multiply(a, b):
+        '''Hamilton products of a and b, either may be a single Quaternion.'''
+        n = _size(a, b)
+        data = Backend.current().multiplyQuaternions(_operand(a), _operand(b), n)
+        return QuaternionArray._fromData(data)
+
+    @staticmethod
+    def dot(a, b):
+        '''4D dot products of a and b, either may be a single Quaternion.'''
+        return array('d', [x1 * x2 + y1 * y2 + z1 * z2 + w1 * w2
+                           for x1, y1, z1, w1, x2, y2, z2, w2 in zip(*_columns(a, b))])
+
+    @staticmethod
+    def nlerp(a, b, t):
+        '''Normalized linear interpolation, t is a number or one number per element.'''
+        data = array('d')
+        extend = data.extend
+        for x1, y1, z1, w1, x2, y2, z2, w2, t in _lerpColumns(a, b, t):
+            s = 1.0 - t
+            if x1 * x2 + y1 * y2 + z1 * z2 + w1 * w2 < 0:
+                t = -t
+            extend(_normalized(x1 * s + x2 * t,
+                               y1 * s + y2 * t,
+                               z1 * s + z2 * t,
+                               w1 * s + w2 * t))
+        return QuaternionArray._fromData(data)
+
+    @staticmethod
+    def slerp(a, b, t):
+        '''Spherical linear interpolation, t is a number or one number per element.'''
+        acos = math.acos
+        sin = math.sin
+        data = array('d')
+        extend = data.extend
+        for x1, y1, z1, w1, x2, y2, z2, w2, t in _lerpColumns(a, b, t):
+            dot = x1 * x2 + y1 * y2 + z1 * z2 + w1 * w2
+            sign = 1.0
+            if dot < 0:
+                dot = -dot
+                sign = -1.0
+
+            # nearly parallel, fall back to nlerp
+            if dot > 1.0 - Util.EPSILON:
+                s = 1.0 - t
+                t = sign * t
+                extend(_normalized(x1 * s + x2 * t,
+                                   y1 * s + y2 * t,
+                                   z1 * s + z2 * t,
+                                   w1 * s + w2 * t))
+                continue
+
+            theta = acos(dot)
+            sinTheta = sin(theta)
+            s0 = sin((1.0 - t) * theta) / sinTheta
+            s1 = sign * sin(t * theta) / sinTheta
+            extend((x1 * s0 + x2 * s1,
+                    y1 * s0 + y2 * s1,
+                    z1 * s0 + z2 * s1,
+                    w1 * s0 + w2 * s1))
+        return QuaternionArray._fromData(data)
+
+
+def _normalized(x, y, z, w):
+    # same arithmetic as Quaternion.normalize
+    m = math.sqrt(x ** 2 + y ** 2 + z ** 2 + w ** 2)
+    if m != 0:
+        return x / m, y / m, z / m, w / m
+    return x, y, z, w
+
+def _size(a, b):
+    # the batch size of a and b, either may be a single Quaternion
+    if isinstance(a, QuaternionArray):
+        n = len(a)
+        if isinstance(b, QuaternionArray):
+            assert len(b) == n
+    else:
+        assert isinstance(b, QuaternionArray)
+        n = len(b)
+    return n
+
+def _columns(a, b):
+    # component columns of a and b, a single Quaternion is repeated to the batch size
+    n = _size(a, b)
+    return _column4(a, n) + _column4(b, n)
+
+def _operand(q):
+    # the packed data of an array, or the components of a single Quaternion
+    if isinstance(q, QuaternionArray):
+        return q.data
+    assert isinstance(q, Quaternion)
+    return (q.x, q.y, q.z, q.w)
+
+def _column4(q, n):
+    if isinstance(q, QuaternionArray):
+        d = q.data
+        return d[0::4], d[1::4], d[2::4], d[3::4]
+    assert isinstance(q, Quaternion)
+    return repeat(q.x, n), repeat(q.y, n), repeat(q.z, n), repeat(q.w, n)
+
+def _lerpColumns(a, b, t):
+    columns = _columns(a, b)
+    if type(t) in (int, float):
+        t = repeat(float(t))
+    else:
+        assert len(t) == max(len(a) if isinstance(a, QuaternionArray) else 0,
+                             len(b) if isinstance(b, QuaternionArray) else 0)
+    return zip(*(columns + (t,)))
\ No newline at end of file
@@ -0,0 +1,237 @@
+from array import array
+from . import Backend, Util
+from .Vector3 import Vector3
+from .Matrix4 import Matrix4
+from .Vector3Array import Vector3Array
+from .AABB import AABB
+from .AABBArray import AABBArray
+
+_INF = float('inf')
+
+class Ray(object):
+    '''A half-line from origin along direction, the points origin + t * direction for t >= 0.
+
+    direction need not be unit length, hit distances t are in units of its
+    length. Triangles are hit from both sides (Moller-Trumbore) and report
+    the barycentrics u, v of the hit, which is a * (1 - u - v) + b * u + c * v.
+    Boxes are closed; a ray starting inside a box hits it at t = 0.
+    intersectTriangles and intersectBoxes test one ray against a whole
+    batch on Backend.current(), without a temporary Vector3 per triangle.
+    '''
+    __slots__ = ['origin', 'direction']
+    __hash__ = None
+
+    def __init__(self, origin, direction):
+        assert not Util.VALIDATE or isinstance(origin, Vector3) and isinstance(direction, Vector3)
+        self.origin = origin.copy()
+        self.direction = direction.copy()
+
+    def copy(self):
+        return Ray._new(self.origin.x, self.origin.y, self.origin.z,
+                        self.direction.x, self.direction.y, self.direction.z)
+
+    @staticmethod
+    def _new(ox, oy, oz, dx, dy, dz):
+        # trusted constructor for hot paths, the components must already be floats
+        r = Ray.__new__(Ray)
+        r.origin = Vector3._new(ox, oy, oz)
+        r.direction = Vector3._new(dx, dy, dz)
+        return r
+
+    def toBuffer(self, out=None, offset=0):
+        '''Writes origin x, y, z, direction x, y, z into out at offset, a new array('d') when out is None.'''
+        if out is None:
+            out = array('d', bytes(48))
+        o = self.origin
+        d = self.direction
+        out[offset] = o.x
+        out[offset + 1] = o.y
+        out[offset + 2] = o.z
+        out[offset + 3] = d.x
+        out[offset + 4] = d.y
+        out[offset + 5] = d.z
+        return out
+
+    @staticmethod
+    def fromBuffer(buf, offset=0):
+        '''Reads origin x, y, z, direction x, y, z from any float buffer or sequence at offset.'''
+        return Ray._new(*[float(v) for v in buf[offset:offset + 6]])
+
+    def __repr__(self):
+        return 'Ray(%r, %r)' % (self.origin, self.direction)
+
+    def __eq__(self, other):
+        if isinstance(other, Ray):
+            return self.origin == other.origin and self.direction == other.direction
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def pointAt(self, t):
+        '''The point origin + t * direction.'''
+        o = self.origin
+        d = self.direction
+        return Vector3._new(o.x + t * d.x, o.y + t * d.y, o.z + t * d.z)
+
+    def transform(self, m, out=None):
+        '''The ray with its origin transformed as a point and its direction as a vector by m.'''
+        assert not Util.VALIDATE or isinstance(m, Matrix4)
+        if out is None:
+            out = Ray.__new__(Ray)
+            out.origin = Vector3.__new__(Vector3)
+            out.direction = Vector3.__new__(Vector3)
+        m.multiplyPoint(self.origin, out.origin)
+        m.multiplyVector(self.direction, out.direction)
+        return out
+
+    def intersectTriangle(self, a, b, c):
+        '''(t, u, v) of the hit with the triangle a, b, c, None on a miss.'''
+        assert not Util.VALIDATE or isinstance(a, Vector3) and isinstance(b, Vector3) and isinstance(c, Vector3)
+        o = self.origin
+        d = self.direction
+        return _triangle(o.x, o.y, o.z, d.x, d.y, d.z, a.x, a.y, a.z, b.x, b.y, b.z, c.x, c.y, c.z)
+
+    def intersectAABB(self, box):
+        '''The t where the ray enters box, 0 from inside, None on a miss or an empty box.'''
+        assert not Util.VALIDATE or isinstance(box, AABB)
+        o = self.origin
+        d = self.direction
+        mn = box.min
+        mx = box.max
+        return _box(o.x, o.y, o.z, d.x, d.y, d.z, mn.x, mn.y, mn.z, mx.x, mx.y, mx.z)
+
+    def intersectTriangles(self, vertices, indices=None):
+        '''Tests the ray against many triangles, returns (mask, t, u, v).
+
+        vertices may be a Vector3Array, a list of Vector3, a flat buffer of
+        x, y, z floats or an Nx3 array. indices holds three vertex indices
+        per triangle; without it every three consecutive vertices form a
+        triangle. mask is an array('B') of 1 for every hit triangle, t, u and
+        v are array('d') with inf, 0 and 0 for the missed ones.
+        '''
+        triangles = _triangles(vertices, indices)
+        n = len(triangles) // 9
+        return _hits(Backend.current().intersectTriangles(self.toBuffer(), triangles, n))
+
+    def intersectBoxes(self, boxes):
+        '''Tests the ray against an AABBArray, returns (mask, t) with t = inf for the missed boxes.'''
+        assert isinstance(boxes, AABBArray)
+        t = Backend.current().intersectBoxes(self.toBuffer(), boxes.data, len(boxes))
+        return array('B', [v != _INF for v in t]), t
+
+    def pick(self, vertices, indices=None):
+        '''(index, t, u, v) of the nearest triangle hit, None on a miss, see intersectTriangles.'''
+        triangles = _triangles(vertices, indices)
+        result = Backend.current().intersectTriangles(self.toBuffer(), triangles, len(triangles) // 9)
+        t = result[0::3]
+        nearest = min(t, default=_INF)
+        if nearest == _INF:
+            return None
+        i = t.index(nearest)
+        return i, nearest, result[3 * i + 1], result[3 * i + 2]
+
+    @staticmethod
+    def fromPoints(origin, target):
+        '''The ray from origin through target.'''
+        assert not Util.VALIDATE or isinstance(origin, Vector3) and isinstance(target, Vector3)
+        return Ray._new(origin.x, origin.y, origin.z, target.x - origin.x, target.y - origin.y, target.z - origin.z)
+
+    @staticmethod
+    def fromScreen(x, y, m):
+        '''The picking ray through x, y in normalized device coordinates (-1..1, y up).
+
+        m is the projection * view matrix of the camera, the ray starts on
+        the near plane and its direction reaches the far plane.
+        '''
+        assert not Util.VALIDATE or isinstance(m, Matrix4)
+        i = m.getInverse()
+        near = _unproject(i, x, y, -1.0)
+        far = _unproject(i, x, y, 1.0)
+        return Ray._new(near[0], near[1], near[2], far[0] - near[0], far[1] - near[1], far[2] - near[2])
+
+
+def _unproject(m, x, y, z):
+    # the point m maps from clip space x, y, z, 1
+    w = m.m41 * x + m.m42 * y + m.m43 * z + m.m44
+    return ((m.m11 * x + m.m12 * y + m.m13 * z + m.m14) / w,
+            (m.m21 * x + m.m22 * y + m.m23 * z + m.m24) / w,
+            (m.m31 * x + m.m32 * y + m.m33 * z + m.m34) / w)
+
+def _triangles(vertices, indices):
+    # nine floats per triangle, gathered through indices when they are given
+    if isinstance(vertices, Vector3Array):
+        data = vertices.data
+    elif len(vertices) and isinstance(vertices[0], Vector3):
+        data = Vector3Array.fromVectors(vertices).data
+    else:
+        data = Util.asBuffer(vertices, 3)
+    if indices is None:
+        assert len(data) % 9 == 0
+        return data
+    assert len(indices) % 3 == 0
+    result = array('d')
+    extend = result.extend
+    for i in indices:
+        extend(data[3 * i:3 * i + 3])
+    return result
+
+def _hits(result):
+    # (mask, t, u, v) of the t, u, v triples of an intersectTriangles kernel
+    t = result[0::3]
+    return array('B', [v != _INF for v in t]), t, result[1::3], result[2::3]
+
+def _triangle(ox, oy, oz, dx, dy, dz, ax, ay, az, bx, by, bz, cx, cy, cz):
+    # (t, u, v) of the ray hitting triangle a, b, c, None on a miss
+    # (Moller-Trumbore), the arithmetic of the intersectTriangles kernels
+    e1x = bx - ax
+    e1y = by - ay
+    e1z = bz - az
+    e2x = cx - ax
+    e2y = cy - ay
+    e2z = cz - az
+    px = dy * e2z - dz * e2y
+    py = dz * e2x - dx * e2z
+    pz = dx * e2y - dy * e2x
+    det = e1x * px + e1y * py + e1z * pz
+    if det != 0.0:
+        inv = 1.0 / det
+        sx = ox - ax
+        sy = oy - ay
+        sz = oz - az
+        u = (sx * px + sy * py + sz * pz) * inv
+        if 0.0 <= u <= 1.0:
+            qx = sy * e1z - sz * e1y
+            qy = sz * e1x - sx * e1z
+            qz = sx * e1y - sy * e1x
+            v = (dx * qx + dy * qy + dz * qz) * inv
+            if v >= 0.0 and u + v <= 1.0:
+                t = (e2x * qx + e2y * qy + e2z * qz) * inv
+                if t >= 0.0:
+                    return t, u, v
+    return None
+
+def _box(ox, oy, oz, dx, dy, dz, minx, miny, minz, maxx, maxy, maxz):
+    # the entry t of the ray into the box, None on a miss (slab test), the
+    # arithmetic of the intersectBoxes kernels
+    if not (minx <= maxx and miny <= maxy and minz <= maxz):
+        return None
+    near = 0.0
+    far = _INF
+    for o, d, low, high in ((ox, dx, minx, maxx), (oy, dy, miny, maxy), (oz, dz, minz, maxz)):
+        if d == 0.0:
+            # parallel to the slab
+            if o < low or o > high:
+                return None
+            continue
+        inv = 1.0 / d
+        t0 = (low - o) * inv
+        t1 = (high - o) * inv
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > near:
+            near = t0
+        if t1 < far:
+            far = t1
+    return near if near <= far else None
\ No newline at end of file
@@ -0,0 +1,162 @@
+from array import array
+from itertools import repeat
+from . import Backend, Util
+from .Vector3 import Vector3
+from .Matrix4 import Matrix4
+from .AABB import AABB
+from .Ray import Ray, _hits
+
+_INF = float('inf')
+
+class RayArray(object):
+    '''A packed sequence of rays.
+
+    Every ray is stored as origin x, y, z, direction x, y, z in a single
+    contiguous array('d'). intersectTriangle and intersectAABB test all rays
+    against one triangle or box on Backend.current(), with the results of
+    Ray.intersectTriangle and Ray.intersectAABB.
+    '''
+    __slots__ = ['data']
+    __hash__ = None
+
+    def __init__(self, data=()):
+        self.data = array('d', data)
+        assert len(self.data) % 6 == 0
+
+    def copy(self):
+        return RayArray(self.data)
+
+    @property
+    def __array_interface__(self):
+        # lets numpy.asarray share the storage without copying
+        return Util.arrayInterface(self.data, (len(self), 6))
+
+    def __repr__(self):
+        return 'RayArray(%d)' % len(self)
+
+    def __len__(self):
+        return len(self.data) // 6
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('RayArray index out of range')
+        j = i * 6
+        d = self.data
+        return Ray._new(d[j], d[j + 1], d[j + 2], d[j + 3], d[j + 4], d[j + 5])
+
+    def __setitem__(self, i, ray):
+        assert isinstance(ray, Ray)
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('RayArray index out of range')
+        ray.toBuffer(self.data, i * 6)
+
+    def __iter__(self):
+        d = self.data
+        for j in range(0, len(d), 6):
+            yield Ray._new(d[j], d[j + 1], d[j + 2], d[j + 3], d[j + 4], d[j + 5])
+
+    def __eq__(self, other):
+        if isinstance(other, RayArray):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def append(self, ray):
+        assert isinstance(ray, Ray)
+        if isinstance(self.data, memoryview):
+            raise TypeError('cannot append to a wrapped buffer, wrapped buffers have a fixed size; append to a copy()')
+        o = ray.origin
+        d = ray.direction
+        self.data.extend((o.x, o.y, o.z, d.x, d.y, d.z))
+        return self
+
+    def toRays(self):
+        '''Returns the content as a list of Ray.'''
+        return list(self)
+
+    def intersectTriangle(self, a, b, c):
+        '''Tests every ray against the triangle a, b, c, returns (mask, t, u, v) like Ray.intersectTriangles.'''
+        assert not Util.VALIDATE or isinstance(a, Vector3) and isinstance(b, Vector3) and isinstance(c, Vector3)
+        triangle = array('d', (a.x, a.y, a.z, b.x, b.y, b.z, c.x, c.y, c.z))
+        return _hits(Backend.current().intersectTriangles(self.data, triangle, len(self)))
+
+    def intersectAABB(self, box):
+        '''Tests every ray against box, returns (mask, t) with t = inf for the rays that miss.'''
+        assert not Util.VALIDATE or isinstance(box, AABB)
+        t = Backend.current().intersectBoxes(self.data, box.toBuffer(), len(self))
+        return array('B', [v != _INF for v in t]), t
+
+    def transform(self, m):
+        '''Every ray transformed by m like Ray.transform, as a new RayArray.'''
+        assert not Util.VALIDATE or isinstance(m, Matrix4)
+        n = len(self)
+        d = self.data
+        if not isinstance(d, array):
+            # a wrapped buffer, strided slices of memoryviews cannot be assigned
+            d = array('d', d)
+        origins = array('d', bytes(24 * n))
+        directions = array('d', bytes(24 * n))
+        for k in range(3):
+            origins[k::3] = d[k::6]
+            directions[k::3] = d[3 + k::6]
+        backend = Backend.current()
+        m = m.toBuffer()
+        origins = backend.transform3(m, origins, True, False)
+        directions = backend.transform3(m, directions, False, False)
+        result = array('d', bytes(48 * n))
+        for k in range(3):
+            result[k::6] = origins[k::3]
+            result[3 + k::6] = directions[k::3]
+        return RayArray._fromData(result)
+
+    @staticmethod
+    def fromRays(rays):
+        '''Packs a sequence of Ray.'''
+        data = array('d')
+        for r in rays:
+            data.extend((r.origin.x, r.origin.y, r.origin.z, r.direction.x, r.direction.y, r.direction.z))
+        return RayArray._fromData(data)
+
+    @staticmethod
+    def fromBuffer(buf):
+        '''Wraps buf, origin x, y, z, direction x, y, z floats per ray, without copying.
+
+        array('d'), memoryview and NumPy float64 buffers are shared, other
+        inputs are copied. A wrapped buffer has a fixed size.
+        '''
+        return RayArray._fromData(Util.asBuffer(buf, 6))
+
+    @staticmethod
+    def fromOriginsDirections(origins, directions):
+        '''Rays from packed origins and directions, either may be a single Vector3.'''
+        assert not (isinstance(origins, Vector3) and isinstance(directions, Vector3))
+        data = array('d')
+        extend = data.extend
+        for ox, oy, oz, dx, dy, dz in zip(*(_columns(origins) + _columns(directions))):
+            extend((ox, oy, oz, dx, dy, dz))
+        return RayArray._fromData(data)
+
+    @staticmethod
+    def _fromData(data):
+        # wraps data without copying
+        assert len(data) % 6 == 0
+        a = RayArray.__new__(RayArray)
+        a.data = data
+        return a
+
+
+def _columns(v):
+    # the x, y and z columns of a Vector3Array, a single Vector3 repeats
+    if isinstance(v, Vector3):
+        return [repeat(v.x), repeat(v.y), repeat(v.z)]
+    d = v.data
+    return [d[0::3], d[1::3], d[2::3]]
\ No newline at end of file
@@ -0,0 +1,179 @@
+import math
+from array import array
+from itertools import product
+from . import Util
+from .Vector2 import Vector2
+from .Vector3 import Vector3
+from .FrozenVector2 import FrozenVector2
+from .FrozenVector3 import FrozenVector3
+from .Vector2Array import Vector2Array
+from .Vector3Array import Vector3Array
+
+class SpatialHash(object):
+    '''A uniform grid of 2D or 3D points for lookups within a tolerance.
+
+    Two points match when every component differs by less than tolerance,
+    Util.EPSILON by default, which is the test of Vector2 and Vector3 ==.
+    Cells are twice the tolerance wide, so a lookup visits at most two
+    cells per axis and takes O(1) unless many points crowd into them. Points
+    are numbered in the order they are added; non-finite points are stored
+    but never match, like with ==.
+    '''
+    __slots__ = ['size', 'tolerance', 'data', '_cells', '_scale']
+    __hash__ = None
+
+    def __init__(self, size=3, tolerance=None):
+        assert size in (2, 3)
+        self.size = size
+        self.tolerance = Util.EPSILON if tolerance is None else float(tolerance)
+        if not self.tolerance > 0.0:
+            raise ValueError('tolerance must be positive, not %r' % (tolerance,))
+        self.data = array('d')
+        self._cells = {}
+        self._scale = 0.5 / self.tolerance
+
+    def __repr__(self):
+        return 'SpatialHash(%d, %d, %r)' % (len(self), self.size, self.tolerance)
+
+    def __len__(self):
+        return len(self.data) // self.size
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('point index out of range')
+        j = i * self.size
+        if self.size == 2:
+            return Vector2._new(self.data[j], self.data[j + 1])
+        return Vector3._new(self.data[j], self.data[j + 1], self.data[j + 2])
+
+    def add(self, point):
+        '''Adds point, even when it matches a stored one, returns its index.'''
+        c = _components(point, self.size)
+        return self._add(c, self._cell(c))
+
+    def find(self, point):
+        '''The lowest index of a stored point matching point, None when there is none.'''
+        return self._find(_components(point, self.size))
+
+    def query(self, point):
+        '''The indices of all stored points matching point, in ascending order.'''
+        c = _components(point, self.size)
+        return sorted(j for cell in self._neighbours(c) for j in self._cells.get(cell, ())
+                      if self._matches(j, c))
+
+    def findOrAdd(self, point):
+        '''The index of find(point), adding point when nothing matches.'''
+        c = _components(point, self.size)
+        j = self._find(c)
+        return self._add(c, self._cell(c)) if j is None else j
+
+    @staticmethod
+    def weld(points, tolerance=None, size=None):
+        '''Merges points that match earlier ones, returns (unique, remap).
+
+        points is a Vector2Array, Vector3Array, a sequence of Vector2,
+        Vector3 or their frozen variants, or flat floats or tuples of the
+        given size. unique holds the first point of every group in input
+        order as a Vector2Array or Vector3Array and remap, an array('q'),
+        the index in unique of every point. A point joins the first unique
+        point it == matches, exactly like the pairwise loop over the unique
+        points, in expected O(n) instead of O(n^2).
+        '''
+        data, size = _flatten(points, size)
+        grid = SpatialHash(size, tolerance)
+        # exact repeats, the common case in meshes, skip the grid lookup
+        exact = {}
+        remap = array('q')
+        append = remap.append
+        for i in range(0, len(data), size):
+            c = tuple(data[i:i + size])
+            cell = grid._cell(c)
+            if cell is None:
+                append(grid._add(c, None))
+                continue
+            j = exact.get(c)
+            if j is None:
+                j = grid._find(c)
+                if j is None:
+                    j = grid._add(c, cell)
+                exact[c] = j
+            append(j)
+        unique = Vector2Array._fromData(grid.data) if size == 2 else Vector3Array._fromData(grid.data)
+        return unique, remap
+
+    def _cell(self, c):
+        # the cell key of components c, None for a non-finite point
+        s = self._scale
+        try:
+            return tuple([math.floor(v * s) for v in c])
+        except (ValueError, OverflowError):
+            return None
+
+    def _neighbours(self, c):
+        # every cell that can hold a point matching c; floor and the
+        # rounding of - and * are monotonic, so no match is missed
+        s = self._scale
+        t = self.tolerance
+        try:
+            return product(*[range(math.floor((v - t) * s), math.floor((v + t) * s) + 1) for v in c])
+        except (ValueError, OverflowError):
+            return ()
+
+    def _matches(self, j, c):
+        d = self.data
+        t = self.tolerance
+        if self.size == 2:
+            j *= 2
+            return abs(d[j] - c[0]) < t and abs(d[j + 1] - c[1]) < t
+        j *= 3
+        return abs(d[j] - c[0]) < t and abs(d[j + 1] - c[1]) < t and abs(d[j + 2] - c[2]) < t
+
+    def _find(self, c):
+        best = None
+        get = self._cells.get
+        for cell in self._neighbours(c):
+            bucket = get(cell)
+            if bucket is None:
+                continue
+            for j in bucket:
+                # buckets are in ascending order
+                if best is not None and j >= best:
+                    break
+                if self._matches(j, c):
+                    best = j
+                    break
+        return best
+
+    def _add(self, c, cell):
+        j = len(self)
+        self.data.extend(c)
+        if cell is not None:
+            self._cells.setdefault(cell, []).append(j)
+        return j
+
+
+def _components(point, size):
+    if size == 2 and isinstance(point, (Vector2, FrozenVector2)):
+        return (point.x, point.y)
+    if size == 3 and isinstance(point, (Vector3, FrozenVector3)):
+        return (point.x, point.y, point.z)
+    c = tuple([float(v) for v in point])
+    assert len(c) == size
+    return c
+
+def _flatten(points, size):
+    # (flat float data, size) of points
+    if isinstance(points, Vector2Array):
+        return points.data, 2
+    if isinstance(points, Vector3Array):
+        return points.data, 3
+    if not len(points):
+        return array('d'), size or 3
+    if isinstance(points[0], (Vector2, FrozenVector2)):
+        return array('d', [c for p in points for c in (p.x, p.y)]), 2
+    if isinstance(points[0], (Vector3, FrozenVector3)):
+        return array('d', [c for p in points for c in (p.x, p.y, p.z)]), 3
+    assert size in (2, 3), 'the size of flat points must be given'
+    return Util.flatten(points, size), size
\ No newline at end of file
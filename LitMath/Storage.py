@@ -0,0 +1,303 @@
+'''A compact binary file format for sequences of LitMath values.
+
+A file is a 32-byte header followed by the records, packed back to back
+as little-endian floats: x, y(, z) for vectors, x, y, z, w for
+quaternions and the row-major elements for matrices. The header holds
+
+    magic    4s  b'LMTH'
+    version  H   VERSION
+    type     B   the record type, see TYPES
+    dtype    c   b'f' (float32) or b'd' (float64)
+    flags    B   BATCH when written from a batch type
+    count    Q   the number of records, at offset 24
+
+save() and load() copy whole files and RecordWriter writes one piece by
+piece; openMapped() maps a file and decodes records only when they are
+accessed, so opening a large file costs next to nothing.
+'''
+import mmap
+import struct
+import sys
+from array import array
+from . import Util
+from .Vector2 import Vector2
+from .Vector3 import Vector3
+from .Matrix3 import Matrix3
+from .Matrix4 import Matrix4
+from .Quaternion import Quaternion
+from .Vector2Array import Vector2Array
+from .Vector3Array import Vector3Array
+from .Matrix4Stack import Matrix4Stack
+from .QuaternionArray import QuaternionArray
+
+MAGIC = b'LMTH'
+VERSION = 1
+BATCH = 1
+
+# record type: (value class, floats per record, batch class)
+TYPES = {
+    1: (Vector2, 2, Vector2Array),
+    2: (Vector3, 3, Vector3Array),
+    3: (Matrix3, 9, None),
+    4: (Matrix4, 16, Matrix4Stack),
+    5: (Quaternion, 4, QuaternionArray),
+}
+
+_HEADER = struct.Struct('<4sHBcB15xQ')
+
+class MappedRecords(object):
+    '''The records of a file mapped into memory, see openMapped.
+
+    Indexing decodes one record into a new value object, slicing copies
+    the selected records into a batch (or a list of Matrix3). batch()
+    wraps the whole mapping without copying where the layout allows it.
+    Views handed out by batch() must be released before close().
+    '''
+    __slots__ = ['type', 'dtype', 'isBatch', '_file', '_map', '_count', '_record']
+    __hash__ = None
+
+    def __init__(self, path, writable=False):
+        self._file = open(path, 'r+b' if writable else 'rb')
+        try:
+            header = self._file.read(_HEADER.size)
+            self.type, self.dtype, self.isBatch, self._count = _parseHeader(header)
+            self._record = struct.Struct('<%d%s' % (TYPES[self.type][1], self.dtype))
+            _checkLength(self._file, self._count * self._record.size)
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def __repr__(self):
+        return 'MappedRecords(%s, %d, %r)' % (TYPES[self.type][0].__name__, self._count, self.dtype)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._count)
+            if step == 1:
+                size = self._record.size
+                return _fromFlat(self.type, _decode(self._data()[start * size:max(start, stop) * size],
+                                                    self.dtype))
+            values = array('d')
+            for j in range(start, stop, step):
+                values.extend(self._unpack(j))
+            return _fromFlat(self.type, values)
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('record index out of range')
+        return TYPES[self.type][0]._new(*self._unpack(i))
+
+    def __setitem__(self, i, value):
+        assert isinstance(value, TYPES[self.type][0])
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('record index out of range')
+        self._record.pack_into(self._map, _HEADER.size + i * self._record.size, *value.toBuffer())
+
+    def __iter__(self):
+        new = TYPES[self.type][0]._new
+        for values in self._record.iter_unpack(self._data()):
+            yield new(*values)
+
+    def batch(self):
+        '''All records as the batch type of the record type.
+
+        float64 files on little-endian machines are wrapped without copying,
+        anything else is decoded into a new batch. Matrix3 records, which
+        have no batch type, give a list.
+        '''
+        cls = TYPES[self.type][2]
+        if cls is not None and self.dtype == 'd' and sys.byteorder == 'little':
+            return cls.fromBuffer(self._data().cast('d'))
+        return _fromFlat(self.type, _decode(self._data(), self.dtype))
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _data(self):
+        start = _HEADER.size
+        return memoryview(self._map)[start:start + self._count * self._record.size]
+
+    def _unpack(self, i):
+        return self._record.unpack_from(self._map, _HEADER.size + i * self._record.size)
+
+
+class RecordWriter(object):
+    '''Appends records to a new file piece by piece, see save for the format.
+
+    The record count in the header is written by close(), so the total
+    does not have to be known up front.
+    '''
+    __slots__ = ['type', 'dtype', 'count', '_file', '_batch']
+    __hash__ = None
+
+    def __init__(self, path, type, dtype='d', batch=True):
+        if dtype not in ('d', 'f'):
+            raise ValueError('dtype must be \'d\' or \'f\', not %r' % (dtype,))
+        assert type in TYPES
+        self.type = type
+        self.dtype = dtype
+        self.count = 0
+        self._batch = batch
+        self._file = open(path, 'wb')
+        self._file.write(_header(type, dtype, batch, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, values):
+        '''Appends a batch or a sequence of values of the writer's record type.'''
+        recordType, _, data = _flatten(values, self.type)
+        assert recordType == self.type
+        data = _encode(data, self.dtype)
+        self._file.write(data)
+        self.count += len(data) // TYPES[self.type][1]
+
+    def close(self):
+        if not self._file.closed:
+            self._file.seek(0)
+            self._file.write(_header(self.type, self.dtype, self._batch, self.count))
+            self._file.close()
+
+
+def save(file, values, dtype='d', type=None):
+    '''Writes values to file, a path or a binary file object.
+
+    values is a batch type (Vector2Array, Vector3Array, Matrix4Stack,
+    QuaternionArray) or a sequence of one LitMath value type; type, one of
+    the TYPES keys, is only needed for an empty sequence. dtype is 'd' to
+    store float64 or 'f' for float32, which halves the size.
+    '''
+    if dtype not in ('d', 'f'):
+        raise ValueError('dtype must be \'d\' or \'f\', not %r' % (dtype,))
+    recordType, isBatch, data = _flatten(values, type)
+    count = len(data) // TYPES[recordType][1]
+    data = _encode(data, dtype)
+    header = _header(recordType, dtype, isBatch, count)
+    if hasattr(file, 'write'):
+        file.write(header)
+        file.write(data)
+        return
+    with open(file, 'wb') as f:
+        f.write(header)
+        f.write(data)
+
+def load(file):
+    '''Reads a file written by save, from a path or a binary file object.
+
+    Returns the batch type the records were saved from, or a list of value
+    objects when they were saved as a sequence.
+    '''
+    if not hasattr(file, 'read'):
+        with open(file, 'rb') as f:
+            return load(f)
+    recordType, dtype, isBatch, count = _parseHeader(file.read(_HEADER.size))
+    cls, size, batch = TYPES[recordType]
+    data = array(dtype)
+    expected = count * size * data.itemsize
+    raw = file.read(expected)
+    # checked before frombytes, which rejects a partial item on its own
+    if len(raw) != expected:
+        raise ValueError('truncated file, expected %d records' % count)
+    data.frombytes(raw)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    if data.typecode != 'd':
+        data = array('d', data)
+    if isBatch and batch is not None:
+        return _fromFlat(recordType, data)
+    new = cls._new
+    return [new(*data[j:j + size]) for j in range(0, len(data), size)]
+
+def openMapped(path, writable=False):
+    '''Maps the file at path, returns a MappedRecords.
+
+    Only the header is read; records are decoded when accessed. writable
+    allows assigning records, which writes through to the file.
+    '''
+    return MappedRecords(path, writable)
+
+
+def _header(recordType, dtype, isBatch, count):
+    return _HEADER.pack(MAGIC, VERSION, recordType, dtype.encode(), BATCH if isBatch else 0, count)
+
+def _parseHeader(header):
+    # (type, dtype, isBatch, count) of a header, raises ValueError on a bad one
+    if len(header) != _HEADER.size:
+        raise ValueError('not a LitMath file, the header is truncated')
+    magic, version, recordType, dtype, flags, count = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError('not a LitMath file')
+    if version > VERSION:
+        raise ValueError('unsupported LitMath file version %d, expected at most %d' % (version, VERSION))
+    if recordType not in TYPES or dtype not in (b'd', b'f'):
+        raise ValueError('unknown record type %d or dtype %r' % (recordType, dtype))
+    return recordType, dtype.decode(), bool(flags & BATCH), count
+
+def _checkLength(f, length):
+    f.seek(0, 2)
+    if f.tell() < _HEADER.size + length:
+        raise ValueError('truncated file')
+    f.seek(_HEADER.size)
+
+def _flatten(values, recordType):
+    # (record type, is a batch, float64 data) of values
+    for key, (cls, size, batch) in TYPES.items():
+        if batch is not None and isinstance(values, batch):
+            return key, True, values.data
+    if len(values) == 0:
+        assert recordType in TYPES, 'the record type of an empty sequence must be given'
+        return recordType, False, array('d')
+    for key, (cls, size, batch) in TYPES.items():
+        if isinstance(values[0], cls):
+            break
+    else:
+        raise TypeError('cannot save %r' % type(values[0]).__name__)
+    data = array('d', bytes(8 * size * len(values)))
+    for j, v in enumerate(values):
+        assert not Util.VALIDATE or isinstance(v, cls)
+        v.toBuffer(data, j * size)
+    return key, False, data
+
+def _encode(data, dtype):
+    # float64 data as little-endian dtype values
+    if dtype == 'f' or sys.byteorder != 'little':
+        data = array(dtype, data)
+        if sys.byteorder != 'little':
+            data.byteswap()
+    return data
+
+def _decode(data, dtype):
+    # float64 values of little-endian data
+    values = array(dtype)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values if values.typecode == 'd' else array('d', values)
+
+def _fromFlat(recordType, data):
+    cls, size, batch = TYPES[recordType]
+    if batch is not None:
+        return batch._fromData(data)
+    return [cls._new(*data[j:j + size]) for j in range(0, len(data), size)]
\ No newline at end of file
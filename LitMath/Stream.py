@@ -0,0 +1,134 @@
+'''Chunked processing of point sets that do not fit in memory.
+
+read() turns a source into a generator of Vector3Array chunks of at most
+chunkSize points. The source may be a path to a Storage file of Vector3
+records, a MappedRecords, a Vector3Array, or any iterable of Vector3,
+(x, y, z) triples or Vector3Array chunks. transform() applies a Matrix4,
+a Quaternion or any callable taking and returning a Vector3Array to every
+chunk, and write() stores chunks in a Storage file, so
+
+    Stream.write('out.lm', Stream.transform('scan.lm', m, prefetch=True))
+
+transforms a file of any size holding only a few chunks in memory. With
+prefetch the next chunk is read on a background thread while the current
+one is transformed.
+'''
+import threading
+from array import array
+from queue import Empty, Full, Queue
+from . import Storage
+from .Vector3 import Vector3
+from .Vector3Array import Vector3Array
+from .Matrix4 import Matrix4
+from .Quaternion import Quaternion
+
+CHUNK_SIZE = 65536
+
+def read(source, chunkSize=CHUNK_SIZE, prefetch=False):
+    '''Yields the points of source as Vector3Array chunks of at most chunkSize points.'''
+    assert chunkSize > 0
+    chunks = _chunks(source, chunkSize)
+    return _prefetched(chunks) if prefetch else chunks
+
+def transform(source, transform, chunkSize=CHUNK_SIZE, prefetch=False):
+    '''Yields the chunks of read(source) transformed by transform.
+
+    A Matrix4 transforms like Matrix4.multiplyPoint, the affine part only
+    with the fourth row ignored, and a Quaternion like
+    Quaternion.multiplyPoint; both give exactly the values of the scalar
+    methods. Any other transform is called with each chunk, e.g. a
+    compiled TransformChain with its parameters bound.
+    '''
+    apply = _kernel(transform)
+    for chunk in read(source, chunkSize, prefetch):
+        yield apply(chunk)
+
+def write(path, chunks, dtype='d'):
+    '''Writes every chunk to a Storage file of Vector3 records, returns the point count.'''
+    with Storage.RecordWriter(path, 2, dtype) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.count
+
+
+def _kernel(transform):
+    if isinstance(transform, (Matrix4, Quaternion)):
+        return transform.multiplyPoints
+    assert callable(transform)
+    return transform
+
+def _chunks(source, chunkSize):
+    if isinstance(source, str):
+        with Storage.openMapped(source) as records:
+            for chunk in _chunks(records, chunkSize):
+                yield chunk
+        return
+    if isinstance(source, Storage.MappedRecords):
+        assert source.type == 2, 'a point file holds Vector3 records'
+        for start in range(0, len(source), chunkSize):
+            yield source[start:start + chunkSize]
+        return
+    if isinstance(source, Vector3Array):
+        d = source.data
+        for start in range(0, len(d), 3 * chunkSize):
+            yield Vector3Array._fromData(array('d', d[start:start + 3 * chunkSize]))
+        return
+
+    data = array('d')
+    limit = 3 * chunkSize
+    for item in source:
+        if isinstance(item, Vector3):
+            data.extend((item.x, item.y, item.z))
+        elif isinstance(item, Vector3Array):
+            data.extend(item.data)
+        else:
+            x, y, z = item
+            data.extend((x, y, z))
+        while len(data) >= limit:
+            yield Vector3Array._fromData(data[:limit])
+            del data[:limit]
+    if data:
+        yield Vector3Array._fromData(data)
+
+def _prefetched(chunks):
+    # runs chunks on a thread, at most one chunk waits in the queue
+    queue = Queue(maxsize=1)
+    stop = threading.Event()
+    done = object()
+
+    def produce():
+        try:
+            for chunk in chunks:
+                while not stop.is_set():
+                    try:
+                        queue.put((chunk, None), timeout=0.1)
+                        break
+                    except Full:
+                        pass
+                if stop.is_set():
+                    break
+            queue.put((done, None))
+        except BaseException as e:
+            queue.put((done, e))
+        finally:
+            chunks.close()
+
+    thread = threading.Thread(target=produce, name='LitMath.Stream prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk, error = queue.get()
+            if chunk is done:
+                if error is not None:
+                    raise error
+                return
+            yield chunk
+    finally:
+        stop.set()
+        # unblock a producer waiting on the full queue
+        while thread.is_alive():
+            try:
+                queue.get(timeout=0.1)
+            except Empty:
+                pass
+        thread.join()
\ No newline at end of file
@@ -0,0 +1,185 @@
+from array import array
+from .Vector3 import Vector3
+from .Quaternion import Quaternion
+from .Matrix4 import Matrix4
+from .Matrix4Stack import Matrix4Stack
+
+class Transform(object):
+    '''A node of a transform hierarchy.
+
+    Holds a local translation, rotation (Quaternion) and scale. The local
+    matrix is translate * rotation * scale and the world matrix is the
+    parent's world matrix times the local matrix. Both are computed lazily:
+    changing a node only marks its own subtree dirty, and world matrices are
+    recomputed when they are read.
+    '''
+    __slots__ = ['_position', '_rotation', '_scale', '_parent', '_children',
+                 '_local', '_world', '_localDirty', '_worldDirty']
+
+    def __init__(self, position=None, rotation=None, scale=None, parent=None):
+        self._position = position.copy() if position is not None else Vector3()
+        self._rotation = rotation.copy() if rotation is not None else Quaternion()
+        self._scale = scale.copy() if scale is not None else Vector3(1.0, 1.0, 1.0)
+        self._parent = None
+        self._children = []
+        self._local = Matrix4()
+        self._world = Matrix4()
+        self._localDirty = True
+        self._worldDirty = True
+        if parent is not None:
+            self.setParent(parent)
+
+    def __repr__(self):
+        return 'Transform(%r, %r, %r)' % (self._position, self._rotation, self._scale)
+
+    @property
+    def localPosition(self):
+        return self._position.copy()
+
+    @localPosition.setter
+    def localPosition(self, value):
+        assert isinstance(value, Vector3)
+        self._position = value.copy()
+        self._invalidateLocal()
+
+    @property
+    def localRotation(self):
+        return self._rotation.copy()
+
+    @localRotation.setter
+    def localRotation(self, value):
+        assert isinstance(value, Quaternion)
+        self._rotation = value.copy()
+        self._invalidateLocal()
+
+    @property
+    def localScale(self):
+        return self._scale.copy()
+
+    @localScale.setter
+    def localScale(self, value):
+        assert isinstance(value, Vector3)
+        self._scale = value.copy()
+        self._invalidateLocal()
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, value):
+        self.setParent(value)
+
+    @property
+    def children(self):
+        return tuple(self._children)
+
+    def setParent(self, parent):
+        '''Moves this node under parent, None makes it a root.'''
+        assert parent is None or isinstance(parent, Transform)
+        node = parent
+        while node is not None:
+            assert node is not self, 'a transform cannot be its own ancestor'
+            node = node._parent
+
+        if self._parent is not None:
+            self._parent._children.remove(self)
+        self._parent = parent
+        if parent is not None:
+            parent._children.append(self)
+        self._invalidateWorld()
+        return self
+
+    def getLocalMatrix(self, out=None):
+        '''The local matrix, written into out when it is given.'''
+        self._updateLocal()
+        return self._local.copy() if out is None else _copy(self._local, out)
+    localMatrix = property(getLocalMatrix)
+
+    def getWorldMatrix(self, out=None):
+        '''The world matrix, written into out when it is given.'''
+        self._updateWorld()
+        return self._world.copy() if out is None else _copy(self._world, out)
+    worldMatrix = property(getWorldMatrix)
+
+    def descendants(self):
+        '''This node and all nodes below it, depth-first, parents before children.'''
+        result = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            result.append(node)
+            stack.extend(reversed(node._children))
+        return result
+
+    def flatten(self):
+        '''Packs the world matrices of descendants() into a Matrix4Stack.'''
+        self._updateWorld()
+        data = array('d')
+        extend = data.extend
+        for node in self.descendants():
+            if node._worldDirty:
+                # the parent comes first in descendants() and is up to date
+                node._computeWorld()
+            w = node._world
+            extend((w.m11, w.m12, w.m13, w.m14,
+                    w.m21, w.m22, w.m23, w.m24,
+                    w.m31, w.m32, w.m33, w.m34,
+                    w.m41, w.m42, w.m43, w.m44))
+        return Matrix4Stack._fromData(data)
+
+    def _invalidateLocal(self):
+        self._localDirty = True
+        self._invalidateWorld()
+
+    def _invalidateWorld(self):
+        # a dirty node always has a dirty subtree, so the walk stops there
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if not node._worldDirty:
+                node._worldDirty = True
+                stack.extend(node._children)
+
+    def _updateLocal(self):
+        if self._localDirty:
+            Matrix4.fromTRS(self._position, self._rotation, self._scale, self._local)
+            self._localDirty = False
+
+    def _updateWorld(self):
+        # recomputes the dirty ancestors top-down, without recursion
+        chain = []
+        node = self
+        while node is not None and node._worldDirty:
+            chain.append(node)
+            node = node._parent
+        for node in reversed(chain):
+            node._computeWorld()
+
+    def _computeWorld(self):
+        self._updateLocal()
+        if self._parent is None:
+            _copy(self._local, self._world)
+        else:
+            self._parent._world.multiply(self._local, self._world)
+        self._worldDirty = False
+
+
+def _copy(m, out):
+    out.m11 = m.m11
+    out.m12 = m.m12
+    out.m13 = m.m13
+    out.m14 = m.m14
+    out.m21 = m.m21
+    out.m22 = m.m22
+    out.m23 = m.m23
+    out.m24 = m.m24
+    out.m31 = m.m31
+    out.m32 = m.m32
+    out.m33 = m.m33
+    out.m34 = m.m34
+    out.m41 = m.m41
+    out.m42 = m.m42
+    out.m43 = m.m43
+    out.m44 = m.m44
+    return out
\ No newline at end of file
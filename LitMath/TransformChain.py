@@ -0,0 +1,406 @@
+import builtins
+import keyword
+import math
+import re
+from array import array
+from . import Backend, Util
+from .Vector3 import Vector3
+from .Vector3Array import Vector3Array
+from .Quaternion import Quaternion
+from .Matrix4 import Matrix4
+from .FactoryCache import LRUCache
+
+class TransformChain(object):
+    '''A fixed sequence of Matrix4 factories, compiled to a specialized kernel.
+
+    Steps apply in call order, so TransformChain().scale(2, 2, 2).rotateZ('a')
+    .translate('tx', 0, 0) stands for translate * rotateZ * scale. Any number
+    may be replaced by a str, which names a free parameter of the compiled
+    functions. compile() generates Python source for the composed matrix,
+    multiplying out the constant parts at compile time and dropping every
+    term that is a known zero or one, and caches it by the chain's
+    signature. Results agree with the dense Matrix4 product within rounding.
+    '''
+    __slots__ = ['steps']
+    __hash__ = None
+
+    def __init__(self, steps=()):
+        self.steps = tuple(steps)
+
+    def __repr__(self):
+        return 'TransformChain(%r)' % (self.steps,)
+
+    def __eq__(self, other):
+        return isinstance(other, TransformChain) and self.steps == other.steps
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    @property
+    def parameters(self):
+        '''The names of the free parameters, in order of first use.'''
+        names = []
+        for _, args in self.steps:
+            for a in args:
+                if isinstance(a, str) and a not in names:
+                    names.append(a)
+        return names
+
+    def translate(self, tx, ty, tz):
+        return self._then('translate', tx, ty, tz)
+
+    def scale(self, sx, sy, sz):
+        return self._then('scale', sx, sy, sz)
+
+    def rotateX(self, x):
+        return self._then('rotateX', x)
+
+    def rotateXInRadian(self, x):
+        return self._then('rotateXInRadian', x)
+
+    def rotateY(self, y):
+        return self._then('rotateY', y)
+
+    def rotateYInRadian(self, y):
+        return self._then('rotateYInRadian', y)
+
+    def rotateZ(self, z):
+        return self._then('rotateZ', z)
+
+    def rotateZInRadian(self, z):
+        return self._then('rotateZInRadian', z)
+
+    def axisAngle(self, axis, angle):
+        '''Rotates around a fixed Vector3 axis, angle may be free.'''
+        return self._then('axisAngle', axis, angle)
+
+    def axisAngleInRadian(self, axis, angle):
+        return self._then('axisAngleInRadian', axis, angle)
+
+    def rotate(self, quaternion):
+        '''Rotates by a Quaternion, or by the free Quaternion parameter named quaternion.'''
+        return self._then('rotate', quaternion)
+
+    def matrix(self, m):
+        '''Applies a Matrix4, or the free Matrix4 parameter named m.'''
+        return self._then('matrix', m)
+
+    def compile(self, homogeneous=False):
+        '''Returns the generated function transform(points, <parameters>, out=None).
+
+        points may be a Vector3Array, a list of Vector3 or a flat x, y, z
+        buffer, and the result is of the same kind, like
+        Matrix4.multiplyPoints. homogeneous divides by the fourth row, where
+        it is nonzero, also like Matrix4.multiplyPoints.
+        '''
+        return self._kernels(homogeneous)[0]
+
+    def matrix4(self, *args, **kwargs):
+        '''The composed Matrix4 for the given parameter values.'''
+        return self._kernels(False)[1](*args, **kwargs)
+
+    def source(self, homogeneous=False):
+        '''The generated source, for inspection.'''
+        return self._kernels(homogeneous)[2]
+
+    @staticmethod
+    def clearCache():
+        '''Drops every compiled kernel.'''
+        _cache.clear()
+
+    @staticmethod
+    def cacheInfo():
+        '''Returns (hits, misses, size) of the kernel cache.'''
+        return _cache.hits, _cache.misses, len(_cache)
+
+    def _then(self, op, *args):
+        values = []
+        for a in args:
+            if isinstance(a, str):
+                if not a.isidentifier() or keyword.iskeyword(a) or a.startswith('_') or \
+                   a in ('points', 'out') or hasattr(builtins, a):
+                    raise ValueError('invalid parameter name %r' % a)
+            elif isinstance(a, Vector3):
+                a = ('Vector3', a.x, a.y, a.z)
+            elif isinstance(a, Quaternion):
+                a = ('Quaternion', a.x, a.y, a.z, a.w)
+            elif isinstance(a, Matrix4):
+                a = ('Matrix4',) + tuple(a.toBuffer())
+            else:
+                assert not Util.VALIDATE or type(a) in (int, float)
+                a = float(a)
+            values.append(a)
+        if op in ('axisAngle', 'axisAngleInRadian'):
+            assert isinstance(values[0], tuple), 'the axis must be a Vector3'
+        return TransformChain(self.steps + ((op, tuple(values)),))
+
+    def _kernels(self, homogeneous):
+        backend = Backend.current()
+        # the threshold is compiled into the NumPy kernel
+        key = (self.steps, bool(homogeneous), backend.name, getattr(backend, 'threshold', None))
+        kernels = _cache.get(key)
+        if kernels is None:
+            kernels = _compile(self, homogeneous, backend)
+            _cache.put(key, kernels)
+        return kernels
+
+
+_cache = LRUCache(128)
+
+_IDENTITY = ((1.0, 0.0, 0.0, 0.0),
+             (0.0, 1.0, 0.0, 0.0),
+             (0.0, 0.0, 1.0, 0.0),
+             (0.0, 0.0, 0.0, 1.0))
+
+class _Emitter(object):
+    # collects the statements that compute the matrix from the parameters
+    __slots__ = ['lines']
+
+    def __init__(self):
+        self.lines = []
+
+    def temp(self, expr):
+        name = '_t%d' % len(self.lines)
+        self.lines.append('%s = %s' % (name, expr))
+        return name
+
+    def atom(self, value):
+        # a float or a name, complex expressions go to a temporary
+        if isinstance(value, float) or value.isidentifier():
+            return value
+        return self.temp(value)
+
+def _code(value):
+    if isinstance(value, float):
+        return repr(value) if math.isfinite(value) else 'float(%r)' % repr(value)
+    return value
+
+def _product(a, b):
+    # a * b with known zeros and ones folded away
+    if isinstance(a, float) and isinstance(b, float):
+        return a * b
+    if a == 0.0 or b == 0.0:
+        return 0.0
+    if a == 1.0:
+        return b
+    if b == 1.0:
+        return a
+    if a == -1.0:
+        return '-' + b
+    if b == -1.0:
+        return '-' + a
+    return '%s * %s' % (_code(a), _code(b))
+
+def _sum(terms):
+    # the terms added left to right, constants folded into one
+    const = 0.0
+    exprs = []
+    for t in terms:
+        if isinstance(t, float):
+            const += t
+        else:
+            exprs.append(t)
+    if not exprs:
+        return const
+    if const != 0.0:
+        exprs.append(_code(const))
+    return ' + '.join(exprs)
+
+def _multiply(e, a, b):
+    # the symbolic product a * b of two 4x4 matrices
+    return tuple(tuple(e.atom(_sum([_product(a[i][k], b[k][j]) for k in range(4)]))
+                       for j in range(4))
+                 for i in range(4))
+
+def _rows(values):
+    return (values[0:4], values[4:8], values[8:12], values[12:16])
+
+def _angle(e, angle, inDegrees):
+    # (cos, sin, -sin) of a constant or free angle
+    if isinstance(angle, float):
+        if inDegrees:
+            angle = Util.degreeToRadian(angle)
+        sin = math.sin(angle)
+        return math.cos(angle), sin, -sin
+    if inDegrees:
+        angle = e.temp('%s * _pi / 180.0' % angle)
+    sin = e.temp('_sin(%s)' % angle)
+    return e.temp('_cos(%s)' % angle), sin, e.temp('-' + sin)
+
+def _step(e, op, args):
+    # the symbolic 4x4 matrix of one factory call
+    if op == 'translate':
+        tx, ty, tz = args
+        return ((1.0, 0.0, 0.0, tx),
+                (0.0, 1.0, 0.0, ty),
+                (0.0, 0.0, 1.0, tz),
+                (0.0, 0.0, 0.0, 1.0))
+    if op == 'scale':
+        sx, sy, sz = args
+        return ((sx, 0.0, 0.0, 0.0),
+                (0.0, sy, 0.0, 0.0),
+                (0.0, 0.0, sz, 0.0),
+                (0.0, 0.0, 0.0, 1.0))
+    if op.startswith('rotate') and op != 'rotate':
+        cos, sin, nsin = _angle(e, args[0], not op.endswith('InRadian'))
+        axis = op[6]
+        if axis == 'X':
+            return ((1.0, 0.0, 0.0, 0.0),
+                    (0.0, cos, nsin, 0.0),
+                    (0.0, sin, cos, 0.0),
+                    (0.0, 0.0, 0.0, 1.0))
+        if axis == 'Y':
+            return ((cos, 0.0, sin, 0.0),
+                    (0.0, 1.0, 0.0, 0.0),
+                    (nsin, 0.0, cos, 0.0),
+                    (0.0, 0.0, 0.0, 1.0))
+        return ((cos, nsin, 0.0, 0.0),
+                (sin, cos, 0.0, 0.0),
+                (0.0, 0.0, 1.0, 0.0),
+                (0.0, 0.0, 0.0, 1.0))
+    if op.startswith('axisAngle'):
+        axis, angle = args
+        axis = Vector3(*axis[1:])
+        if isinstance(angle, float):
+            if op == 'axisAngle':
+                return _rows(Matrix4.axisAngle(axis, angle).toBuffer())
+            return _rows(Matrix4.axisAngleInRadian(axis, angle).toBuffer())
+        # same arithmetic as Matrix4.axisAngleInRadian
+        n = axis.normalized
+        x, y, z = n.x, n.y, n.z
+        cos, sin, _ = _angle(e, angle, op == 'axisAngle')
+        lcos = e.temp('1.0 - %s' % cos)
+        def entry(c, s):
+            return e.atom(_sum([_product(c, lcos), _product(s, sin) if s is not None else cos]))
+        return ((entry(x * x, None), entry(x * y, -z), entry(x * z, y), 0.0),
+                (entry(y * x, z), entry(y * y, None), entry(y * z, -x), 0.0),
+                (entry(x * z, -y), entry(y * z, x), entry(z * z, None), 0.0),
+                (0.0, 0.0, 0.0, 1.0))
+    if op == 'rotate':
+        q = args[0]
+        if isinstance(q, tuple):
+            return _rows(Quaternion(*q[1:]).toMatrix4().toBuffer())
+        # same arithmetic as Quaternion.toMatrix4
+        x, y, z, w = [e.temp('%s.%s' % (q, c)) for c in 'xyzw']
+        t = e.temp
+        return ((t('1.0-2.0*(%s*%s+%s*%s)' % (y, y, z, z)), t('2.0*(%s*%s-%s*%s)' % (x, y, z, w)),
+                 t('2.0*(%s*%s+%s*%s)' % (x, z, y, w)), 0.0),
+                (t('2.0*(%s*%s+%s*%s)' % (x, y, z, w)), t('1.0-2.0*(%s*%s+%s*%s)' % (x, x, z, z)),
+                 t('2.0*(%s*%s-%s*%s)' % (y, z, x, w)), 0.0),
+                (t('2.0*(%s*%s-%s*%s)' % (x, z, y, w)), t('2.0*(%s*%s+%s*%s)' % (y, z, x, w)),
+                 t('1.0-2.0*(%s*%s+%s*%s)' % (x, x, y, y)), 0.0),
+                (0.0, 0.0, 0.0, 1.0))
+    assert op == 'matrix'
+    m = args[0]
+    if isinstance(m, tuple):
+        return _rows(m[1:])
+    return _rows([e.temp('%s.m%d%d' % (m, i, j)) for i in range(1, 5) for j in range(1, 5)])
+
+def _compile(chain, homogeneous, backend):
+    # returns (transform, matrix, source) generated for chain
+    e = _Emitter()
+    m = _IDENTITY
+    for op, args in chain.steps:
+        m = _multiply(e, _step(e, op, args), m)
+
+    # the per-point expressions in _x, _y, _z
+    point = ('_x', '_y', '_z', 1.0)
+    rows = [_code(_sum([_product(m[i][k], point[k]) for k in range(4)])) for i in range(4)]
+    divide = homogeneous and m[3] != _IDENTITY[3]
+    params = ''.join(p + ', ' for p in chain.parameters)
+    prelude = ['    ' + line for line in _used(e.lines, rows + [_code(v) for row in m for v in row])]
+
+    lines = ['def transform(points, %sout=None):' % params] + prelude
+    lines.append('    _flat = _flatten(points)')
+    python = ['_xs = _flat[0::3]',
+              '_ys = _flat[1::3]',
+              '_zs = _flat[2::3]']
+    for name, row in zip(('_rx', '_ry', '_rz'), rows):
+        python.append('%s = [%s for _x, _y, _z in zip(_xs, _ys, _zs)]' % (name, row))
+    if divide:
+        python.append('_ws = [(%s) or 1.0 for _x, _y, _z in zip(_xs, _ys, _zs)]' % rows[3])
+        for name in ('_rx', '_ry', '_rz'):
+            python.append('%s = [_v / _w for _v, _w in zip(%s, _ws)]' % (name, name))
+    python += ['_data = _array("d", bytes(24 * len(_rx)))',
+               '_data[0::3] = _array("d", _rx)',
+               '_data[1::3] = _array("d", _ry)',
+               '_data[2::3] = _array("d", _rz)']
+    namespace = {'_array': array, '_cos': math.cos, '_sin': math.sin, '_pi': math.pi,
+                 '_flatten': _flatten, '_finish': _finish, '_Matrix4': Matrix4}
+
+    if backend.name == 'numpy':
+        from .NumpyBackend import numpy, _view, _result
+        namespace.update(_empty=numpy.empty, _view=_view, _result=_result)
+        vectorized = ['_v = _view(_flat, 3)',
+                      '_x = _v[:, 0]',
+                      '_y = _v[:, 1]',
+                      '_z = _v[:, 2]',
+                      '_r = _empty(_v.shape)']
+        for k, row in enumerate(rows[:3]):
+            vectorized.append('_r[:, %d] = %s' % (k, row))
+        if divide:
+            vectorized += ['_w = _empty(len(_v))',
+                           '_w[:] = %s' % rows[3],
+                           '_w[_w == 0.0] = 1.0',
+                           '_r /= _w[:, None]']
+        vectorized.append('_data = _result(_r)')
+        lines.append('    if len(_flat) < %d:' % (3 * backend.threshold))
+        lines += ['        ' + line for line in python]
+        lines.append('    else:')
+        lines += ['        ' + line for line in vectorized]
+    else:
+        lines += ['    ' + line for line in python]
+    lines.append('    return _finish(points, out, _data)')
+
+    lines.append('')
+    lines.append('def matrix(%s):' % params.rstrip(', '))
+    lines += prelude
+    lines.append('    return _Matrix4._new(%s)' % ', '.join(_code(v) for row in m for v in row))
+
+    source = '\n'.join(lines) + '\n'
+    exec(compile(source, '<TransformChain>', 'exec'), namespace)
+    return namespace['transform'], namespace['matrix'], source
+
+def _used(lines, exprs):
+    # drops the temporaries nothing refers to, walking backwards
+    names = set(re.findall(r'_t\d+', ' '.join(exprs)))
+    kept = []
+    for line in reversed(lines):
+        name, expr = line.split(' = ', 1)
+        if name in names:
+            names.update(re.findall(r'_t\d+', expr))
+            kept.append(line)
+    kept.reverse()
+    return kept
+
+def _flatten(points):
+    if isinstance(points, Vector3Array):
+        return points.data
+    if len(points) and isinstance(points[0], Vector3):
+        return Vector3Array.fromVectors(points).data
+    return Util.flatten(points, 3)
+
+def _finish(points, out, data):
+    # returns data as the kind of points, written into out when it is given
+    if isinstance(out, Vector3Array):
+        # written through the buffer, iterating out only yields copies
+        assert len(out.data) == len(data)
+        Util.copyInto(out.data, data)
+        return out
+    if isinstance(points, Vector3Array):
+        if out is None:
+            return Vector3Array._fromData(data)
+        return Util.copyInto(out, data)
+    if len(points) and isinstance(points[0], Vector3):
+        if out is None:
+            out = [Vector3.__new__(Vector3) for _ in range(len(points))]
+        assert len(out) == len(points)
+        assert not Util.VALIDATE or all(isinstance(p, Vector3) for p in out)
+        for p, x, y, z in zip(out, data[0::3], data[1::3], data[2::3]):
+            p.x = x
+            p.y = y
+            p.z = z
+        return out
+    if out is None:
+        return data
+    return Util.copyInto(out, data)
\ No newline at end of file
@@ -1,6 +1,21 @@
 import math
+import numbers
+import sys
+from array import array
 EPSILON = 0.00001
 
+# argument type checks of the value types, see setValidation
+VALIDATE = True
+
+def setValidation(enabled):
+    '''Turns the argument type checks of Vector2, Vector3, Matrix3, Matrix4 and
+    Quaternion on or off for the whole process. Checks are asserts, so python -O
+    drops them regardless.
+    '''
+    global VALIDATE
+    VALIDATE = bool(enabled)
+    
+
 def isEqualZero(value):
     return abs(value) < EPSILON
     
@@ -14,4 +29,54 @@ def radianToDegree(x):
     return x * 180.0 / math.pi
     
 def clamp(value, minv, maxv):
-    return max(min(value, maxv), minv)
\ No newline at end of file
+    return max(min(value, maxv), minv)
+    
+def flatten(values, size):
+    '''Returns values as a flat, indexable sequence of floats.
+
+    values may be a flat sequence of floats, an object exporting a float
+    buffer (array('d'), memoryview, NumPy array) or a sequence of size-long
+    sequences. Contiguous float64 buffers are returned as a view without
+    copying, other buffers are copied.
+    '''
+    try:
+        view = memoryview(values)
+    except TypeError:
+        view = None
+    if view is not None:
+        if view.format == 'd' and view.c_contiguous:
+            return view if view.ndim == 1 else view.cast('B').cast('d')
+        # other element types and strided views are copied
+        values = view.tolist()
+        if view.ndim == 1:
+            return array('d', values)
+    if len(values) == 0 or isinstance(values[0], numbers.Real):
+        return values
+    return array('d', [c for value in values for c in value])
+    
+def asBuffer(values, size):
+    '''Like flatten, but always returns an array('d') or a float64 memoryview.'''
+    data = flatten(values, size)
+    if isinstance(data, (array, memoryview)):
+        return data
+    return array('d', data)
+    
+def arrayInterface(data, shape):
+    '''The NumPy __array_interface__ of shape sharing the float64 buffer data.'''
+    return {'version': 3,
+            'shape': shape,
+            'typestr': ('<' if sys.byteorder == 'little' else '>') + 'f8',
+            'data': data}
+    
+def copyInto(out, values):
+    '''Copies the flat float sequence values into the buffer or list out.'''
+    try:
+        view = memoryview(out)
+    except TypeError:
+        out[:] = values
+        return out
+    if view.ndim != 1:
+        view = view.cast('B').cast(view.format)
+    assert len(view) == len(values)
+    view[:] = values if view.format == 'd' else array(view.format, values)
+    return out
\ No newline at end of file
@@ -1,4 +1,5 @@
 import math
+from array import array
 from . import Util
 
 class Vector2(object):
@@ -15,8 +16,42 @@ class Vector2(object):
         return self
         
     def copy(self):
-        import copy
-        return copy.copy(self)
+        # keeps the type of subclasses, like copy.copy did
+        cls = type(self)
+        v = cls.__new__(cls)
+        v.x = self.x
+        v.y = self.y
+        return v
+        
+    def freeze(self):
+        '''An immutable, hashable FrozenVector2 copy.'''
+        from .FrozenVector2 import FrozenVector2
+        return FrozenVector2._new(self.x, self.y)
+        
+    @staticmethod
+    def _new(x, y):
+        # trusted constructor for hot paths, x and y must already be floats
+        v = Vector2.__new__(Vector2)
+        v.x = x
+        v.y = y
+        return v
+        
+    def toBuffer(self, out=None, offset=0):
+        '''Writes x, y into out at offset, a new array('d') when out is None.'''
+        if out is None:
+            return array('d', (self.x, self.y))
+        out[offset] = self.x
+        out[offset + 1] = self.y
+        return out
+        
+    @staticmethod
+    def fromBuffer(buf, offset=0):
+        '''Reads x, y from any float buffer or sequence at offset.'''
+        return Vector2(buf[offset], buf[offset + 1])
+        
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+        return numpy.array((self.x, self.y), dtype=dtype)
     
     def __repr__(self):
         return 'Vector2(%.2f, %.2f)' % (self.x, self.y)
@@ -32,26 +67,44 @@ class Vector2(object):
         return not self.__eq__(other)
 
     def __add__(self, other):
-        assert isinstance(other, Vector2)
-        return Vector2(self.x + other.x,
-                       self.y + other.y)
+        assert not Util.VALIDATE or isinstance(other, Vector2)
+        return Vector2._new(self.x + other.x,
+                            self.y + other.y)
     
     def __sub__(self, other):
-        assert isinstance(other, Vector2)
-        return Vector2(self.x - other.x,
-                       self.y - other.y)
+        assert not Util.VALIDATE or isinstance(other, Vector2)
+        return Vector2._new(self.x - other.x,
+                            self.y - other.y)
     
     def __mul__(self, other):
-        assert type(other) in (int, int, float)
-        return Vector2(self.x * other, self.y * other)
+        assert not Util.VALIDATE or type(other) in (int, int, float)
+        return Vector2._new(self.x * other, self.y * other)
     __rmul__ = __mul__
     
+    def __iadd__(self, other):
+        assert not Util.VALIDATE or isinstance(other, Vector2)
+        self.x += other.x
+        self.y += other.y
+        return self
+    
+    def __isub__(self, other):
+        assert not Util.VALIDATE or isinstance(other, Vector2)
+        self.x -= other.x
+        self.y -= other.y
+        return self
+    
+    def __imul__(self, other):
+        assert not Util.VALIDATE or type(other) in (int, int, float)
+        self.x *= other
+        self.y *= other
+        return self
+    
     def __div__(self, other):
-        assert type(other) in (int, int, float)
-        return Vector2(self.x / other, self.y / other)
+        assert not Util.VALIDATE or type(other) in (int, int, float)
+        return Vector2._new(self.x / other, self.y / other)
         
     def __neg__(self):
-        return Vector2(-self.x, -self.y)
+        return Vector2._new(-self.x, -self.y)
     
     @property
     def length(self):
@@ -68,17 +121,26 @@ class Vector2(object):
             self.y /= d
         return self
     
-    @property
-    def normalized(self):
+    def getNormalized(self, out=None):
+        '''Returns a normalized copy, written into out when it is given.'''
         d = self.length
         if d != 0:
-            return Vector2(self.x / d, self.y / d)
+            if out is None:
+                return Vector2._new(self.x / d, self.y / d)
+            out.x = self.x / d
+            out.y = self.y / d
+            return out
         else:
-            return self.copy()
+            if out is None:
+                return self.copy()
+            out.x = self.x
+            out.y = self.y
+            return out
+    normalized = property(getNormalized)
     
     @staticmethod
     def dot(a, b):
-        assert isinstance(a, Vector2) and isinstance(b, Vector2)
+        assert not Util.VALIDATE or isinstance(a, Vector2) and isinstance(b, Vector2)
         return a.x * b.x + a.y * b.y
     
     @staticmethod    
@@ -87,7 +149,7 @@ class Vector2(object):
     
     @staticmethod
     def angleInRadian(a, b):
-        assert isinstance(a, Vector2) and isinstance(b, Vector2)
+        assert not Util.VALIDATE or isinstance(a, Vector2) and isinstance(b, Vector2)
         m2 = a.length * b.length
         if m2 == 0:
             return 0.0
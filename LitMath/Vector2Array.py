@@ -0,0 +1,237 @@
+import math
+import operator
+from array import array
+from itertools import repeat
+from . import Backend, Util
+from .Vector2 import Vector2
+
+class Vector2Array(object):
+    '''A packed sequence of 2D vectors.
+
+    Components are stored interleaved (x0, y0, x1, y1, ...) in a single
+    contiguous array('d').
+    '''
+    __slots__ = ['data']
+    __hash__ = None
+
+    def __init__(self, data=()):
+        self.data = array('d', data)
+        assert len(self.data) % 2 == 0
+
+    def copy(self):
+        return Vector2Array(self.data)
+
+    @property
+    def __array_interface__(self):
+        # lets numpy.asarray share the storage without copying
+        return Util.arrayInterface(self.data, (len(self), 2))
+
+    def __buffer__(self, flags):
+        return self.view()
+
+    def view(self):
+        '''A memoryview of shape (n, 2) sharing the storage, 1D when empty.'''
+        view = memoryview(self.data)
+        return view.cast('B').cast('d', (len(self), 2)) if len(view) else view
+
+    def __repr__(self):
+        return 'Vector2Array(%d)' % len(self)
+
+    def __len__(self):
+        return len(self.data) // 2
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('Vector2Array index out of range')
+        j = i * 2
+        d = self.data
+        return Vector2._new(d[j], d[j + 1])
+
+    def __setitem__(self, i, v):
+        assert isinstance(v, Vector2)
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('Vector2Array index out of range')
+        j = i * 2
+        d = self.data
+        d[j] = v.x
+        d[j + 1] = v.y
+
+    def __iter__(self):
+        d = self.data
+        for j in range(0, len(d), 2):
+            yield Vector2._new(d[j], d[j + 1])
+
+    def __eq__(self, other):
+        if isinstance(other, Vector2Array):
+            return len(self.data) == len(other.data) and \
+                   all(Util.isEqual(a, b) for a, b in zip(self.data, other.data))
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def append(self, v):
+        assert isinstance(v, Vector2)
+        if isinstance(self.data, memoryview):
+            raise TypeError('cannot append to a wrapped buffer, wrapped buffers have a fixed size; append to a copy()')
+        self.data.extend((v.x, v.y))
+        return self
+
+    def toVectors(self):
+        '''Returns the content as a list of Vector2.'''
+        return list(self)
+
+    @property
+    def xs(self):
+        return self.data[0::2]
+
+    @property
+    def ys(self):
+        return self.data[1::2]
+
+    def __add__(self, other):
+        return Vector2Array._fromData(
+            array('d', map(operator.add, self.data, _broadcast(other, len(self)))))
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Vector2Array._fromData(
+            array('d', map(operator.sub, self.data, _broadcast(other, len(self)))))
+
+    def __rsub__(self, other):
+        return Vector2Array._fromData(
+            array('d', map(operator.sub, _broadcast(other, len(self)), self.data)))
+
+    def __mul__(self, other):
+        assert type(other) in (int, float)
+        return Vector2Array._fromData(
+            array('d', map(operator.mul, self.data, repeat(other))))
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        assert type(other) in (int, float)
+        return Vector2Array._fromData(
+            array('d', map(operator.truediv, self.data, repeat(other))))
+    __truediv__ = __div__
+
+    def __neg__(self):
+        return Vector2Array._fromData(array('d', map(operator.neg, self.data)))
+
+    @property
+    def length(self):
+        '''The length of every vector, as an array('d').'''
+        sqrt = math.sqrt
+        d = self.data
+        return array('d', [sqrt(x * x + y * y) for x, y in zip(d[0::2], d[1::2])])
+
+    @property
+    def lengthSquared(self):
+        '''The squared length of every vector, as an array('d').'''
+        d = self.data
+        return array('d', [x * x + y * y for x, y in zip(d[0::2], d[1::2])])
+
+    def normalize(self):
+        '''Normalizes every vector in place, zero vectors are left unchanged.'''
+        self.data[:] = Backend.current().normalize(self.data, 2)
+        return self
+
+    @property
+    def normalized(self):
+        return self.copy().normalize()
+
+    def weld(self, tolerance=None):
+        '''(unique, remap) of the vectors within tolerance of each other, see SpatialHash.weld.'''
+        from .SpatialHash import SpatialHash
+        return SpatialHash.weld(self, tolerance)
+
+    @staticmethod
+    def zeros(n):
+        '''Returns an array of n zero vectors.'''
+        return Vector2Array._fromData(array('d', bytes(16 * n)))
+
+    @staticmethod
+    def fromVectors(vectors):
+        '''Packs a sequence of Vector2.'''
+        data = array('d')
+        for v in vectors:
+            data.extend((v.x, v.y))
+        return Vector2Array._fromData(data)
+
+    @staticmethod
+    def fromBuffer(buf):
+        '''Wraps buf, interleaved x, y floats, without copying.
+
+        array('d'), memoryview and NumPy float64 buffers are shared, so
+        writes show through both ways; other inputs are copied. A wrapped
+        buffer has a fixed size.
+        '''
+        return Vector2Array._fromData(Util.asBuffer(buf, 2))
+
+    @staticmethod
+    def _fromData(data):
+        # wraps data without copying
+        assert len(data) % 2 == 0
+        a = Vector2Array.__new__(Vector2Array)
+        a.data = data
+        return a
+
+    @staticmethod
+    def dot(a, b):
+        '''Dot products of a and b, either may be a single Vector2.'''
+        return array('d', [x1 * x2 + y1 * y2
+                           for x1, y1, x2, y2 in zip(*_columns(a, b))])
+
+    @staticmethod
+    def angle(a, b):
+        '''Angles between a and b in degree.'''
+        return array('d', map(Util.radianToDegree, Vector2Array.angleInRadian(a, b)))
+
+    @staticmethod
+    def angleInRadian(a, b):
+        '''Angles between a and b in radian.'''
+        sqrt = math.sqrt
+        acos = math.acos
+        clamp = Util.clamp
+        result = array('d')
+        for x1, y1, x2, y2 in zip(*_columns(a, b)):
+            m2 = sqrt(x1 * x1 + y1 * y1) * sqrt(x2 * x2 + y2 * y2)
+            if m2 == 0:
+                result.append(0.0)
+            else:
+                v = (x1 * x2 + y1 * y2) / m2
+                result.append(acos(clamp(v, -1.0, 1.0)))
+        return result
+
+
+def _broadcast(other, n):
+    # interleaved components of other, a single Vector2 is repeated n times
+    if isinstance(other, Vector2Array):
+        assert len(other) == n
+        return other.data
+    assert isinstance(other, Vector2)
+    return array('d', (other.x, other.y)) * n
+
+def _columns(a, b):
+    # component columns of a and b, a single Vector2 is repeated to the batch size
+    if isinstance(a, Vector2Array):
+        n = len(a)
+        if isinstance(b, Vector2Array):
+            assert len(b) == n
+    else:
+        assert isinstance(b, Vector2Array)
+        n = len(b)
+    return _column2(a, n) + _column2(b, n)
+
+def _column2(v, n):
+    if isinstance(v, Vector2Array):
+        d = v.data
+        return d[0::2], d[1::2]
+    assert isinstance(v, Vector2)
+    return repeat(v.x, n), repeat(v.y, n)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import math
+from array import array
 from . import Util
 
 class Vector3(object):
@@ -17,8 +18,45 @@ class Vector3(object):
         return self
         
     def copy(self):
-        import copy
-        return copy.copy(self)
+        # keeps the type of subclasses, like copy.copy did
+        cls = type(self)
+        v = cls.__new__(cls)
+        v.x = self.x
+        v.y = self.y
+        v.z = self.z
+        return v
+        
+    def freeze(self):
+        '''An immutable, hashable FrozenVector3 copy.'''
+        from .FrozenVector3 import FrozenVector3
+        return FrozenVector3._new(self.x, self.y, self.z)
+        
+    @staticmethod
+    def _new(x, y, z):
+        # trusted constructor for hot paths, x, y and z must already be floats
+        v = Vector3.__new__(Vector3)
+        v.x = x
+        v.y = y
+        v.z = z
+        return v
+        
+    def toBuffer(self, out=None, offset=0):
+        '''Writes x, y, z into out at offset, a new array('d') when out is None.'''
+        if out is None:
+            return array('d', (self.x, self.y, self.z))
+        out[offset] = self.x
+        out[offset + 1] = self.y
+        out[offset + 2] = self.z
+        return out
+        
+    @staticmethod
+    def fromBuffer(buf, offset=0):
+        '''Reads x, y, z from any float buffer or sequence at offset.'''
+        return Vector3(buf[offset], buf[offset + 1], buf[offset + 2])
+        
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+        return numpy.array((self.x, self.y, self.z), dtype=dtype)
     
     def __repr__(self):
         return 'Vector3(%.2f, %.2f, %.2f)' % (self.x, self.y, self.z)
@@ -35,28 +73,49 @@ class Vector3(object):
         return not self.__eq__(other)
             
     def __add__(self, other):
-        assert isinstance(other, Vector3)
-        return Vector3(self.x + other.x,
-                       self.y + other.y,
-                       self.z + other.z)
+        assert not Util.VALIDATE or isinstance(other, Vector3)
+        return Vector3._new(self.x + other.x,
+                            self.y + other.y,
+                            self.z + other.z)
     
     def __sub__(self, other):
-        assert isinstance(other, Vector3)
-        return Vector3(self.x - other.x,
-                       self.y - other.y,
-                       self.z - other.z)
+        assert not Util.VALIDATE or isinstance(other, Vector3)
+        return Vector3._new(self.x - other.x,
+                            self.y - other.y,
+                            self.z - other.z)
                        
     def __mul__(self, other):
-        assert type(other) in (int, int, float)
-        return Vector3(self.x * other, self.y * other, self.z * other)
+        assert not Util.VALIDATE or type(other) in (int, int, float)
+        return Vector3._new(self.x * other, self.y * other, self.z * other)
     __rmul__ = __mul__
+    
+    def __iadd__(self, other):
+        assert not Util.VALIDATE or isinstance(other, Vector3)
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+    
+    def __isub__(self, other):
+        assert not Util.VALIDATE or isinstance(other, Vector3)
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+    
+    def __imul__(self, other):
+        assert not Util.VALIDATE or type(other) in (int, int, float)
+        self.x *= other
+        self.y *= other
+        self.z *= other
+        return self
             
     def __div__(self, other):
-        assert type(other) in (int, int, float)
-        return Vector3(self.x / other, self.y / other, self.z / other)
+        assert not Util.VALIDATE or type(other) in (int, int, float)
+        return Vector3._new(self.x / other, self.y / other, self.z / other)
             
     def __neg__(self):
-        return Vector3(-self.x, -self.y, -self.z)
+        return Vector3._new(-self.x, -self.y, -self.z)
     
     @property
     def length(self):
@@ -74,25 +133,42 @@ class Vector3(object):
             self.z /= m
         return self
     
-    @property
-    def normalized(self):
+    def getNormalized(self, out=None):
+        '''Returns a normalized copy, written into out when it is given.'''
         m = self.length
         if m != 0:
-            return Vector3(self.x / m, self.y / m, self.z / m)
+            if out is None:
+                return Vector3._new(self.x / m, self.y / m, self.z / m)
+            out.x = self.x / m
+            out.y = self.y / m
+            out.z = self.z / m
+            return out
         else:
-            return self.copy()
+            if out is None:
+                return self.copy()
+            out.x = self.x
+            out.y = self.y
+            out.z = self.z
+            return out
+    normalized = property(getNormalized)
     
     @staticmethod    
     def dot(a, b):
-        assert isinstance(a, Vector3) and isinstance(b, Vector3)
+        assert not Util.VALIDATE or isinstance(a, Vector3) and isinstance(b, Vector3)
         return a.x * b.x + a.y * b.y + a.z * b.z
     
     @staticmethod    
-    def cross(a, b):
-        assert isinstance(a, Vector3) and isinstance(b, Vector3)
-        return Vector3(a.y * b.z - a.z * b.y,
-                       a.z * b.x - a.x * b.z,
-                       a.x * b.y - a.y * b.x)
+    def cross(a, b, out=None):
+        assert not Util.VALIDATE or isinstance(a, Vector3) and isinstance(b, Vector3)
+        x = a.y * b.z - a.z * b.y
+        y = a.z * b.x - a.x * b.z
+        z = a.x * b.y - a.y * b.x
+        if out is None:
+            return Vector3._new(x, y, z)
+        out.x = x
+        out.y = y
+        out.z = z
+        return out
         
     @staticmethod
     def angle(a, b):
@@ -100,7 +176,7 @@ class Vector3(object):
     
     @staticmethod    
     def angleInRadian(a, b):
-        assert isinstance(a, Vector3) and isinstance(b, Vector3)
+        assert not Util.VALIDATE or isinstance(a, Vector3) and isinstance(b, Vector3)
         m2 = a.length * b.length
         if m2 == 0:
             return 0.0
@@ -0,0 +1,256 @@
+import math
+import operator
+from array import array
+from itertools import repeat
+from . import Backend, Util
+from .Vector3 import Vector3
+
+class Vector3Array(object):
+    '''A packed sequence of 3D vectors.
+
+    Components are stored interleaved (x0, y0, z0, x1, y1, z1, ...) in a
+    single contiguous array('d'), so a batch costs 24 bytes per vector
+    instead of one Python object per vector.
+    '''
+    __slots__ = ['data']
+    __hash__ = None
+
+    def __init__(self, data=()):
+        self.data = array('d', data)
+        assert len(self.data) % 3 == 0
+
+    def copy(self):
+        return Vector3Array(self.data)
+
+    @property
+    def __array_interface__(self):
+        # lets numpy.asarray share the storage without copying
+        return Util.arrayInterface(self.data, (len(self), 3))
+
+    def __buffer__(self, flags):
+        return self.view()
+
+    def view(self):
+        '''A memoryview of shape (n, 3) sharing the storage, 1D when empty.'''
+        view = memoryview(self.data)
+        return view.cast('B').cast('d', (len(self), 3)) if len(view) else view
+
+    def __repr__(self):
+        return 'Vector3Array(%d)' % len(self)
+
+    def __len__(self):
+        return len(self.data) // 3
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('Vector3Array index out of range')
+        j = i * 3
+        d = self.data
+        return Vector3._new(d[j], d[j + 1], d[j + 2])
+
+    def __setitem__(self, i, v):
+        assert isinstance(v, Vector3)
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('Vector3Array index out of range')
+        j = i * 3
+        d = self.data
+        d[j] = v.x
+        d[j + 1] = v.y
+        d[j + 2] = v.z
+
+    def __iter__(self):
+        d = self.data
+        for j in range(0, len(d), 3):
+            yield Vector3._new(d[j], d[j + 1], d[j + 2])
+
+    def __eq__(self, other):
+        if isinstance(other, Vector3Array):
+            return len(self.data) == len(other.data) and \
+                   all(Util.isEqual(a, b) for a, b in zip(self.data, other.data))
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def append(self, v):
+        assert isinstance(v, Vector3)
+        if isinstance(self.data, memoryview):
+            raise TypeError('cannot append to a wrapped buffer, wrapped buffers have a fixed size; append to a copy()')
+        self.data.extend((v.x, v.y, v.z))
+        return self
+
+    def toVectors(self):
+        '''Returns the content as a list of Vector3.'''
+        return list(self)
+
+    @property
+    def xs(self):
+        return self.data[0::3]
+
+    @property
+    def ys(self):
+        return self.data[1::3]
+
+    @property
+    def zs(self):
+        return self.data[2::3]
+
+    def __add__(self, other):
+        return Vector3Array._fromData(
+            array('d', map(operator.add, self.data, _broadcast(other, len(self)))))
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Vector3Array._fromData(
+            array('d', map(operator.sub, self.data, _broadcast(other, len(self)))))
+
+    def __rsub__(self, other):
+        return Vector3Array._fromData(
+            array('d', map(operator.sub, _broadcast(other, len(self)), self.data)))
+
+    def __mul__(self, other):
+        assert type(other) in (int, float)
+        return Vector3Array._fromData(
+            array('d', map(operator.mul, self.data, repeat(other))))
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        assert type(other) in (int, float)
+        return Vector3Array._fromData(
+            array('d', map(operator.truediv, self.data, repeat(other))))
+    __truediv__ = __div__
+
+    def __neg__(self):
+        return Vector3Array._fromData(array('d', map(operator.neg, self.data)))
+
+    @property
+    def length(self):
+        '''The length of every vector, as an array('d').'''
+        sqrt = math.sqrt
+        d = self.data
+        return array('d', [sqrt(x * x + y * y + z * z)
+                           for x, y, z in zip(d[0::3], d[1::3], d[2::3])])
+
+    @property
+    def lengthSquared(self):
+        '''The squared length of every vector, as an array('d').'''
+        d = self.data
+        return array('d', [x * x + y * y + z * z
+                           for x, y, z in zip(d[0::3], d[1::3], d[2::3])])
+
+    def normalize(self):
+        '''Normalizes every vector in place, zero vectors are left unchanged.'''
+        self.data[:] = Backend.current().normalize(self.data, 3)
+        return self
+
+    @property
+    def normalized(self):
+        return self.copy().normalize()
+
+    def weld(self, tolerance=None):
+        '''(unique, remap) of the vectors within tolerance of each other, see SpatialHash.weld.'''
+        from .SpatialHash import SpatialHash
+        return SpatialHash.weld(self, tolerance)
+
+    @staticmethod
+    def zeros(n):
+        '''Returns an array of n zero vectors.'''
+        return Vector3Array._fromData(array('d', bytes(24 * n)))
+
+    @staticmethod
+    def fromVectors(vectors):
+        '''Packs a sequence of Vector3.'''
+        data = array('d')
+        for v in vectors:
+            data.extend((v.x, v.y, v.z))
+        return Vector3Array._fromData(data)
+
+    @staticmethod
+    def fromBuffer(buf):
+        '''Wraps buf, interleaved x, y, z floats, without copying.
+
+        array('d'), memoryview and NumPy float64 buffers are shared, so
+        writes show through both ways; other inputs are copied. A wrapped
+        buffer has a fixed size.
+        '''
+        return Vector3Array._fromData(Util.asBuffer(buf, 3))
+
+    @staticmethod
+    def _fromData(data):
+        # wraps data without copying
+        assert len(data) % 3 == 0
+        a = Vector3Array.__new__(Vector3Array)
+        a.data = data
+        return a
+
+    @staticmethod
+    def dot(a, b):
+        '''Dot products of a and b, either may be a single Vector3.'''
+        return array('d', [x1 * x2 + y1 * y2 + z1 * z2
+                           for x1, y1, z1, x2, y2, z2 in zip(*_columns(a, b))])
+
+    @staticmethod
+    def cross(a, b):
+        '''Cross products of a and b, either may be a single Vector3.'''
+        data = array('d')
+        extend = data.extend
+        for x1, y1, z1, x2, y2, z2 in zip(*_columns(a, b)):
+            extend((y1 * z2 - z1 * y2,
+                    z1 * x2 - x1 * z2,
+                    x1 * y2 - y1 * x2))
+        return Vector3Array._fromData(data)
+
+    @staticmethod
+    def angle(a, b):
+        '''Angles between a and b in degree.'''
+        return array('d', map(Util.radianToDegree, Vector3Array.angleInRadian(a, b)))
+
+    @staticmethod
+    def angleInRadian(a, b):
+        '''Angles between a and b in radian.'''
+        sqrt = math.sqrt
+        acos = math.acos
+        clamp = Util.clamp
+        result = array('d')
+        for x1, y1, z1, x2, y2, z2 in zip(*_columns(a, b)):
+            m2 = sqrt(x1 * x1 + y1 * y1 + z1 * z1) * sqrt(x2 * x2 + y2 * y2 + z2 * z2)
+            if m2 == 0:
+                result.append(0.0)
+            else:
+                v = (x1 * x2 + y1 * y2 + z1 * z2) / m2
+                result.append(acos(clamp(v, -1.0, 1.0)))
+        return result
+
+
+def _broadcast(other, n):
+    # interleaved components of other, a single Vector3 is repeated n times
+    if isinstance(other, Vector3Array):
+        assert len(other) == n
+        return other.data
+    assert isinstance(other, Vector3)
+    return array('d', (other.x, other.y, other.z)) * n
+
+def _columns(a, b):
+    # component columns of a and b, a single Vector3 is repeated to the batch size
+    if isinstance(a, Vector3Array):
+        n = len(a)
+        if isinstance(b, Vector3Array):
+            assert len(b) == n
+    else:
+        assert isinstance(b, Vector3Array)
+        n = len(b)
+    return _column3(a, n) + _column3(b, n)
+
+def _column3(v, n):
+    if isinstance(v, Vector3Array):
+        d = v.data
+        return d[0::3], d[1::3], d[2::3]
+    assert isinstance(v, Vector3)
+    return repeat(v.x, n), repeat(v.y, n), repeat(v.z, n)
\ No newline at end of file
@@ -1,5 +1,46 @@
-from .Vector2 import Vector2
-from .Vector3 import Vector3
-from .Matrix3 import Matrix3
-from .Matrix4 import Matrix4
-from .Quaternion import Quaternion
\ No newline at end of file
+import os as _os
+import sys as _sys
+
+# every class lives in the submodule of the same name and is imported on
+# first access, so "import LitMath" loads nothing until a class is used
+_CLASSES = ('Vector2', 'Vector3', 'Matrix3', 'Matrix4', 'Quaternion',
+            'Matrix4Stack', 'CachedMatrix3', 'CachedMatrix4', 'Transform',
+            'Vector2Array', 'Vector3Array', 'QuaternionArray', 'TransformChain',
+            'FrozenVector2', 'FrozenVector3', 'SpatialHash', 'AABB', 'AABBArray',
+            'Frustum', 'BVH', 'Ray', 'RayArray')
+_MODULES = ('Util', 'FactoryCache', 'Instrument', 'Backend', 'Storage', 'Stream')
+
+__all__ = list(_CLASSES)
+
+def _load(name):
+    # __import__ rather than importlib, which costs an import of its own and
+    # is not seen by python -X importtime
+    __import__(__name__ + '.' + name)
+    return _sys.modules[__name__ + '.' + name]
+
+def __getattr__(name):
+    if name in _CLASSES:
+        value = getattr(_load(name), name)
+    elif name in _MODULES:
+        value = _load(name)
+    else:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_CLASSES) | set(_MODULES))
+
+class _Package(type(_sys)):
+    def __setattr__(self, name, value):
+        # importing LitMath.Vector3 binds the submodule on the package,
+        # which would shadow the class, bind the class instead
+        if name in _CLASSES and isinstance(value, type(_sys)):
+            value = getattr(value, name)
+        type(_sys).__setattr__(self, name, value)
+
+_sys.modules[__name__].__class__ = _Package
+
+if _os.environ.get('LITMATH_INSTRUMENT'):
+    from . import Instrument
+    Instrument.enable()
\ No newline at end of file
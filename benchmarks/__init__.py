@@ -0,0 +1,6 @@
+'''Benchmarks for LitMath.
+
+python -m benchmarks runs the whole suite and compares it against
+baseline.json, the bench_* modules are standalone comparisons run with
+python -m benchmarks.<name>.
+'''
\ No newline at end of file
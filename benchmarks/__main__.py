@@ -0,0 +1,80 @@
+'''Runs the benchmark suite.
+
+    python -m benchmarks [--output results.json] [--baseline benchmarks/baseline.json]
+                         [--threshold 0.25] [--filter Matrix4] [--scale 0.1]
+                         [--no-workloads] [--no-imports] [--update-baseline]
+
+Prints ops/sec and allocations per op for every case, writes them to
+--output as JSON and compares them against the baseline. Import
+statements are timed in a fresh interpreter with -X importtime and
+reported as imports per second. The exit status is 1 when any case
+regressed by more than the threshold.
+'''
+import argparse
+import os
+import sys
+
+from . import bench_import, harness, suite
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='LitMath benchmarks.')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown as a fraction of the baseline rate (default 0.25)')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this')
+    parser.add_argument('--scale', type=float, default=1.0, help='workload size factor (default 1.0)')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds per timed run (default 0.2)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case, the best counts (default 3)')
+    parser.add_argument('--no-workloads', action='store_true', help='skip the workloads')
+    parser.add_argument('--no-imports', action='store_true', help='skip the import time cases')
+    parser.add_argument('--update-baseline', action='store_true', help='write the results to the baseline')
+    args = parser.parse_args(argv)
+
+    cases = suite.operations()
+    if not args.no_workloads:
+        cases += suite.workloads(args.scale)
+    cases = [(name, fn) for name, fn in cases if args.filter in name]
+
+    results = {}
+    print('%-52s %14s %12s' % ('case', 'ops/sec', 'allocs/op'))
+    for name, fn in cases:
+        r = harness.measure(fn, args.min_time, args.repeat)
+        results[name] = r
+        print('%-52s %14.1f %12.2f' % (name, r['opsPerSec'], r['allocsPerOp']))
+        sys.stdout.flush()
+    if not args.no_imports:
+        statements = [s for s in bench_import.STATEMENTS if args.filter in s]
+        for name, r in sorted(bench_import.cases(statements).items()):
+            results[name] = r
+            print('%-52s %14.1f %12.2f' % (name, r['opsPerSec'], r['allocsPerOp']))
+
+    data = harness.report(results)
+    if args.output:
+        harness.save(args.output, data)
+    if args.update_baseline:
+        if os.path.exists(args.baseline):
+            # keep the entries of cases that were filtered out
+            merged = harness.load(args.baseline)
+            merged['results'].update(results)
+            results = merged['results']
+        harness.save(args.baseline, harness.report(results))
+        print('baseline written to %s' % args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('no baseline at %s' % args.baseline)
+        return 0
+    regressions = harness.compare(results, harness.load(args.baseline)['results'], args.threshold)
+    if not regressions:
+        print('no regressions against %s (threshold %.0f%%)' % (args.baseline, args.threshold * 100.0))
+        return 0
+    print('%d regression(s) against %s:' % (len(regressions), args.baseline))
+    for name, what, base, current in regressions:
+        print('  %-50s %s %.2f -> %.2f' % (name, what, base, current))
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,65 @@
+'''Memory allocated per operation, with and without out= reuse.
+
+Every result is kept alive until the measurement ends, so the traced
+memory growth divided by the number of calls is what one call allocates.
+'''
+import tracemalloc
+
+from LitMath import Matrix3, Matrix4, Quaternion, Vector2, Vector3
+
+def allocated(fn, number=10000):
+    '''Returns the bytes allocated per call of fn.'''
+    keep = [None] * number
+    fn()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(number):
+        keep[i] = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return float(after - before) / number
+
+def main():
+    a = Vector3(1.0, 2.0, 3.0)
+    b = Vector3(-2.0, 0.5, 4.0)
+    u = Vector2(1.0, 2.0)
+    v = Vector2(3.0, -1.0)
+    m = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.rotateY(30.0)
+    n = Matrix3.translate(1.0, 2.0) * Matrix3.rotate(30.0)
+    q = Quaternion.axisAngle(Vector3(0.0, 1.0, 0.0), 30.0)
+    r = Quaternion.axisAngle(Vector3(1.0, 0.0, 0.0), 10.0)
+    v3 = Vector3()
+    v2 = Vector2()
+    m4 = Matrix4()
+    m3 = Matrix3()
+    qo = Quaternion()
+
+    cases = [
+        ('Vector3 +', lambda: a + b, None),
+        ('Vector3 +=', None, lambda: v3.__iadd__(b)),
+        ('Vector3 *', lambda: a * 2.0, None),
+        ('Vector3 *=', None, lambda: v3.__imul__(1.0)),
+        ('Vector3.cross', lambda: Vector3.cross(a, b), lambda: Vector3.cross(a, b, v3)),
+        ('Vector3.normalized', lambda: a.normalized, lambda: a.getNormalized(v3)),
+        ('Vector2 +', lambda: u + v, lambda: v2.__iadd__(v)),
+        ('Vector2.normalized', lambda: u.normalized, lambda: u.getNormalized(v2)),
+        ('Matrix4 *', lambda: m * m, lambda: m.multiply(m, m4)),
+        ('Matrix4.inverse', lambda: m.inverse, lambda: m.getInverse(m4)),
+        ('Matrix4.transpose', lambda: m.transpose, lambda: m.getTranspose(m4)),
+        ('Matrix4.multiplyPoint', lambda: m.multiplyPoint(a), lambda: m.multiplyPoint(a, v3)),
+        ('Matrix4.multiplyVector', lambda: m.multiplyVector(a), lambda: m.multiplyVector(a, v3)),
+        ('Matrix3 *', lambda: n * n, lambda: n.multiply(n, m3)),
+        ('Matrix3.inverse', lambda: n.inverse, lambda: n.getInverse(m3)),
+        ('Matrix3.multiplyPoint', lambda: n.multiplyPoint(u), lambda: n.multiplyPoint(u, v2)),
+        ('Quaternion *', lambda: q * r, lambda: q.multiply(r, qo)),
+        ('Quaternion.normalized', lambda: q.normalized, lambda: q.getNormalized(qo)),
+        ('Quaternion.multiplyPoint', lambda: q.multiplyPoint(a), lambda: q.multiplyPoint(a, v3)),
+    ]
+    print('%-26s %14s %14s' % ('operation', 'new (B/op)', 'reuse (B/op)'))
+    for name, alloc, reuse in cases:
+        print('%-26s %14s %14s' % (name,
+                                   '%.1f' % allocated(alloc) if alloc else '-',
+                                   '%.1f' % allocated(reuse) if reuse else '-'))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+'''Memory overhead and read cost of CachedMatrix4 against Matrix4.'''
+import timeit
+import tracemalloc
+
+from LitMath import CachedMatrix4, Matrix4, Vector3
+
+def bytesPerInstance(factory, number=10000):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = [factory() for _ in range(number)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return float(after - before) / len(keep)
+
+def main(number=20000):
+    m = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.axisAngle(Vector3(1.0, 2.0, 3.0), 40.0)
+    elements = m.toBuffer()
+
+    def cachedAndRead():
+        c = CachedMatrix4(*elements)
+        c.inverse
+        c.normalMatrix
+        return c
+
+    print('memory per instance')
+    print('  %-36s %7.1f B' % ('Matrix4', bytesPerInstance(lambda: Matrix4(*elements))))
+    print('  %-36s %7.1f B' % ('CachedMatrix4, nothing cached', bytesPerInstance(lambda: CachedMatrix4(*elements))))
+    print('  %-36s %7.1f B' % ('CachedMatrix4, inverse + normalMatrix', bytesPerInstance(cachedAndRead)))
+
+    c = CachedMatrix4.fromMatrix(m)
+    print('read cost')
+    for name, plain, cached in [
+            ('determinant', lambda: m.determinant, lambda: c.determinant),
+            ('inverse', lambda: m.inverse, lambda: c.inverse),
+            ('normalMatrix', lambda: m.normalMatrix, lambda: c.normalMatrix)]:
+        t0 = min(timeit.repeat(plain, number=number, repeat=3)) / number
+        t1 = min(timeit.repeat(cached, number=number, repeat=3)) / number
+        print('  %-14s %6.2f us -> %6.2f us  %5.2fx' % (name, t0 * 1e6, t1 * 1e6, t0 / t1))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+'''Transform hierarchy: full build against updating one node.'''
+import random
+import timeit
+
+from LitMath import Quaternion, Transform, Vector3
+
+def buildTree(n, fanout=4):
+    random.seed(0)
+    nodes = [Transform()]
+    for i in range(1, n):
+        nodes.append(Transform(Vector3(random.random(), 1.0, 0.0),
+                               Quaternion.axisAngle(Vector3(0.0, 1.0, 0.0), random.random() * 90.0),
+                               Vector3(1.0, 1.0, 1.0),
+                               parent=nodes[(i - 1) // fanout]))
+    return nodes
+
+def main(n=10000):
+    nodes = buildTree(n)
+    root = nodes[0]
+    leaf = nodes[-1]
+    inner = nodes[1]
+
+    def moveLeaf():
+        leaf.localPosition = Vector3(random.random(), 0.0, 0.0)
+        leaf.worldMatrix
+
+    def moveInner():
+        inner.localPosition = Vector3(random.random(), 0.0, 0.0)
+        root.flatten()
+
+    print('%-30s %9.3f ms' % ('first flatten, %d nodes' % n,
+                              timeit.timeit(root.flatten, number=1) * 1000.0))
+    print('%-30s %9.3f ms' % ('flatten, nothing dirty',
+                              min(timeit.repeat(root.flatten, number=1, repeat=3)) * 1000.0))
+    print('%-30s %9.3f ms' % ('move leaf, read its world',
+                              min(timeit.repeat(moveLeaf, number=100, repeat=3)) * 10.0))
+    print('%-30s %9.3f ms' % ('move %d-node subtree, flatten' % len(inner.descendants()),
+                              min(timeit.repeat(moveInner, number=1, repeat=3)) * 1000.0))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+'''Import cost of LitMath, measured with python -X importtime.
+
+Every statement runs in a fresh interpreter. The time is the cumulative
+import time of the LitMath modules, the median of several runs, and the
+listing shows which LitMath modules each statement loaded and whether
+NumPy was pulled in.
+'''
+import subprocess
+import sys
+
+STATEMENTS = [
+    'import LitMath',
+    'from LitMath import Vector3',
+    'from LitMath import Quaternion',
+    'from LitMath import Matrix4',
+    'from LitMath import *',
+]
+
+def importTime(statement, runs=5):
+    '''Returns (median microseconds, LitMath modules loaded, numpy loaded) for statement.'''
+    times = []
+    modules = []
+    numpy = False
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                              stderr=subprocess.PIPE, universal_newlines=True, check=True)
+        total = 0
+        modules = []
+        numpy = False
+        for line in proc.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = line.split('|')
+            if len(parts) != 3 or not parts[0].startswith('import time:'):
+                continue
+            name = parts[2].strip()
+            if name.startswith('numpy'):
+                numpy = True
+            if name.split('.')[0] == 'LitMath':
+                modules.append(name)
+                # nested lines are already part of a top-level cumulative time
+                if not parts[2].startswith('  '):
+                    total += int(parts[1])
+        times.append(total)
+    times.sort()
+    return times[len(times) // 2], modules, numpy
+
+def cases(statements=STATEMENTS):
+    '''Import statements as benchmark results, ops/sec is imports per second.'''
+    results = {}
+    for statement in statements:
+        us, modules, numpy = importTime(statement)
+        results[statement] = {'opsPerSec': 1e6 / us if us else float('inf'),
+                              'allocsPerOp': 0.0}
+    return results
+
+def main():
+    print('%-34s %10s %8s %6s' % ('statement', 'time (us)', 'modules', 'numpy'))
+    for statement in STATEMENTS:
+        us, modules, numpy = importTime(statement)
+        print('%-34s %10d %8d %6s' % (statement, us, len(modules), 'yes' if numpy else 'no'))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+'''Matrix4 inverse paths against the original 16-cofactor expansion.'''
+import timeit
+
+from LitMath import Matrix4, Vector3
+
+def cofactorInverse(self):
+    '''The Matrix4.inverse implementation before the specialized paths.'''
+    d = self.determinant
+    if d == 0:
+        return Matrix4.identity()
+
+    M = Matrix4()
+    M.m11 = (self.m23*self.m34*self.m42 - self.m24*self.m33*self.m42 + self.m24*self.m32*self.m43 - \
+            self.m22*self.m34*self.m43 - self.m23*self.m32*self.m44 + self.m22*self.m33*self.m44) / d
+    M.m12 = (self.m14*self.m33*self.m42 - self.m13*self.m34*self.m42 - self.m14*self.m32*self.m43 + \
+            self.m12*self.m34*self.m43 + self.m13*self.m32*self.m44 - self.m12*self.m33*self.m44) / d
+    M.m13 = (self.m13*self.m24*self.m42 - self.m14*self.m23*self.m42 + self.m14*self.m22*self.m43 - \
+            self.m12*self.m24*self.m43 - self.m13*self.m22*self.m44 + self.m12*self.m23*self.m44) / d
+    M.m14 = (self.m14*self.m23*self.m32 - self.m13*self.m24*self.m32 - self.m14*self.m22*self.m33 + \
+            self.m12*self.m24*self.m33 + self.m13*self.m22*self.m34 - self.m12*self.m23*self.m34) / d
+    M.m21 = (self.m24*self.m33*self.m41 - self.m23*self.m34*self.m41 - self.m24*self.m31*self.m43 + \
+            self.m21*self.m34*self.m43 + self.m23*self.m31*self.m44 - self.m21*self.m33*self.m44) / d
+    M.m22 = (self.m13*self.m34*self.m41 - self.m14*self.m33*self.m41 + self.m14*self.m31*self.m43 - \
+            self.m11*self.m34*self.m43 - self.m13*self.m31*self.m44 + self.m11*self.m33*self.m44) / d
+    M.m23 = (self.m14*self.m23*self.m41 - self.m13*self.m24*self.m41 - self.m14*self.m21*self.m43 + \
+            self.m11*self.m24*self.m43 + self.m13*self.m21*self.m44 - self.m11*self.m23*self.m44) / d
+    M.m24 = (self.m13*self.m24*self.m31 - self.m14*self.m23*self.m31 + self.m14*self.m21*self.m33 - \
+            self.m11*self.m24*self.m33 - self.m13*self.m21*self.m34 + self.m11*self.m23*self.m34) / d
+    M.m31 = (self.m22*self.m34*self.m41 - self.m24*self.m32*self.m41 + self.m24*self.m31*self.m42 - \
+            self.m21*self.m34*self.m42 - self.m22*self.m31*self.m44 + self.m21*self.m32*self.m44) / d
+    M.m32 = (self.m14*self.m32*self.m41 - self.m12*self.m34*self.m41 - self.m14*self.m31*self.m42 + \
+            self.m11*self.m34*self.m42 + self.m12*self.m31*self.m44 - self.m11*self.m32*self.m44) / d
+    M.m33 = (self.m12*self.m24*self.m41 - self.m14*self.m22*self.m41 + self.m14*self.m21*self.m42 - \
+            self.m11*self.m24*self.m42 - self.m12*self.m21*self.m44 + self.m11*self.m22*self.m44) / d
+    M.m34 = (self.m14*self.m22*self.m31 - self.m12*self.m24*self.m31 - self.m14*self.m21*self.m32 + \
+            self.m11*self.m24*self.m32 + self.m12*self.m21*self.m34 - self.m11*self.m22*self.m34) / d
+    M.m41 = (self.m23*self.m32*self.m41 - self.m22*self.m33*self.m41 - self.m23*self.m31*self.m42 + \
+            self.m21*self.m33*self.m42 + self.m22*self.m31*self.m43 - self.m21*self.m32*self.m43) / d
+    M.m42 = (self.m12*self.m33*self.m41 - self.m13*self.m32*self.m41 + self.m13*self.m31*self.m42 - \
+            self.m11*self.m33*self.m42 - self.m12*self.m31*self.m43 + self.m11*self.m32*self.m43) / d
+    M.m43 = (self.m13*self.m22*self.m41 - self.m12*self.m23*self.m41 - self.m13*self.m21*self.m42 + \
+            self.m11*self.m23*self.m42 + self.m12*self.m21*self.m43 - self.m11*self.m22*self.m43) / d
+    M.m44 = (self.m12*self.m23*self.m31 - self.m13*self.m22*self.m31 + self.m13*self.m21*self.m32 - \
+            self.m11*self.m23*self.m32 - self.m12*self.m21*self.m33 + self.m11*self.m22*self.m33) / d
+    return M
+
+def main(number=20000):
+    rigid = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.axisAngle(Vector3(1.0, 2.0, 3.0), 40.0)
+    affine = rigid * Matrix4.scale(2.0, 0.5, 3.0)
+    projective = affine.copy()
+    projective.m41 = 0.25
+    projective.m44 = 0.5
+
+    cases = [
+        ('projective', projective, [('cofactor', cofactorInverse), ('inverse', Matrix4.getInverse)]),
+        ('affine', affine, [('cofactor', cofactorInverse), ('inverse', Matrix4.getInverse),
+                            ('inverseAffine', Matrix4.getInverseAffine)]),
+        ('rigid', rigid, [('cofactor', cofactorInverse), ('inverse', Matrix4.getInverse),
+                          ('inverseAffine', Matrix4.getInverseAffine),
+                          ('inverseRigid', Matrix4.getInverseRigid)]),
+    ]
+    for kind, m, paths in cases:
+        base = None
+        for name, fn in paths:
+            t = min(timeit.repeat(lambda: fn(m), number=number, repeat=3)) / number
+            base = base or t
+            print('%-11s %-14s %7.2f us  %5.2fx' % (kind, name, t * 1e6, base / t))
+
+if __name__ == '__main__':
+    main()
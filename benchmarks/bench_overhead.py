@@ -0,0 +1,59 @@
+'''Per-call overhead of the hot operations, before and after the fast path.
+
+"before" is the committed baseline.json, recorded before the trusted
+constructors, "checked" and "unchecked" are the current code with
+Util.setValidation on and off.
+'''
+import os
+
+from LitMath import Matrix4, Quaternion, Util, Vector3
+from . import harness
+
+def cases():
+    axis = Vector3(1.0, 2.0, 3.0)
+    a = Vector3(1.0, 2.0, 3.0)
+    b = Vector3(-2.0, 0.5, 4.0)
+    m = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.axisAngle(axis, 30.0)
+    q = Quaternion.axisAngle(axis, 30.0)
+    r = Quaternion.axisAngle(Vector3(0.0, 1.0, 0.0), 70.0)
+    return [
+        ('Vector3()', lambda: Vector3(1.0, 2.0, 3.0)),
+        ('Vector3.copy', lambda: a.copy()),
+        ('Vector3 +', lambda: a + b),
+        ('Vector3 *', lambda: a * 2.0),
+        ('Vector3.cross', lambda: Vector3.cross(a, b)),
+        ('Vector3.normalized', lambda: a.normalized),
+        ('Matrix4.copy', lambda: m.copy()),
+        ('Matrix4 *', lambda: m * m),
+        ('Matrix4.multiplyPoint', lambda: m.multiplyPoint(a)),
+        ('Matrix4.multiplyVector', lambda: m.multiplyVector(a)),
+        ('Matrix4.rotateX', lambda: Matrix4.rotateX(30.0)),
+        ('Matrix4.axisAngleInRadian', lambda: Matrix4.axisAngleInRadian(axis, 0.5)),
+        ('Quaternion.copy', lambda: q.copy()),
+        ('Quaternion *', lambda: q * r),
+        ('Quaternion.multiplyPoint', lambda: q.multiplyPoint(a)),
+        ('Quaternion.toMatrix4', lambda: q.toMatrix4()),
+        ('Quaternion.matrix4', lambda: Quaternion.matrix4(m)),
+        ('Quaternion.axisAngleInRadian', lambda: Quaternion.axisAngleInRadian(axis, 0.5)),
+        ('Quaternion.fromToRotation', lambda: Quaternion.fromToRotation(a, b)),
+        ('Quaternion.slerp', lambda: Quaternion.slerp(q, r, 0.3)),
+    ]
+
+def main():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+    baseline = harness.load(path)['results'] if os.path.exists(path) else {}
+
+    print('%-30s %12s %12s %12s' % ('operation', 'before (ns)', 'checked (ns)', 'unchecked (ns)'))
+    for name, fn in cases():
+        before = baseline.get(name)
+        Util.setValidation(True)
+        checked = harness.measure(fn, repeat=7)['opsPerSec']
+        Util.setValidation(False)
+        unchecked = harness.measure(fn, repeat=7)['opsPerSec']
+        Util.setValidation(True)
+        print('%-30s %12s %12.0f %12.0f' % (name,
+                                           '%.0f' % (1e9 / before['opsPerSec']) if before else '-',
+                                           1e9 / checked, 1e9 / unchecked))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,48 @@
+'''Parallel batch kernels: scaling from 1 to N workers.
+
+    python -m benchmarks.bench_parallel [n] [mode] [inner]
+
+mode is 'auto', 'process' or 'thread' and inner the backend the workers
+run. One worker runs the inner kernel directly, the baseline the speedups
+are relative to.
+'''
+import os
+import random
+import sys
+import timeit
+from array import array
+
+from LitMath import Backend, Matrix4, Matrix4Stack, QuaternionArray, Vector3Array
+
+def main(n=1000000, mode='auto', inner=None, repeat=3):
+    rnd = random.Random(0)
+    points = Vector3Array(array('d', [rnd.uniform(-1.0, 1.0) for _ in range(3 * n)]))
+    quats = QuaternionArray(array('d', [rnd.uniform(-1.0, 1.0) for _ in range(4 * n)]))
+    quats.normalize()
+    count = n // 8
+    stack = Matrix4Stack(array('d', [rnd.uniform(-1.0, 1.0) for _ in range(16 * count)]))
+    m = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.rotateY(30.0)
+
+    cases = [
+        ('multiplyPoints %d' % n, lambda: m.multiplyPoints(points)),
+        ('rotate points %d' % n, lambda: quats.multiplyPoints(points)),
+        ('Matrix4Stack * %d' % count, lambda: stack * stack),
+        ('Matrix4Stack.inverse %d' % count, lambda: stack.inverse),
+    ]
+    counts = sorted(set([1, 2, 4, os.cpu_count() or 1]))
+    try:
+        for name, fn in cases:
+            base = None
+            for workers in counts:
+                backend = Backend.use('parallel', workers=workers, mode=mode, inner=inner)
+                fn()  # starts the pool
+                t = min(timeit.repeat(fn, number=1, repeat=repeat))
+                backend.close()
+                base = base or t
+                print('%-28s %-7s %2d workers %8.1f ms  %5.2fx' % (name, backend.mode, workers,
+                                                                   t * 1000.0, base / t))
+    finally:
+        Backend.use()
+
+if __name__ == '__main__':
+    main(*[int(a) if a.isdigit() else a for a in sys.argv[1:]])
\ No newline at end of file
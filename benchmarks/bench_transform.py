@@ -0,0 +1,29 @@
+'''Batch point transforms against the per-point multiplyPoint loop.'''
+import random
+import timeit
+from array import array
+
+from LitMath import Matrix4, Vector3, Vector3Array
+
+def main(n=100000, repeat=3):
+    m = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.rotateY(30.0) * Matrix4.scale(2.0, 2.0, 2.0)
+    flat = array('d', [random.uniform(-1.0, 1.0) for _ in range(3 * n)])
+    vectors = [Vector3(flat[i], flat[i + 1], flat[i + 2]) for i in range(0, len(flat), 3)]
+    packed = Vector3Array(flat)
+    out = array('d', flat)
+
+    cases = [
+        ('multiplyPoint loop', lambda: [m.multiplyPoint(v) for v in vectors]),
+        ('multiplyPoints list', lambda: m.multiplyPoints(vectors)),
+        ('multiplyPoints Vector3Array', lambda: m.multiplyPoints(packed)),
+        ('multiplyPoints flat', lambda: m.multiplyPoints(flat)),
+        ('multiplyPoints flat out=', lambda: m.multiplyPoints(flat, out=out)),
+    ]
+    base = None
+    for name, fn in cases:
+        t = min(timeit.repeat(fn, number=1, repeat=repeat))
+        base = base or t
+        print('%-30s %8.1f ms  %6.2fx' % (name, t * 1000.0, base / t))
+
+if __name__ == '__main__':
+    main()
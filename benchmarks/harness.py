@@ -0,0 +1,89 @@
+'''Timing, allocation counting and baseline comparison for the suite.'''
+import gc
+import json
+import platform
+import sys
+import time
+
+def measure(fn, minTime=0.2, repeat=3):
+    '''Returns ops/sec and objects allocated per call of fn.
+
+    The call count is grown until one run takes at least minTime, the
+    fastest of repeat runs gives the rate.
+    '''
+    number = 1
+    while True:
+        t = _run(fn, number)
+        if t >= minTime or number >= 1 << 24:
+            break
+        number *= 10 if t < minTime / 10.0 else 2
+    best = min([t] + [_run(fn, number) for _ in range(repeat - 1)])
+    return {'opsPerSec': number / best if best > 0 else float('inf'),
+            'allocsPerOp': allocations(fn, min(number, 1000))}
+
+def allocations(fn, number=1000):
+    '''Objects left allocated per call of fn.
+
+    Results are kept alive until the count is taken, so this is what one
+    call returns to its caller, temporaries freed inside the call are not
+    counted.
+    '''
+    keep = [None] * number
+    fn()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        for i in range(number):
+            keep[i] = fn()
+        after = sys.getallocatedblocks()
+    finally:
+        if enabled:
+            gc.enable()
+    return float(after - before) / number
+
+def _run(fn, number):
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        loop = range(number)
+        start = time.perf_counter()
+        for _ in loop:
+            fn()
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+def report(results):
+    '''Returns {'python', 'platform', 'results'} ready to be written as JSON.'''
+    return {'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results}
+
+def save(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold=0.25, allocSlack=0.5):
+    '''Lists the regressions of results against baseline.
+
+    An operation regresses when its rate drops by more than threshold (a
+    fraction of the baseline rate) or it allocates more than allocSlack
+    extra objects per call. Returns (name, what, baseline, current) tuples.
+    '''
+    regressions = []
+    for name, current in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if current['opsPerSec'] < base['opsPerSec'] * (1.0 - threshold):
+            regressions.append((name, 'opsPerSec', base['opsPerSec'], current['opsPerSec']))
+        if current['allocsPerOp'] > base['allocsPerOp'] + allocSlack:
+            regressions.append((name, 'allocsPerOp', base['allocsPerOp'], current['allocsPerOp']))
+    return regressions
\ No newline at end of file
@@ -0,0 +1,436 @@
+'''The benchmark cases: every public operation of the value types and a few workloads.
+
+operations() and workloads() return (name, fn) pairs, fn takes no
+arguments and all inputs are built before it is timed.
+'''
+import random
+from array import array
+
+from LitMath import AABB, AABBArray, BVH, Frustum, Matrix3, Matrix4, Quaternion, QuaternionArray, Ray, RayArray, \
+                    Transform, TransformChain, Vector2, Vector3, Vector3Array
+
+def operations():
+    return vector2() + vector3() + matrix3() + matrix4() + quaternion() + aabb() + frustum() + bvh() + ray()
+
+def vector2():
+    a = Vector2(1.0, 2.0)
+    b = Vector2(3.0, -1.0)
+    c = Vector2(1.0, 2.0)
+    out = Vector2()
+    buf = array('d', (1.0, 2.0))
+    return [
+        ('Vector2()', lambda: Vector2(1.0, 2.0)),
+        ('Vector2.set', lambda: c.set(1.0, 2.0)),
+        ('Vector2.copy', lambda: a.copy()),
+        ('Vector2 ==', lambda: a == b),
+        ('Vector2 +', lambda: a + b),
+        ('Vector2 -', lambda: a - b),
+        ('Vector2 neg', lambda: -a),
+        ('Vector2 *', lambda: a * 2.0),
+        ('Vector2 /', lambda: a.__div__(2.0)),
+        ('Vector2 +=', lambda: out.__iadd__(b)),
+        ('Vector2 -=', lambda: out.__isub__(b)),
+        ('Vector2 *=', lambda: out.__imul__(1.0)),
+        ('Vector2.length', lambda: a.length),
+        ('Vector2.lengthSquared', lambda: a.lengthSquared),
+        ('Vector2.normalize', lambda: c.normalize()),
+        ('Vector2.normalized', lambda: a.normalized),
+        ('Vector2.getNormalized out=', lambda: a.getNormalized(out)),
+        ('Vector2.dot', lambda: Vector2.dot(a, b)),
+        ('Vector2.angle', lambda: Vector2.angle(a, b)),
+        ('Vector2.angleInRadian', lambda: Vector2.angleInRadian(a, b)),
+        ('Vector2.toBuffer', lambda: a.toBuffer()),
+        ('Vector2.fromBuffer', lambda: Vector2.fromBuffer(buf)),
+    ]
+
+def vector3():
+    a = Vector3(1.0, 2.0, 3.0)
+    b = Vector3(-2.0, 0.5, 4.0)
+    c = Vector3(1.0, 2.0, 3.0)
+    out = Vector3()
+    buf = array('d', (1.0, 2.0, 3.0))
+    return [
+        ('Vector3()', lambda: Vector3(1.0, 2.0, 3.0)),
+        ('Vector3.set', lambda: c.set(1.0, 2.0, 3.0)),
+        ('Vector3.copy', lambda: a.copy()),
+        ('Vector3 ==', lambda: a == b),
+        ('Vector3 +', lambda: a + b),
+        ('Vector3 -', lambda: a - b),
+        ('Vector3 neg', lambda: -a),
+        ('Vector3 *', lambda: a * 2.0),
+        ('Vector3 /', lambda: a.__div__(2.0)),
+        ('Vector3 +=', lambda: out.__iadd__(b)),
+        ('Vector3 -=', lambda: out.__isub__(b)),
+        ('Vector3 *=', lambda: out.__imul__(1.0)),
+        ('Vector3.length', lambda: a.length),
+        ('Vector3.lengthSquared', lambda: a.lengthSquared),
+        ('Vector3.normalize', lambda: c.normalize()),
+        ('Vector3.normalized', lambda: a.normalized),
+        ('Vector3.getNormalized out=', lambda: a.getNormalized(out)),
+        ('Vector3.dot', lambda: Vector3.dot(a, b)),
+        ('Vector3.cross', lambda: Vector3.cross(a, b)),
+        ('Vector3.cross out=', lambda: Vector3.cross(a, b, out)),
+        ('Vector3.angle', lambda: Vector3.angle(a, b)),
+        ('Vector3.angleInRadian', lambda: Vector3.angleInRadian(a, b)),
+        ('Vector3.toBuffer', lambda: a.toBuffer()),
+        ('Vector3.fromBuffer', lambda: Vector3.fromBuffer(buf)),
+    ]
+
+def matrix3():
+    m = Matrix3.translate(1.0, 2.0) * Matrix3.rotate(30.0) * Matrix3.scale(2.0, 3.0)
+    c = m.copy()
+    out = Matrix3()
+    p = Vector2(1.0, 2.0)
+    pout = Vector2()
+    points = [Vector2(float(i), 1.0) for i in range(100)]
+    buf = m.toBuffer()
+    return [
+        ('Matrix3()', lambda: Matrix3()),
+        ('Matrix3.set', lambda: c.set(1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)),
+        ('Matrix3.setIdentity', lambda: c.setIdentity()),
+        ('Matrix3.copy', lambda: m.copy()),
+        ('Matrix3 ==', lambda: m == c),
+        ('Matrix3 *', lambda: m * m),
+        ('Matrix3.multiply out=', lambda: m.multiply(m, out)),
+        ('Matrix3 *=', lambda: out.__imul__(m)),
+        ('Matrix3.determinant', lambda: m.determinant),
+        ('Matrix3.inverse', lambda: m.inverse),
+        ('Matrix3.getInverse out=', lambda: m.getInverse(out)),
+        ('Matrix3.transpose', lambda: m.transpose),
+        ('Matrix3.getTranspose out=', lambda: m.getTranspose(out)),
+        ('Matrix3.multiplyPoint', lambda: m.multiplyPoint(p)),
+        ('Matrix3.multiplyPoint out=', lambda: m.multiplyPoint(p, pout)),
+        ('Matrix3.multiplyVector', lambda: m.multiplyVector(p)),
+        ('Matrix3.multiplyPoints 100', lambda: m.multiplyPoints(points)),
+        ('Matrix3.multiplyVectors 100', lambda: m.multiplyVectors(points)),
+        ('Matrix3.identity', lambda: Matrix3.identity()),
+        ('Matrix3.zero', lambda: Matrix3.zero()),
+        ('Matrix3.translate', lambda: Matrix3.translate(1.0, 2.0)),
+        ('Matrix3.rotate', lambda: Matrix3.rotate(30.0)),
+        ('Matrix3.rotateInRadian', lambda: Matrix3.rotateInRadian(0.5)),
+        ('Matrix3.scale', lambda: Matrix3.scale(2.0, 3.0)),
+        ('Matrix3.toBuffer', lambda: m.toBuffer()),
+        ('Matrix3.fromBuffer', lambda: Matrix3.fromBuffer(buf)),
+    ]
+
+def matrix4():
+    axis = Vector3(1.0, 2.0, 3.0)
+    m = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.axisAngle(axis, 30.0) * Matrix4.scale(2.0, 3.0, 4.0)
+    r = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.axisAngle(axis, 30.0)
+    projective = m.copy()
+    projective.m41 = 0.1
+    c = m.copy()
+    out = Matrix4()
+    p = Vector3(1.0, 2.0, 3.0)
+    pout = Vector3()
+    points = [Vector3(float(i), 1.0, 2.0) for i in range(100)]
+    packed = Vector3Array.fromVectors(points)
+    buf = m.toBuffer()
+    q = Quaternion.axisAngle(axis, 30.0)
+    scale = Vector3(2.0, 3.0, 4.0)
+    return [
+        ('Matrix4()', lambda: Matrix4()),
+        ('Matrix4.set', lambda: c.set(1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0,
+                                      0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0)),
+        ('Matrix4.setIdentity', lambda: c.setIdentity()),
+        ('Matrix4.copy', lambda: m.copy()),
+        ('Matrix4 ==', lambda: m == c),
+        ('Matrix4 *', lambda: m * m),
+        ('Matrix4.multiply out=', lambda: m.multiply(m, out)),
+        ('Matrix4 *=', lambda: out.__imul__(m)),
+        ('Matrix4.determinant', lambda: m.determinant),
+        ('Matrix4.inverse', lambda: m.inverse),
+        ('Matrix4.inverse projective', lambda: projective.inverse),
+        ('Matrix4.getInverse out=', lambda: m.getInverse(out)),
+        ('Matrix4.inverseAffine', lambda: m.inverseAffine),
+        ('Matrix4.inverseRigid', lambda: r.inverseRigid),
+        ('Matrix4.transpose', lambda: m.transpose),
+        ('Matrix4.getTranspose out=', lambda: m.getTranspose(out)),
+        ('Matrix4.normalMatrix', lambda: m.normalMatrix),
+        ('Matrix4.multiplyPoint', lambda: m.multiplyPoint(p)),
+        ('Matrix4.multiplyPoint out=', lambda: m.multiplyPoint(p, pout)),
+        ('Matrix4.multiplyVector', lambda: m.multiplyVector(p)),
+        ('Matrix4.multiplyPoints 100', lambda: m.multiplyPoints(points)),
+        ('Matrix4.multiplyPoints Vector3Array 100', lambda: m.multiplyPoints(packed)),
+        ('Matrix4.multiplyVectors 100', lambda: m.multiplyVectors(points)),
+        ('Matrix4.identity', lambda: Matrix4.identity()),
+        ('Matrix4.zero', lambda: Matrix4.zero()),
+        ('Matrix4.translate', lambda: Matrix4.translate(1.0, 2.0, 3.0)),
+        ('Matrix4.scale', lambda: Matrix4.scale(2.0, 3.0, 4.0)),
+        ('Matrix4.rotateX', lambda: Matrix4.rotateX(30.0)),
+        ('Matrix4.rotateY', lambda: Matrix4.rotateY(30.0)),
+        ('Matrix4.rotateZ', lambda: Matrix4.rotateZ(30.0)),
+        ('Matrix4.rotateXInRadian', lambda: Matrix4.rotateXInRadian(0.5)),
+        ('Matrix4.axisAngle', lambda: Matrix4.axisAngle(axis, 30.0)),
+        ('Matrix4.axisAngleInRadian', lambda: Matrix4.axisAngleInRadian(axis, 0.5)),
+        ('Matrix4.fromTRS', lambda: Matrix4.fromTRS(p, q, scale)),
+        ('Matrix4.fromTRS out=', lambda: Matrix4.fromTRS(p, q, scale, out)),
+        ('Matrix4.fromTRS product', lambda: Matrix4.translate(p.x, p.y, p.z) * q.toMatrix4()
+                                            * Matrix4.scale(scale.x, scale.y, scale.z)),
+        ('Matrix4.decomposeTRS', lambda: m.decomposeTRS()),
+        ('Matrix4.toBuffer', lambda: m.toBuffer()),
+        ('Matrix4.fromBuffer', lambda: Matrix4.fromBuffer(buf)),
+    ]
+
+def quaternion():
+    axis = Vector3(1.0, 2.0, 3.0)
+    q = Quaternion.axisAngle(axis, 30.0)
+    r = Quaternion.axisAngle(Vector3(0.0, 1.0, 0.0), 70.0)
+    c = q.copy()
+    out = Quaternion()
+    p = Vector3(1.0, 2.0, 3.0)
+    pout = Vector3()
+    m = q.toMatrix4()
+    points = [Vector3(float(i), 1.0, 2.0) for i in range(100)]
+    buf = q.toBuffer()
+    return [
+        ('Quaternion()', lambda: Quaternion()),
+        ('Quaternion.set', lambda: c.set(0.0, 0.0, 0.0, 1.0)),
+        ('Quaternion.setIdentity', lambda: c.setIdentity()),
+        ('Quaternion.copy', lambda: q.copy()),
+        ('Quaternion ==', lambda: q == r),
+        ('Quaternion *', lambda: q * r),
+        ('Quaternion.multiply out=', lambda: q.multiply(r, out)),
+        ('Quaternion *=', lambda: out.__imul__(q)),
+        ('Quaternion.magnitude', lambda: q.magnitude),
+        ('Quaternion.normalize', lambda: c.normalize()),
+        ('Quaternion.normalized', lambda: q.normalized),
+        ('Quaternion.invert', lambda: c.invert()),
+        ('Quaternion.inverse', lambda: q.inverse),
+        ('Quaternion.multiplyPoint', lambda: q.multiplyPoint(p)),
+        ('Quaternion.multiplyPoint out=', lambda: q.multiplyPoint(p, pout)),
+        ('Quaternion.multiplyPoints 100', lambda: q.multiplyPoints(points)),
+        ('Quaternion.toMatrix4', lambda: q.toMatrix4()),
+        ('Quaternion.matrix4', lambda: Quaternion.matrix4(m)),
+        ('Quaternion.toAxisAngle', lambda: q.toAxisAngle()),
+        ('Quaternion.toAxisAngleInRadian', lambda: q.toAxisAngleInRadian()),
+        ('Quaternion.identity', lambda: Quaternion.identity()),
+        ('Quaternion.axisAngle', lambda: Quaternion.axisAngle(axis, 30.0)),
+        ('Quaternion.axisAngleInRadian', lambda: Quaternion.axisAngleInRadian(axis, 0.5)),
+        ('Quaternion.fromToRotation', lambda: Quaternion.fromToRotation(p, axis)),
+        ('Quaternion.dot', lambda: Quaternion.dot(q, r)),
+        ('Quaternion.nlerp', lambda: Quaternion.nlerp(q, r, 0.3)),
+        ('Quaternion.slerp', lambda: Quaternion.slerp(q, r, 0.3)),
+        ('Quaternion.toBuffer', lambda: q.toBuffer()),
+        ('Quaternion.fromBuffer', lambda: Quaternion.fromBuffer(buf)),
+    ]
+
+def aabb():
+    m = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.axisAngle(Vector3(1.0, 2.0, 3.0), 30.0)
+    a = AABB(Vector3(-1.0, -2.0, -3.0), Vector3(1.0, 2.0, 3.0))
+    b = AABB(Vector3(0.0, 0.0, 0.0), Vector3(4.0, 4.0, 4.0))
+    out = AABB()
+    points = [Vector3(float(i), 1.0, 2.0) for i in range(100)]
+    packed = Vector3Array.fromVectors(points)
+    boxes = AABBArray.fromCenterExtents(packed, Vector3(0.5, 0.5, 0.5))
+    return [
+        ('AABB.union', lambda: a.union(b)),
+        ('AABB.intersects', lambda: a.intersects(b)),
+        ('AABB.transform', lambda: a.transform(m)),
+        ('AABB.transform out=', lambda: a.transform(m, out)),
+        ('AABB.fromPoints 100', lambda: AABB.fromPoints(points)),
+        ('AABB.fromPoints Vector3Array 100', lambda: AABB.fromPoints(packed)),
+        ('AABBArray.transform 100', lambda: boxes.transform(m)),
+        ('AABBArray.overlaps 100', lambda: boxes.overlaps(b)),
+    ]
+
+def frustum():
+    eye = Vector3(0.0, 2.0, 10.0)
+    target = Vector3()
+    up = Vector3(0.0, 1.0, 0.0)
+    vp = Matrix4.perspective(60.0, 1.5, 0.5, 100.0) * Matrix4.lookAt(eye, target, up)
+    f = Frustum(vp)
+    p = Vector3(1.0, 2.0, 3.0)
+    box = AABB(Vector3(-1.0, -2.0, -3.0), Vector3(1.0, 2.0, 3.0))
+    packed = Vector3Array([float(i % 7 - 3) for i in range(300)])
+    boxes = AABBArray.fromCenterExtents(packed, Vector3(0.5, 0.5, 0.5))
+    return [
+        ('Matrix4.perspective', lambda: Matrix4.perspective(60.0, 1.5, 0.5, 100.0)),
+        ('Matrix4.orthographic', lambda: Matrix4.orthographic(-1.0, 1.0, -1.0, 1.0, 0.5, 100.0)),
+        ('Matrix4.lookAt', lambda: Matrix4.lookAt(eye, target, up)),
+        ('Frustum()', lambda: Frustum(vp)),
+        ('Frustum.intersectsSphere', lambda: f.intersectsSphere(p, 1.0)),
+        ('Frustum.intersectsAABB', lambda: f.intersectsAABB(box)),
+        ('Frustum.visibleSpheres 100', lambda: f.visibleSpheres(packed, 0.5)),
+        ('Frustum.visibleBoxes 100', lambda: f.visibleBoxes(boxes)),
+    ]
+
+def bvh():
+    packed = Vector3Array([float((i * 7) % 11 - 5) for i in range(300)])
+    points = BVH.fromPoints(packed)
+    triangles = BVH.fromTriangles(packed.data[:297])
+    p = Vector3(0.5, 1.5, -0.5)
+    d = Vector3(0.0, 0.0, 1.0)
+    return [
+        ('BVH.fromPoints 100', lambda: BVH.fromPoints(packed)),
+        ('BVH.fromTriangles 33', lambda: BVH.fromTriangles(packed.data[:297])),
+        ('BVH.nearest 100', lambda: points.nearest(p)),
+        ('BVH.kNearest 100 k=8', lambda: points.kNearest(p, 8)),
+        ('BVH.withinRadius 100', lambda: points.withinRadius(p, 2.0)),
+        ('BVH.raycast 33', lambda: triangles.raycast(p, d)),
+        ('BVH.refit 100', lambda: points.refit()),
+    ]
+
+def ray():
+    r = Ray(Vector3(0.1, 0.2, 10.0), Vector3(0.0, 0.0, -1.0))
+    a = Vector3(-1.0, -1.0, 0.0)
+    b = Vector3(1.0, -1.0, 0.0)
+    c = Vector3(0.0, 1.0, 0.0)
+    box = AABB(Vector3(-1.0, -1.0, -1.0), Vector3(1.0, 1.0, 1.0))
+    vertices = Vector3Array([float((i * 7) % 11 - 5) for i in range(297)])
+    boxes = AABBArray.fromCenterExtents(vertices, Vector3(0.5, 0.5, 0.5))
+    rays = RayArray.fromOriginsDirections(vertices, Vector3(0.0, 0.0, -1.0))
+    return [
+        ('Ray.intersectTriangle', lambda: r.intersectTriangle(a, b, c)),
+        ('Ray.intersectAABB', lambda: r.intersectAABB(box)),
+        ('Ray.intersectTriangles 33', lambda: r.intersectTriangles(vertices)),
+        ('Ray.intersectBoxes 99', lambda: r.intersectBoxes(boxes)),
+        ('Ray.pick 33', lambda: r.pick(vertices)),
+        ('RayArray.intersectTriangle 99', lambda: rays.intersectTriangle(a, b, c)),
+        ('RayArray.intersectAABB 99', lambda: rays.intersectAABB(box)),
+    ]
+
+def workloads(scale=1.0):
+    '''Point cloud, hierarchy, keyframe, broad phase, culling, spatial query and picking workloads.
+
+    Sizes are multiplied by scale.
+    '''
+    rng = random.Random(42)
+    return pointCloud(rng, max(1, int(1000000 * scale))) + \
+           hierarchy(rng, max(1, int(10000 * scale))) + \
+           keyframes(rng, max(1, int(100 * scale)), max(1, int(10000 * scale))) + \
+           broadPhase(rng, max(1, int(10000 * scale))) + \
+           culling(rng, max(1, int(100000 * scale))) + \
+           spatialQueries(rng, max(1, int(100000 * scale))) + \
+           picking(rng, max(1, int(100000 * scale)))
+
+def pointCloud(rng, n):
+    m = Matrix4.translate(1.0, 2.0, 3.0) * Matrix4.rotateY(30.0) * Matrix4.scale(2.0, 2.0, 2.0)
+    cloud = Vector3Array([rng.uniform(-1.0, 1.0) for _ in range(3 * n)])
+    out = Vector3Array.zeros(n)
+    chain = TransformChain().scale(2.0, 2.0, 2.0).rotateY('angle').translate(1.0, 2.0, 3.0)
+    return [
+        ('workload point cloud %d' % n, lambda: m.multiplyPoints(cloud)),
+        ('workload point cloud %d out=' % n, lambda: m.multiplyPoints(cloud, out)),
+        ('workload point cloud %d chain' % n, lambda: chain.compile()(cloud, 30.0, out)),
+    ]
+
+def hierarchy(rng, n):
+    # random tree, every node hangs below an earlier one
+    nodes = [Transform()]
+    for i in range(1, n):
+        nodes.append(Transform(Vector3(rng.uniform(-1.0, 1.0), 1.0, 0.0),
+                               Quaternion.axisAngle(Vector3(0.0, 1.0, 0.0), rng.uniform(0.0, 360.0)),
+                               parent=nodes[rng.randrange(i)]))
+    root = nodes[0]
+    spin = [Quaternion.axisAngle(Vector3(0.0, 1.0, 0.0), float(a)) for a in range(360)]
+    state = [0]
+
+    def compose():
+        # moving the root dirties every world matrix
+        state[0] = (state[0] + 1) % 360
+        root.localRotation = spin[state[0]]
+        return root.flatten()
+
+    def compose2():
+        state[0] = (state[0] + 1) % 360
+        root.localRotation = spin[state[0]]
+        return [node.worldMatrix for node in nodes]
+
+    return [
+        ('workload hierarchy %d flatten' % n, compose),
+        ('workload hierarchy %d worldMatrix' % n, compose2),
+    ]
+
+def broadPhase(rng, n):
+    # n unit-sized boxes in a cube where each overlaps a few others
+    side = 2.0 * n ** (1.0 / 3.0)
+    boxes = AABBArray.fromCenterExtents(
+        Vector3Array([rng.uniform(0.0, side) for _ in range(3 * n)]), Vector3(0.5, 0.5, 0.5))
+    return [
+        ('workload broad phase %d AABBArray.overlapPairs' % n, lambda: boxes.overlapPairs()),
+    ]
+
+def culling(rng, n):
+    # n objects around a camera, roughly a tenth of them visible
+    vp = Matrix4.perspective(60.0, 1.5, 0.5, 100.0) * \
+         Matrix4.lookAt(Vector3(0.0, 2.0, 10.0), Vector3(), Vector3(0.0, 1.0, 0.0))
+    f = Frustum(vp)
+    centers = Vector3Array([rng.uniform(-100.0, 100.0) for _ in range(3 * n)])
+    radii = array('d', [rng.uniform(0.0, 2.0) for _ in range(n)])
+    boxes = AABBArray.fromCenterExtents(centers, Vector3(1.0, 1.0, 1.0))
+    return [
+        ('workload culling %d Frustum.visibleSpheres' % n, lambda: f.visibleSpheres(centers, radii)),
+        ('workload culling %d Frustum.visibleBoxes' % n, lambda: f.visibleBoxes(boxes)),
+    ]
+
+def spatialQueries(rng, n):
+    # 100 queries into n points, against the linear scan they replace
+    cloud = Vector3Array([rng.uniform(-1.0, 1.0) for _ in range(3 * n)])
+    tree = BVH.fromPoints(cloud)
+    vectors = cloud.toVectors()
+    queries = [Vector3(rng.uniform(-1.0, 1.0), rng.uniform(-1.0, 1.0), rng.uniform(-1.0, 1.0))
+               for _ in range(100)]
+    return [
+        ('workload spatial %d BVH.nearest x100' % n, lambda: [tree.nearest(q) for q in queries]),
+        ('workload spatial %d BVH.kNearest x100 k=8' % n, lambda: [tree.kNearest(q, 8) for q in queries]),
+        ('workload spatial %d BVH.withinRadius x100' % n, lambda: [tree.withinRadius(q, 0.05) for q in queries]),
+        ('workload spatial %d linear nearest x1' % n,
+         lambda: min(range(n), key=lambda i: (vectors[i] - queries[0]).lengthSquared)),
+    ]
+
+def picking(rng, n):
+    # one ray against n small triangles, against the Vector3 loop it replaces
+    corners = []
+    for _ in range(n):
+        a = [rng.uniform(-1.0, 1.0) for _ in range(3)]
+        corners += a + [v + rng.uniform(-0.1, 0.1) for v in a] + [v + rng.uniform(-0.1, 0.1) for v in a]
+    vertices = Vector3Array(corners)
+    vectors = vertices.toVectors()
+    r = Ray(Vector3(0.0, 0.0, 5.0), Vector3(0.01, 0.02, -1.0))
+
+    def loop():
+        o = r.origin
+        d = r.direction
+        hits = []
+        for i in range(0, len(vectors), 3):
+            a = vectors[i]
+            e1 = vectors[i + 1] - a
+            e2 = vectors[i + 2] - a
+            p = Vector3.cross(d, e2)
+            det = Vector3.dot(e1, p)
+            if det == 0.0:
+                continue
+            s = o - a
+            u = Vector3.dot(s, p) / det
+            q = Vector3.cross(s, e1)
+            v = Vector3.dot(d, q) / det
+            if 0.0 <= u <= 1.0 and v >= 0.0 and u + v <= 1.0:
+                hits.append((Vector3.dot(e2, q) / det, i // 3))
+        return min(hits) if hits else None
+
+    return [
+        ('workload picking %d Ray.pick' % n, lambda: r.pick(vertices)),
+        ('workload picking %d Ray.intersectTriangles' % n, lambda: r.intersectTriangles(vertices)),
+        ('workload picking %d Vector3 loop' % n, loop),
+    ]
+
+def keyframes(rng, keys, samples):
+    axis = Vector3(0.0, 1.0, 0.0)
+    frames = [Quaternion.axisAngle(Vector3(rng.uniform(-1.0, 1.0), rng.uniform(-1.0, 1.0), 1.0),
+                                   rng.uniform(0.0, 360.0)) for _ in range(keys)]
+    frames.append(Quaternion.axisAngle(axis, 0.0))
+    times = [rng.uniform(0.0, keys) for _ in range(samples)]
+    lower = QuaternionArray.fromQuaternions([frames[int(t)] for t in times])
+    upper = QuaternionArray.fromQuaternions([frames[int(t) + 1] for t in times])
+    fractions = array('d', [t - int(t) for t in times])
+
+    def sample():
+        slerp = Quaternion.slerp
+        return [slerp(frames[int(t)], frames[int(t) + 1], t - int(t)) for t in times]
+
+    return [
+        ('workload keyframes %d samples slerp' % samples, sample),
+        ('workload keyframes %d samples QuaternionArray.slerp' % samples,
+         lambda: QuaternionArray.slerp(lower, upper, fractions)),
+    ]
\ No newline at end of file
@@ -11,7 +11,7 @@ setup(
     maintainer='Hisin Wang',
     maintainer_email='wangyao1052@163.com',
     license='MIT',
-    packages=find_packages(exclude=('tests', 'tests.*')),
+    packages=find_packages(exclude=('tests', 'tests.*', 'benchmarks', 'benchmarks.*')),
     include_package_data=True,
     zip_safe=False,
     classifiers=[
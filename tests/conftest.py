@@ -0,0 +1,19 @@
+import pytest
+from LitMath import Backend
+
+# every backend made current in turn, the parallel ones with parts small
+# enough to really split and NumPy past its small-batch fallback
+BACKENDS = [('python', {})]
+if 'numpy' in Backend.available():
+    BACKENDS.append(('numpy', {'threshold': 2}))
+for inner in ('python', 'numpy') if 'numpy' in Backend.available() else ('python',):
+    for mode in ('thread', 'process'):
+        BACKENDS.append(('parallel', {'inner': inner, 'mode': mode, 'workers': 2, 'threshold': 2, 'chunkSize': 3}))
+
+
+@pytest.fixture(params=BACKENDS, ids=lambda p: '-'.join([p[0]] + [str(v) for v in p[1].values()][:2]))
+def backend(request):
+    name, options = request.param
+    b = Backend.use(name, **options)
+    yield b
+    Backend.use()
@@ -0,0 +1,44 @@
+from array import array
+import pytest
+from LitMath import (AABB, AABBArray, Matrix4, Matrix4Stack, Quaternion, QuaternionArray, Ray, RayArray,
+                     Vector2, Vector2Array, Vector3, Vector3Array)
+
+ARRAYS = [
+    (Vector3Array, 3, Vector3(1, 2, 3)),
+    (Vector2Array, 2, Vector2(1, 2)),
+    (QuaternionArray, 4, Quaternion(0, 0, 0, 1)),
+    (Matrix4Stack, 16, Matrix4()),
+    (AABBArray, 6, AABB(Vector3(0, 0, 0), Vector3(1, 1, 1))),
+    (RayArray, 6, Ray(Vector3(0, 0, 0), Vector3(0, 0, 1))),
+]
+
+
+@pytest.mark.parametrize('cls, size, value', ARRAYS, ids=lambda p: getattr(p, '__name__', ''))
+def test_from_buffer_checks_the_length(cls, size, value):
+    with pytest.raises(AssertionError):
+        cls.fromBuffer(array('d', bytes(8 * (2 * size + 1))))
+    with pytest.raises(AssertionError):
+        cls.fromBuffer(memoryview(array('d', bytes(8 * (size - 1)))))
+    assert len(cls.fromBuffer(array('d', bytes(16 * size)))) == 2
+
+
+@pytest.mark.parametrize('cls, size, value', ARRAYS, ids=lambda p: getattr(p, '__name__', ''))
+def test_append_to_a_wrapped_buffer(cls, size, value):
+    wrapped = cls.fromBuffer(array('d', bytes(8 * size)))
+    with pytest.raises(TypeError, match='fixed size'):
+        wrapped.append(value)
+    assert len(wrapped) == 1
+    assert len(wrapped.copy().append(value)) == 2
+
+
+@pytest.mark.parametrize('cls, size, value', ARRAYS, ids=lambda p: getattr(p, '__name__', ''))
+def test_index_out_of_range(cls, size, value):
+    a = cls.fromBuffer(array('d', range(2 * size)))
+    assert a[-1] == a[1] and a[-2] == a[0]
+    for i in (2, 3, -3, -4):
+        with pytest.raises(IndexError):
+            a[i]
+        with pytest.raises(IndexError):
+            a[i] = value
+    a[-2] = value
+    assert a[0] == value
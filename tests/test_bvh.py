@@ -0,0 +1,186 @@
+import math
+import random
+import pytest
+from LitMath import BVH, Ray, Vector3, Vector3Array
+
+SPLITS = ('median', 'sah')
+
+
+def cloud(n, seed):
+    rnd = random.Random(seed)
+    return Vector3Array.fromVectors([Vector3(rnd.uniform(-10, 10), rnd.uniform(-10, 10), rnd.uniform(-10, 10))
+                                     for _ in range(n)])
+
+
+def mesh(n, seed):
+    # small random triangles, a few of them degenerate: a repeated corner,
+    # collinear corners and a single point
+    rnd = random.Random(seed)
+    vertices = []
+    for k in range(n):
+        a = Vector3(rnd.uniform(-10, 10), rnd.uniform(-10, 10), rnd.uniform(-10, 10))
+        b = a + Vector3(rnd.uniform(-2, 2), rnd.uniform(-2, 2), rnd.uniform(-2, 2))
+        c = a + Vector3(rnd.uniform(-2, 2), rnd.uniform(-2, 2), rnd.uniform(-2, 2))
+        if k % 7 == 1:
+            c = b.copy()
+        elif k % 7 == 3:
+            c = a + (b - a) * 2.5
+        elif k % 7 == 5:
+            b = a.copy()
+            c = a.copy()
+        vertices.extend((a, b, c))
+    return Vector3Array.fromVectors(vertices)
+
+
+def pointDistance(data, j, p):
+    # the expression of Vector3.lengthSquared, like BVH
+    return (data[3 * j] - p.x) ** 2 + (data[3 * j + 1] - p.y) ** 2 + (data[3 * j + 2] - p.z) ** 2
+
+
+def segmentDistance(p, a, b):
+    ab = b - a
+    length = Vector3.dot(ab, ab)
+    t = 0.0 if length == 0.0 else min(max(Vector3.dot(p - a, ab) / length, 0.0), 1.0)
+    d = p - (a + ab * t)
+    return Vector3.dot(d, d)
+
+
+def triangleDistance(vertices, j, p):
+    # the projection onto the plane when it falls inside, the nearest edge otherwise
+    a, b, c = vertices[3 * j], vertices[3 * j + 1], vertices[3 * j + 2]
+    n = Vector3.cross(b - a, c - a)
+    nn = Vector3.dot(n, n)
+    if nn > 0.0:
+        h = Vector3.dot(p - a, n)
+        q = p - n * (h / nn)
+        if all(Vector3.dot(Vector3.cross(y - x, q - x), n) >= 0.0 for x, y in ((a, b), (b, c), (c, a))):
+            return h * h / nn
+    return min(segmentDistance(p, a, b), segmentDistance(p, b, c), segmentDistance(p, c, a))
+
+
+def queries(seed):
+    rnd = random.Random(seed)
+    return [Vector3(rnd.uniform(-12, 12), rnd.uniform(-12, 12), rnd.uniform(-12, 12)) for _ in range(25)]
+
+
+def checkPoints(bvh, data):
+    n = len(data) // 3
+    for p in queries(7):
+        exact = sorted((pointDistance(data, j, p), j) for j in range(n))
+        assert bvh.kNearest(p, 5) == [(j, d) for d, j in exact[:5]]
+        assert bvh.nearest(p) == (exact[0][1], exact[0][0])
+        assert bvh.kNearest(p, n + 3) == [(j, d) for d, j in exact]
+        assert bvh.withinRadius(p, 4.0) == sorted(j for d, j in exact if d <= 16.0)
+        limit = math.sqrt(exact[3][0])
+        assert bvh.kNearest(p, 10, maxDistance=limit) == [(j, d) for d, j in exact if d <= limit * limit][:10]
+
+
+def checkTriangles(bvh, vertices):
+    n = len(vertices) // 3
+    for p in queries(8):
+        exact = [triangleDistance(vertices, j, p) for j in range(n)]
+        found = bvh.kNearest(p, 5)
+        assert [d for j, d in found] == pytest.approx(sorted(exact)[:5], abs=1e-9)
+        assert all(d == pytest.approx(exact[j], abs=1e-9) for j, d in found)
+        inside = {j for j in range(n) if exact[j] <= 9.0 - 1e-9}
+        near = {j for j in range(n) if exact[j] <= 9.0 + 1e-9}
+        assert inside <= set(bvh.withinRadius(p, 3.0)) <= near
+    rnd = random.Random(9)
+    for _ in range(60):
+        # most rays aim at a triangle, hitting it or one in front of it
+        k = 3 * rnd.randrange(n)
+        target = (vertices[k] + vertices[k + 1] + vertices[k + 2]) * (1.0 / 3.0)
+        target = target + Vector3(rnd.uniform(-0.2, 0.2), rnd.uniform(-0.2, 0.2), rnd.uniform(-0.2, 0.2))
+        ray = Ray.fromPoints(Vector3(rnd.uniform(-15, 15), rnd.uniform(-15, 15), rnd.uniform(-15, 15)), target)
+        hits = []
+        for j in range(n):
+            tuv = ray.intersectTriangle(vertices[3 * j], vertices[3 * j + 1], vertices[3 * j + 2])
+            if tuv is not None:
+                hits.append((tuv[0], j) + tuv[1:])
+        hit = bvh.raycast(ray)
+        if not hits:
+            assert hit is None
+            continue
+        t, j, u, v = min(hits)
+        assert hit == (j, t, u, v)
+        assert bvh.raycast(ray.origin, ray.direction, maxDistance=t) == hit
+        assert bvh.raycast(ray, maxDistance=t * (1 - 1e-9)) is None
+
+
+@pytest.mark.parametrize('split', SPLITS)
+@pytest.mark.parametrize('leafSize', [1, 4])
+def test_points(split, leafSize):
+    points = cloud(200, 1)
+    checkPoints(BVH.fromPoints(points, leafSize, split), points.data)
+    assert len(BVH.fromPoints(points.toVectors(), leafSize, split)) == 200
+    checkPoints(BVH.fromPoints(points.toVectors(), leafSize, split), points.data)
+
+
+@pytest.mark.parametrize('split', SPLITS)
+@pytest.mark.parametrize('leafSize', [1, 4])
+def test_triangles(split, leafSize):
+    vertices = mesh(120, 2)
+    checkTriangles(BVH.fromTriangles(vertices, leafSize=leafSize, split=split), vertices)
+
+
+@pytest.mark.parametrize('split', SPLITS)
+def test_indexed_triangles(split):
+    vertices = mesh(60, 3)
+    indices = list(range(len(vertices)))
+    random.Random(3).shuffle(indices)
+    flat = Vector3Array.fromVectors([vertices[i] for i in indices])
+    bvh = BVH.fromTriangles(vertices, indices, split=split)
+    checkTriangles(bvh, flat)
+
+
+@pytest.mark.parametrize('split', SPLITS)
+def test_refit_after_move(split):
+    points = cloud(150, 4)
+    bvh = BVH.fromPoints(points, split=split)
+    rnd = random.Random(4)
+    for i in range(len(points)):
+        points[i] = points[i] + Vector3(rnd.uniform(-8, 8), rnd.uniform(-8, 8), rnd.uniform(-8, 8))
+    checkPoints(bvh.refit(), points.data)
+    moved = cloud(150, 5)
+    checkPoints(bvh.refit(moved), moved.data)
+
+    vertices = mesh(80, 6)
+    bvh = BVH.fromTriangles(vertices, split=split)
+    for i in range(len(vertices)):
+        vertices[i] = vertices[i] * 1.5 + Vector3(3, -2, 1)
+    checkTriangles(bvh.refit(), vertices)
+
+
+@pytest.mark.parametrize('split', SPLITS)
+def test_duplicate_points(split):
+    points = Vector3Array.fromVectors([Vector3(1, 2, 3)] * 20 + [Vector3(5, 5, 5)])
+    bvh = BVH.fromPoints(points, split=split)
+    assert bvh.kNearest(Vector3(1, 2, 3), 3) == [(0, 0.0), (1, 0.0), (2, 0.0)]
+    assert bvh.nearest(Vector3(5, 5, 6)) == (20, 1.0)
+
+
+def test_empty_trees():
+    for bvh in (BVH.fromPoints([]), BVH.fromTriangles([])):
+        assert len(bvh) == 0 and bvh.nodeCount == 0
+        assert bvh.nearest(Vector3()) is None
+        assert bvh.kNearest(Vector3(), 3) == []
+        assert bvh.withinRadius(Vector3(), 100.0) == []
+        assert bvh.refit() is bvh
+    assert BVH.fromTriangles([]).raycast(Vector3(), Vector3(0, 0, 1)) is None
+
+
+def test_max_distance():
+    points = Vector3Array.fromVectors([Vector3(0, 0, 0), Vector3(3, 0, 0)])
+    bvh = BVH.fromPoints(points)
+    assert bvh.nearest(Vector3(1, 0, 0), maxDistance=0.5) is None
+    assert bvh.nearest(Vector3(1, 0, 0), maxDistance=1.0) == (0, 1.0)
+    assert bvh.kNearest(Vector3(1, 0, 0), 5, maxDistance=2.0) == [(0, 1.0), (1, 4.0)]
+    assert bvh.kNearest(Vector3(1, 0, 0), 0) == []
+
+
+def test_invalid_arguments():
+    points = cloud(10, 1)
+    with pytest.raises(ValueError, match='unknown split'):
+        BVH.fromPoints(points, split='middle')
+    with pytest.raises(TypeError):
+        BVH.fromPoints(points).raycast(Vector3(), Vector3(0, 0, 1))
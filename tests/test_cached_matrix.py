@@ -0,0 +1,20 @@
+import copy
+import pickle
+import pytest
+from LitMath import CachedMatrix3, CachedMatrix4
+
+
+@pytest.mark.parametrize('cls, elements', [
+    (CachedMatrix4, (2.0, 0.0, 0.0, 1.0, 0.0, 3.0, 0.0, 2.0, 0.0, 0.0, 4.0, 3.0, 0.0, 0.0, 0.0, 1.0)),
+    (CachedMatrix3, (2.0, 0.0, 1.0, 0.0, 3.0, 2.0, 0.0, 0.0, 1.0)),
+])
+def test_copies_do_not_share_the_cache(cls, elements):
+    m = cls(*elements)
+    determinant = m.determinant
+    inverse = m.inverse
+    for c in (copy.copy(m), copy.deepcopy(m), pickle.loads(pickle.dumps(m)), m.copy()):
+        assert type(c) is cls
+        assert c == m and c.determinant == determinant
+        c.m11 = 7.0
+        assert c.determinant != determinant
+        assert m.determinant == determinant and m.inverse == inverse
@@ -0,0 +1,200 @@
+'''Conformance of the batch kernel backends.
+
+Every kernel of every available backend runs on random and edge-case inputs
+and is compared with the scalar Vector2, Vector3, Matrix3, Matrix4,
+Quaternion, AABB, Frustum and Ray operations within Util.EPSILON. Batches of
+several sizes are used so a backend's small-batch fallback and its vectorized
+path are both covered.
+'''
+import random
+import pytest
+from LitMath import AABB, Backend, Frustum, Matrix3, Matrix4, Quaternion, Ray, Util, Vector2, Vector3
+
+SIZES = (0, 1, 7, 100)
+
+# the parallel backend is checked with tiny parts so batches are really
+# split, over every inner backend in both modes: with NumPy installed
+# 'auto' would only pick threads
+OPTIONS = {'parallel': [{'workers': 2, 'threshold': 2, 'chunkSize': 3, 'inner': inner, 'mode': mode}
+                        for inner in Backend.available() if inner != 'parallel'
+                        for mode in ('thread', 'process')]}
+BACKENDS = [(name, options) for name in Backend.available() for options in OPTIONS.get(name, [{}])]
+
+
+def _id(param):
+    name, options = param
+    return ' '.join([name] + [options[k] for k in ('inner', 'mode') if k in options])
+
+
+@pytest.fixture(params=BACKENDS, ids=_id)
+def backend(request):
+    name, options = request.param
+    b = Backend.create(name, **options)
+    yield b
+    if hasattr(b, 'close'):
+        b.close()
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_kernels(backend, n):
+    failures = []
+    for name, expected, got in _cases(backend, random.Random(n), n):
+        expected = list(expected)
+        got = list(got)
+        if len(expected) != len(got):
+            failures.append((name, 'length', len(expected), len(got)))
+            continue
+        for i, (e, g) in enumerate(zip(expected, got)):
+            # exact for infinite values, like the bounds of empty boxes
+            if not (e == g or Util.isEqual(e, g)):
+                failures.append((name, i, e, g))
+                break
+    assert failures == []
+
+
+def _cases(backend, rnd, n):
+    # (kernel, expected floats, backend floats) of every kernel for batch size n
+    uniform = rnd.uniform
+    m3 = Matrix3(*[uniform(-2.0, 2.0) for _ in range(9)])
+    m4 = Matrix4(*[uniform(-2.0, 2.0) for _ in range(16)])
+    points2 = [Vector2(uniform(-10.0, 10.0), uniform(-10.0, 10.0)) for _ in range(n)]
+    points3 = [_vector3(uniform) for _ in range(n)]
+    if n:
+        points2[0] = Vector2()
+        points3[0] = Vector3()
+    flat2 = _flatten(points2)
+    flat3 = _flatten(points3)
+
+    for translate in (True, False):
+        for homogeneous in ((True, False) if translate else (False,)):
+            yield ('transform2', _flatten(_transform2(m3, p, translate, homogeneous) for p in points2),
+                   backend.transform2(m3.toBuffer(), flat2, translate, homogeneous))
+            yield ('transform3', _flatten(_transform3(m4, p, translate, homogeneous) for p in points3),
+                   backend.transform3(m4.toBuffer(), flat3, translate, homogeneous))
+
+    yield ('normalize2', _flatten(p.getNormalized() for p in points2), backend.normalize(flat2, 2))
+    yield ('normalize3', _flatten(p.getNormalized() for p in points3), backend.normalize(flat3, 3))
+
+    matrices = [_matrix4(uniform, k) for k in range(n)]
+    others = [_matrix4(uniform, k + 1) for k in range(n)]
+    flatMatrices = _flatten(m.toBuffer() for m in matrices)
+    yield ('multiply4', _flatten(a.multiply(b).toBuffer() for a, b in zip(matrices, others)),
+           backend.multiply4(flatMatrices, _flatten(m.toBuffer() for m in others), n))
+    yield ('multiply4 single', _flatten(m4.multiply(m).toBuffer() for m in matrices),
+           backend.multiply4(m4.toBuffer(), flatMatrices, n))
+    yield ('inverse4', _flatten(m.getInverse().toBuffer() for m in matrices),
+           backend.inverse4(flatMatrices))
+
+    quats = [Quaternion(*[uniform(-1.0, 1.0) for _ in range(4)]) for _ in range(n)]
+    rotations = [q.getNormalized() for q in quats]
+    if n:
+        quats[0] = Quaternion(0.0, 0.0, 0.0, 0.0)
+    flatQuats = _flatten(quats)
+    flatRotations = _flatten(rotations)
+    q = rotations[-1] if n else Quaternion()
+    yield ('multiplyQuaternions', _flatten(a.multiply(b) for a, b in zip(quats, rotations)),
+           backend.multiplyQuaternions(flatQuats, flatRotations, n))
+    yield ('multiplyQuaternions single', _flatten(q.multiply(b) for b in quats),
+           backend.multiplyQuaternions(_flatten([q]), flatQuats, n))
+    yield ('normalizeQuaternions', _flatten(q.getNormalized() for q in quats),
+           backend.normalizeQuaternions(flatQuats))
+    yield ('rotatePoints', _flatten(r.multiplyPoint(p) for r, p in zip(rotations, points3)),
+           backend.rotatePoints(flatRotations, flat3, n))
+    p = _vector3(uniform)
+    yield ('rotatePoints single', _flatten(r.multiplyPoint(p) for r in rotations),
+           backend.rotatePoints(flatRotations, _flatten([p]), n))
+
+    boxes = [_box(uniform) for _ in range(n)]
+    if n:
+        boxes[0] = AABB()
+    if n > 1:
+        # empty on one axis only, inside the probe's range on the others
+        boxes[1] = AABB(Vector3(0.0, 0.0, 0.0), Vector3(-1.0, 1.0, 1.0))
+    flatBoxes = _flatten(b.toBuffer() for b in boxes)
+    yield ('transformBoxes', _flatten(b.transform(m4).toBuffer() for b in boxes),
+           backend.transformBoxes(m4.toBuffer(), flatBoxes))
+    probe = _box(uniform)
+    yield ('overlapBoxes', [int(probe.intersects(b)) for b in boxes],
+           backend.overlapBoxes(probe.toBuffer(), flatBoxes))
+    wide = AABB(Vector3(-20.0, -20.0, -20.0), Vector3(20.0, 20.0, 20.0))
+    yield ('overlapBoxes wide', [int(wide.intersects(b)) for b in boxes],
+           backend.overlapBoxes(wide.toBuffer(), flatBoxes))
+    flat = AABB(Vector3(-20.0, -20.0, 20.0), Vector3(20.0, 20.0, -20.0))
+    yield ('overlapBoxes empty', [int(flat.intersects(b)) for b in boxes],
+           backend.overlapBoxes(flat.toBuffer(), flatBoxes))
+
+    # looks at the origin from z = 15, the random points lie partly outside
+    frustum = Frustum(Matrix4.perspective(60.0, 1.5, 1.0, 30.0) *
+                      Matrix4.lookAt(Vector3(0.0, 0.0, 15.0), Vector3(), Vector3(0.0, 1.0, 0.0)))
+    radii = [uniform(0.0, 3.0) for _ in range(n)]
+    yield ('cullSpheres', [int(frustum.intersectsSphere(p, r)) for p, r in zip(points3, radii)],
+           backend.cullSpheres(frustum.data, flat3, radii, n))
+    yield ('cullSpheres single radius', [int(frustum.intersectsSphere(p, 1.5)) for p in points3],
+           backend.cullSpheres(frustum.data, flat3, [1.5], n))
+    yield ('cullBoxes', [int(frustum.intersectsAABB(b)) for b in boxes],
+           backend.cullBoxes(frustum.data, flatBoxes))
+
+    # rays from the random points, every second one aimed at the centroid
+    # of its triangle, some parallel to an axis
+    triangles = [(_vector3(uniform), _vector3(uniform), _vector3(uniform)) for _ in range(n)]
+    rays = [Ray(p, _vector3(uniform)) for p in points3]
+    for k, (r, (a, b, c)) in enumerate(zip(rays, triangles)):
+        if k % 2:
+            r.direction = (a + b + c) * (1.0 / 3.0) - r.origin
+        elif k % 3 == 0:
+            r.direction.y = 0.0
+    flatRays = _flatten(r.toBuffer() for r in rays)
+    flatTriangles = _flatten(a.toBuffer() + b.toBuffer() + c.toBuffer() for a, b, c in triangles)
+    yield ('intersectTriangles', _flatten(_hit(r.intersectTriangle(*t)) for r, t in zip(rays, triangles)),
+           backend.intersectTriangles(flatRays, flatTriangles, n))
+    ray = rays[-1] if n else Ray(Vector3(), Vector3(0.0, 0.0, 1.0))
+    yield ('intersectTriangles single ray', _flatten(_hit(ray.intersectTriangle(*t)) for t in triangles),
+           backend.intersectTriangles(ray.toBuffer(), flatTriangles, n))
+    yield ('intersectBoxes', [_entry(r.intersectAABB(b)) for r, b in zip(rays, boxes)],
+           backend.intersectBoxes(flatRays, flatBoxes, n))
+    yield ('intersectBoxes single box', [_entry(r.intersectAABB(probe)) for r in rays],
+           backend.intersectBoxes(flatRays, probe.toBuffer(), n))
+
+def _vector3(uniform):
+    return Vector3(uniform(-10.0, 10.0), uniform(-10.0, 10.0), uniform(-10.0, 10.0))
+
+def _box(uniform):
+    return AABB.fromCenterExtents(_vector3(uniform),
+                                  Vector3(uniform(0.0, 5.0), uniform(0.0, 5.0), uniform(0.0, 5.0)))
+
+def _hit(tuv):
+    # the t, u, v floats of a kernel for a Ray.intersectTriangle result
+    return (float('inf'), 0.0, 0.0) if tuv is None else tuv
+
+def _entry(t):
+    return float('inf') if t is None else t
+
+def _matrix4(uniform, k):
+    # cycles through general, affine and singular matrices
+    m = Matrix4(*[uniform(-2.0, 2.0) for _ in range(16)])
+    if k % 3 == 1:
+        m.m41, m.m42, m.m43, m.m44 = 0.0, 0.0, 0.0, 1.0
+    elif k % 5 == 2:
+        m.m21, m.m22, m.m23, m.m24 = m.m11, m.m12, m.m13, m.m14
+    return m
+
+def _transform2(m, p, translate, homogeneous):
+    r = m.multiplyPoint(p) if translate else m.multiplyVector(p)
+    if homogeneous:
+        w = (m.m31 * p.x + m.m32 * p.y + m.m33) or 1.0
+        r = Vector2(r.x / w, r.y / w)
+    return r
+
+def _transform3(m, p, translate, homogeneous):
+    r = m.multiplyPoint(p) if translate else m.multiplyVector(p)
+    if homogeneous:
+        w = (m.m41 * p.x + m.m42 * p.y + m.m43 * p.z + m.m44) or 1.0
+        r = Vector3(r.x / w, r.y / w, r.z / w)
+    return r
+
+def _flatten(values):
+    # the components of value objects or buffers, as one list of floats
+    result = []
+    for v in values:
+        result.extend(v.toBuffer() if hasattr(v, 'toBuffer') else v)
+    return result
@@ -0,0 +1,20 @@
+import pytest
+from LitMath import Matrix3, Matrix4, Quaternion, Vector2, Vector3
+
+
+@pytest.mark.parametrize('base, value', [
+    (Vector2, Vector2(1, 2)),
+    (Vector3, Vector3(1, 2, 3)),
+    (Quaternion, Quaternion(0.5, 0.5, 0.5, 0.5)),
+    (Matrix3, Matrix3(1, 2, 3, 4, 5, 6, 7, 8, 10)),
+    (Matrix4, Matrix4(1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 17)),
+], ids=lambda p: getattr(p, '__name__', ''))
+def test_copy_keeps_subclasses(base, value):
+    Sub = type('Sub' + base.__name__, (base,), {'__slots__': []})
+    s = Sub.__new__(Sub)
+    for name in base.__slots__:
+        setattr(s, name, getattr(value, name))
+    c = s.copy()
+    assert type(c) is Sub and c == value and c is not s
+    c = value.copy()
+    assert type(c) is base and c == value and c is not value
@@ -0,0 +1,41 @@
+import pytest
+from LitMath import FactoryCache, Instrument, Matrix3, Matrix4, Quaternion, Vector3
+
+
+@pytest.fixture(autouse=True)
+def restore():
+    yield
+    Instrument.disable()
+    FactoryCache.disable()
+
+
+def factories():
+    axis = Vector3(1.0, 2.0, 3.0)
+    return [Matrix4.rotateX(30.0).toBuffer(), Matrix4.rotateY(45).toBuffer(),
+            Matrix4.rotateZ(12.5).toBuffer(), Matrix3.rotate(30.0).toBuffer(),
+            Matrix4.axisAngle(axis, 30.0).toBuffer(), Quaternion.axisAngle(axis, 30.0).toBuffer()]
+
+
+def test_cached_equals_uncached():
+    expected = factories()
+    for table in (False, True):
+        FactoryCache.enable(table=table)
+        assert factories() == expected
+        assert factories() == expected
+        FactoryCache.disable()
+    assert factories() == expected
+
+
+def test_disable_under_instrument():
+    expected = factories()
+    FactoryCache.enable()
+    Instrument.enable()
+    FactoryCache.disable()
+    assert not FactoryCache.isEnabled()
+    assert factories() == expected
+    Instrument.disable()
+    assert factories() == expected
+    FactoryCache.enable()
+    factories()
+    assert factories() == expected
+    assert FactoryCache.stats()['hits'] == 6
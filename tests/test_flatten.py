@@ -0,0 +1,40 @@
+import pytest
+from LitMath import Matrix3, Matrix4, Util, Vector3
+
+np = pytest.importorskip('numpy')
+
+# NumPy inputs in the layouts it hands out, with the coordinates they hold
+INPUTS = {
+    'int': (lambda: np.arange(6), range(6)),
+    'int Nx3': (lambda: np.arange(6).reshape(2, 3), range(6)),
+    'float32': (lambda: np.arange(6, dtype=np.float32), range(6)),
+    'float32 Nx3': (lambda: np.arange(6, dtype=np.float32).reshape(2, 3), range(6)),
+    'strided': (lambda: np.arange(12.0)[::2], range(0, 12, 2)),
+    'strided rows': (lambda: np.arange(12.0).reshape(4, 3)[::2], (0, 1, 2, 6, 7, 8)),
+    'strided columns': (lambda: np.arange(12.0).reshape(2, 6)[:, ::2], range(0, 12, 2)),
+    'Fortran order': (lambda: np.asfortranarray(np.arange(6.0).reshape(2, 3)), range(6)),
+    'scalar list': (lambda: [np.float64(v) for v in range(6)], range(6)),
+    'int scalar list': (lambda: list(np.arange(6)), range(6)),
+}
+
+
+@pytest.mark.parametrize('name', INPUTS)
+def test_numpy_inputs(backend, name):
+    make, coordinates = INPUTS[name]
+    c = [float(v) for v in coordinates]
+    m = Matrix4.translate(1, 2, 3)
+    expected = [e for i in (0, 3) for e in m.multiplyPoint(Vector3(*c[i:i + 3])).toBuffer()]
+    assert list(m.multiplyPoints(make())) == expected
+
+
+def test_matrix3_int_input(backend):
+    assert list(Matrix3.translate(1, 2).multiplyPoints(np.arange(4))) == [1.0, 3.0, 3.0, 5.0]
+
+
+def test_flatten_shares_contiguous_float64_only():
+    a = np.arange(6.0).reshape(2, 3)
+    view = Util.flatten(a, 3)
+    copy = Util.flatten(a[:, ::2], 2)
+    a[1, 2] = 9.0
+    assert view[5] == 9.0
+    assert list(copy) == [0.0, 2.0, 3.0, 5.0]
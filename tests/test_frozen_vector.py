@@ -0,0 +1,50 @@
+import copy
+import pickle
+import pytest
+from LitMath import FrozenVector2, FrozenVector3, Vector2, Vector3
+
+FROZEN = [(FrozenVector2, Vector2, ('x', 'y')), (FrozenVector3, Vector3, ('x', 'y', 'z'))]
+
+
+@pytest.mark.parametrize('frozen, mutable, names', FROZEN, ids=['2', '3'])
+def test_immutable(frozen, mutable, names):
+    v = frozen(*range(1, len(names) + 1))
+    for name in names + ('w',):
+        with pytest.raises(AttributeError):
+            setattr(v, name, 5.0)
+        with pytest.raises(AttributeError):
+            delattr(v, name)
+    assert v.toBuffer().tolist() == [float(k) for k in range(1, len(names) + 1)]
+    m = mutable(*range(1, len(names) + 1))
+    f = m.freeze()
+    m.x = 9.0
+    assert f.x == 1.0 and f == v
+    thawed = getattr(f, 'to' + mutable.__name__)()
+    thawed.x = 7.0
+    assert f.x == 1.0
+
+
+@pytest.mark.parametrize('frozen, mutable, names', FROZEN, ids=['2', '3'])
+def test_hash_agrees_with_eq(frozen, mutable, names):
+    n = len(names)
+    zero = frozen(*[0.0] * n)
+    negative = frozen(*[-0.0] * n)
+    assert zero == negative and hash(zero) == hash(negative)
+    assert len({zero, negative}) == 1
+    a = frozen(*[0.1 * k for k in range(n)])
+    b = frozen(*[0.1 * k for k in range(n)])
+    assert a == b and hash(a) == hash(b) and {a: 1}[b] == 1
+    # exact, unlike the tolerance of the mutable vectors
+    c = frozen(*[0.1 * k + 1e-9 for k in range(n)])
+    assert a != c and not a == c
+    assert mutable(*[0.1 * k for k in range(n)]) == mutable(*[0.1 * k + 1e-9 for k in range(n)])
+    assert a != mutable(*[0.1 * k for k in range(n)])
+    nan = frozen(*[float('nan')] * n)
+    assert nan != frozen(*[float('nan')] * n)
+
+
+@pytest.mark.parametrize('frozen, mutable, names', FROZEN, ids=['2', '3'])
+def test_copies(frozen, mutable, names):
+    v = frozen(*range(1, len(names) + 1))
+    for c in (copy.copy(v), copy.deepcopy(v), pickle.loads(pickle.dumps(v))):
+        assert type(c) is frozen and c == v and hash(c) == hash(v)
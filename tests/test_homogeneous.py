@@ -0,0 +1,27 @@
+from LitMath import Matrix3, Matrix4, TransformChain, Vector2, Vector2Array, Vector3, Vector3Array
+
+# w = z for the first matrix and w = y for the second, so the first point
+# of each batch lies on the w = 0 plane
+PROJECT4 = Matrix4(1, 0, 0, 0,
+                   0, 1, 0, 0,
+                   0, 0, 1, 1,
+                   0, 0, 1, 0)
+PROJECT3 = Matrix3(1, 0, 0,
+                   0, 1, 0,
+                   0, 1, 0)
+
+
+def test_matrix4_zero_w_is_not_divided(backend):
+    points = [Vector3(2, 3, 0), Vector3(2, 4, 2)]
+    expected = [2.0, 3.0, 1.0, 1.0, 2.0, 1.5]
+    assert list(PROJECT4.multiplyPoints(Vector3Array.fromVectors(points), homogeneous=True).data) == expected
+    assert [c for p in PROJECT4.multiplyPoints(points, homogeneous=True) for c in p.toBuffer()] == expected
+    transform = TransformChain().matrix(PROJECT4).compile(homogeneous=True)
+    assert list(transform(Vector3Array.fromVectors(points)).data) == expected
+
+
+def test_matrix3_zero_w_is_not_divided(backend):
+    points = [Vector2(2, 0), Vector2(3, 2)]
+    expected = [2.0, 0.0, 1.5, 1.0]
+    assert list(PROJECT3.multiplyPoints(Vector2Array.fromVectors(points), homogeneous=True).data) == expected
+    assert [c for p in PROJECT3.multiplyPoints(points, homogeneous=True) for c in p.toBuffer()] == expected
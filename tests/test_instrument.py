@@ -0,0 +1,61 @@
+import pytest
+from LitMath import FactoryCache, Instrument, Matrix4, Vector3
+
+
+@pytest.fixture(autouse=True)
+def restore():
+    Instrument.reset()
+    yield
+    Instrument.disable()
+    FactoryCache.disable()
+
+
+def calls(name):
+    return Instrument.snapshot().get(name, {}).get('calls', 0)
+
+
+def test_counts_and_restores():
+    add = Vector3.__dict__['__add__']
+    Instrument.enable()
+    Vector3(1.0, 2.0, 3.0) + Vector3(1.0, 1.0, 1.0)
+    assert calls('Vector3.__add__') == 1
+    Instrument.disable()
+    assert Vector3.__dict__['__add__'] is add
+    Vector3(1.0, 2.0, 3.0) + Vector3(1.0, 1.0, 1.0)
+    assert calls('Vector3.__add__') == 1
+
+
+def test_disable_under_factory_cache():
+    expected = Matrix4.rotateX(30.0).toBuffer()
+    Instrument.enable()
+    FactoryCache.enable()
+    Instrument.disable()
+    assert FactoryCache.isEnabled()
+    Matrix4.rotateX(30.0)
+    assert Matrix4.rotateX(30.0).toBuffer() == expected
+    assert FactoryCache.stats()['hits'] == 1
+    assert calls('Matrix4.rotateX') == 0
+    FactoryCache.disable()
+    assert Matrix4.rotateX(30.0).toBuffer() == expected
+    assert calls('Matrix4.rotateX') == 0
+    Instrument.enable()
+    Matrix4.rotateX(30.0)
+    assert calls('Matrix4.rotateX') == 1
+
+
+def test_interleaved_enable_disable():
+    expected = Matrix4.rotateY(30.0).toBuffer()
+    for first, second in ((Instrument, FactoryCache), (FactoryCache, Instrument)):
+        for outer in ((first, second), (second, first)):
+            first.enable()
+            second.enable()
+            outer[0].disable()
+            outer[1].disable()
+            assert not Instrument.isEnabled() and not FactoryCache.isEnabled()
+            Instrument.reset()
+            assert Matrix4.rotateY(30.0).toBuffer() == expected
+            assert calls('Matrix4.rotateY') == 0
+    # a fresh enable counts every call once
+    Instrument.enable()
+    Matrix4.rotateY(30.0)
+    assert calls('Matrix4.rotateY') == 1
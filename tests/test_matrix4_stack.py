@@ -0,0 +1,69 @@
+import math
+import random
+from array import array
+import pytest
+from LitMath import Matrix4, Matrix4Stack, Vector3, Vector3Array
+
+
+def matrices(n, seed=1):
+    # general, affine and singular matrices
+    rnd = random.Random(seed)
+    result = []
+    for k in range(n):
+        m = Matrix4(*[rnd.uniform(-2.0, 2.0) for _ in range(16)])
+        if k % 3 == 1:
+            m.m41, m.m42, m.m43, m.m44 = 0.0, 0.0, 0.0, 1.0
+        elif k % 5 == 2:
+            m.m21, m.m22, m.m23, m.m24 = m.m11, m.m12, m.m13, m.m14
+        result.append(m)
+    return result
+
+
+def same(stack, expected):
+    # exact agreement, compared as bytes so even the sign of zeros counts
+    assert len(stack) == len(expected)
+    for m, e in zip(stack, expected):
+        assert m.toBuffer().tobytes() == e.toBuffer().tobytes()
+
+
+def test_products(backend):
+    a = matrices(20)
+    b = matrices(20, seed=2)
+    sa = Matrix4Stack.fromMatrices(a)
+    sb = Matrix4Stack.fromMatrices(b)
+    same(Matrix4Stack.multiply(sa, sb), [x.multiply(y) for x, y in zip(a, b)])
+    same(sa * b[0], [x.multiply(b[0]) for x in a])
+    same(Matrix4Stack.multiply(b[0], sa), [b[0].multiply(x) for x in a])
+
+
+def test_derived(backend):
+    a = matrices(20)
+    stack = Matrix4Stack.fromMatrices(a)
+    assert stack.determinant.tobytes() == array('d', [m.determinant for m in a]).tobytes()
+    same(stack.inverse, [m.getInverse() for m in a])
+    same(stack.transpose, [m.getTranspose() for m in a])
+
+
+def test_singular_inverse_is_identity(backend):
+    singular = Matrix4(1.0, 2.0, 3.0, 4.0, 2.0, 4.0, 6.0, 8.0, 0.0, 1.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
+    assert singular.determinant == 0.0
+    same(Matrix4Stack.fromMatrices([singular] * 5).inverse, [singular.getInverse()] * 5)
+    same(Matrix4Stack.fromMatrices([singular] * 5).inverse, [Matrix4()] * 5)
+
+
+def test_factories(backend):
+    rnd = random.Random(3)
+    angles = [rnd.uniform(-360.0, 360.0) for _ in range(20)] + [0.0, 90.0, -180.0]
+    vectors = [Vector3(rnd.uniform(-5.0, 5.0), rnd.uniform(-5.0, 5.0), rnd.uniform(-5.0, 5.0))
+               for _ in angles]
+    vectors[0] = Vector3()
+    packed = Vector3Array.fromVectors(vectors)
+    same(Matrix4Stack.translate(packed), [Matrix4.translate(v.x, v.y, v.z) for v in vectors])
+    same(Matrix4Stack.scale(packed), [Matrix4.scale(v.x, v.y, v.z) for v in vectors])
+    same(Matrix4Stack.rotateX(angles), [Matrix4.rotateX(a) for a in angles])
+    same(Matrix4Stack.rotateY(angles), [Matrix4.rotateY(a) for a in angles])
+    same(Matrix4Stack.rotateZ(angles), [Matrix4.rotateZ(a) for a in angles])
+    same(Matrix4Stack.rotateXInRadian([math.radians(a) for a in angles]),
+         [Matrix4.rotateXInRadian(math.radians(a)) for a in angles])
+    same(Matrix4Stack.axisAngle(packed, angles), [Matrix4.axisAngle(v, a) for v, a in zip(vectors, angles)])
+    same(Matrix4Stack.axisAngle(vectors[1], angles), [Matrix4.axisAngle(vectors[1], a) for a in angles])
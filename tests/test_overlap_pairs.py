@@ -0,0 +1,73 @@
+import random
+import pytest
+from LitMath import AABB, AABBArray, Vector3
+
+
+def overlaps(a, b):
+    # closed boxes, so touching counts, and a box empty on any axis meets nothing
+    return all(a[k] <= a[k + 3] and b[k] <= b[k + 3] and a[k] <= b[k + 3] and b[k] <= a[k + 3]
+               for k in range(3))
+
+
+def boxes(n, seed):
+    # integer corners on a small lattice, so many boxes touch exactly; some
+    # are flat or points, some are empty on one axis and some repeat
+    rnd = random.Random(seed)
+    result = []
+    for i in range(n):
+        low = [rnd.randrange(0, 8) for _ in range(3)]
+        high = [v + rnd.randrange(0, 3) for v in low]
+        if i % 9 == 4:
+            axis = rnd.randrange(3)
+            low[axis], high[axis] = high[axis] + 1, low[axis]
+        if i % 13 == 6 and result:
+            result.append(result[rnd.randrange(len(result))])
+            continue
+        result.append(tuple(float(v) for v in low + high))
+    return result
+
+
+def pack(boxes):
+    return AABBArray([c for b in boxes for c in b])
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('n', [0, 1, 2, 40, 150])
+def test_self_pairs(seed, n):
+    b = boxes(n, seed)
+    expected = [(i, j) for i in range(n) for j in range(i + 1, n) if overlaps(b[i], b[j])]
+    assert pack(b).overlapPairs() == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('n, m', [(0, 5), (5, 0), (1, 1), (30, 70), (120, 40)])
+def test_two_arrays(seed, n, m):
+    a = boxes(n, seed)
+    b = boxes(m, seed + 100)
+    expected = [(i, j) for i in range(n) for j in range(m) if overlaps(a[i], b[j])]
+    assert pack(a).overlapPairs(pack(b)) == expected
+
+
+def test_agrees_with_intersects():
+    b = boxes(80, 7)
+    array = pack(b)
+    pairs = set(array.overlapPairs())
+    for i in range(len(b)):
+        for j in range(i + 1, len(b)):
+            assert ((i, j) in pairs) == array[i].intersects(array[j])
+
+
+def test_touching_and_empty():
+    unit = AABB(Vector3(0, 0, 0), Vector3(1, 1, 1))
+    array = AABBArray.fromBoxes([
+        unit,
+        AABB(Vector3(1, 0, 0), Vector3(2, 1, 1)),               # shares a face with 0
+        AABB(Vector3(2, 1, 1), Vector3(3, 2, 2)),               # shares a corner with 1
+        AABB(Vector3(0.5, 0.5, 0.5), Vector3(0.5, 0.5, 0.5)),   # a point inside 0
+        AABB(Vector3(0, 0, 0), Vector3(-1, 1, 1)),              # empty on x
+        AABB(Vector3(0, 0, 0), Vector3(1, 1, 1)),               # a repeat of 0
+        AABB(Vector3(3.0001, 0, 0), Vector3(4, 1, 1)),          # just apart from 2
+    ])
+    assert array.overlapPairs() == [(0, 1), (0, 3), (0, 5), (1, 2), (1, 5), (3, 5)]
+    empty = AABBArray.fromBoxes([AABB(Vector3(0, 0, 0), Vector3(-1, 1, 1))])
+    assert array.overlapPairs(empty) == [] and empty.overlapPairs(array) == []
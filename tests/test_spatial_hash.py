@@ -0,0 +1,102 @@
+import math
+import random
+import pytest
+from LitMath import FrozenVector3, SpatialHash, Util, Vector2, Vector2Array, Vector3, Vector3Array
+
+
+def pairwise(points, tolerance):
+    # the O(n^2) loop weld stands for: every point joins the first unique
+    # point it matches within tolerance, as == does at Util.EPSILON
+    unique = []
+    remap = []
+    for p in points:
+        for k, u in enumerate(unique):
+            if all(abs(a - b) < tolerance for a, b in zip(u, p)):
+                remap.append(k)
+                break
+        else:
+            remap.append(len(unique))
+            unique.append(p)
+    return unique, remap
+
+
+def crowded(n, size, tolerance, seed):
+    # points on a coarse lattice jittered by about the tolerance, so many
+    # pairs sit just inside, just outside and across cell boundaries
+    rnd = random.Random(seed)
+    points = []
+    for _ in range(n):
+        base = [rnd.randrange(-3, 3) * 4 * tolerance for _ in range(size)]
+        points.append(tuple(b + rnd.choice((0.0, 0.0, rnd.uniform(-1.5, 1.5) * tolerance)) for b in base))
+    return points
+
+
+def check(points, size, tolerance=None):
+    unique, remap = SpatialHash.weld(points, tolerance, size)
+    flat = [tuple(float(v) for v in p) for p in points]
+    expected, expectedRemap = pairwise(flat, Util.EPSILON if tolerance is None else tolerance)
+    assert list(remap) == expectedRemap
+    assert [tuple(u.toBuffer()) for u in unique] == expected
+
+
+@pytest.mark.parametrize('size', [2, 3])
+@pytest.mark.parametrize('tolerance', [None, 0.25])
+@pytest.mark.parametrize('seed', range(4))
+def test_weld_matches_pairwise(size, tolerance, seed):
+    check(crowded(300, size, Util.EPSILON if tolerance is None else tolerance, seed), size, tolerance)
+
+
+def test_weld_input_kinds():
+    points = crowded(60, 3, Util.EPSILON, 9)
+    vectors = [Vector3(*p) for p in points]
+    expected = SpatialHash.weld(points, size=3)
+    for kind in (vectors, Vector3Array.fromVectors(vectors), [v.freeze() for v in vectors],
+                 [c for p in points for c in p]):
+        unique, remap = SpatialHash.weld(kind, size=3)
+        assert isinstance(unique, Vector3Array)
+        assert unique.data == expected[0].data and remap == expected[1]
+    unique, remap = SpatialHash.weld([Vector2(0, 0), Vector2(1, 1), Vector2(0, Util.EPSILON / 2)])
+    assert isinstance(unique, Vector2Array)
+    assert unique.toVectors() == [Vector2(0, 0), Vector2(1, 1)] and list(remap) == [0, 1, 0]
+
+
+def test_weld_chains_join_the_first_point():
+    # b matches a and c, c does not match a: c starts a group of its own
+    t = Util.EPSILON
+    points = [(0.0, 0.0, 0.0), (0.6 * t, 0.0, 0.0), (1.2 * t, 0.0, 0.0), (0.7 * t, 0.0, 0.0)]
+    check(points, 3)
+    assert list(SpatialHash.weld(points, size=3)[1]) == [0, 0, 1, 0]
+
+
+def test_weld_non_finite_points_never_match():
+    inf = float('inf')
+    nan = float('nan')
+    points = [(inf, 0.0, 0.0), (inf, 0.0, 0.0), (nan, 1.0, 2.0), (0.0, 0.0, 0.0), (0.0, -0.0, 0.0)]
+    unique, remap = SpatialHash.weld(points, size=3)
+    assert list(remap) == [0, 1, 2, 3, 3]
+    assert math.isnan(unique[2].x)
+
+
+def test_weld_empty():
+    unique, remap = SpatialHash.weld([])
+    assert len(unique) == 0 and len(remap) == 0
+    assert isinstance(SpatialHash.weld([], size=2)[0], Vector2Array)
+
+
+def test_find_and_query_match_brute_force():
+    t = 0.1
+    points = crowded(200, 3, t, 5)
+    grid = SpatialHash(3, t)
+    for p in points:
+        grid.add(p)
+    for q in crowded(50, 3, t, 6):
+        matches = [j for j, p in enumerate(points) if all(abs(a - b) < t for a, b in zip(p, q))]
+        assert grid.query(q) == matches
+        assert grid.find(q) == (matches[0] if matches else None)
+        assert grid.find(Vector3(*q)) == grid.find(FrozenVector3(*q))
+
+
+def test_tolerance_must_be_positive():
+    for tolerance in (0.0, -1.0, float('nan')):
+        with pytest.raises(ValueError):
+            SpatialHash(3, tolerance)
@@ -0,0 +1,21 @@
+import io
+import pytest
+from LitMath import Storage, Vector3, Vector3Array
+
+
+@pytest.mark.parametrize('dtype', ['d', 'f'])
+@pytest.mark.parametrize('cut', [1, 5, 12])
+def test_load_truncated(dtype, cut):
+    f = io.BytesIO()
+    Storage.save(f, Vector3Array.fromVectors([Vector3(1, 2, 3), Vector3(4, 5, 6)]), dtype=dtype)
+    data = f.getvalue()
+    with pytest.raises(ValueError, match='truncated file, expected 2 records'):
+        Storage.load(io.BytesIO(data[:-cut]))
+
+
+def test_load_round_trip():
+    f = io.BytesIO()
+    a = Vector3Array.fromVectors([Vector3(1, 2, 3), Vector3(4, 5, 6)])
+    Storage.save(f, a)
+    f.seek(0)
+    assert Storage.load(f) == a
@@ -0,0 +1,80 @@
+import threading
+import pytest
+from LitMath import Matrix4, Quaternion, Storage, Stream, Vector3, Vector3Array
+
+ROTATION = Quaternion.axisAngle(Vector3(1, 2, 3), 40)
+MATRIX = Matrix4.translate(1, -2, 0.5) * Matrix4.rotateY(25)
+
+
+def cloud(n):
+    return Vector3Array([0.37 * k - 5.0 for k in range(3 * n)])
+
+
+def prefetchThreads():
+    return [t for t in threading.enumerate() if t.name == 'LitMath.Stream prefetch']
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / 'in.lm')
+    Storage.save(path, cloud(103))
+    return path
+
+
+@pytest.mark.parametrize('prefetch', [False, True])
+@pytest.mark.parametrize('chunkSize', [1, 10, 103, 1000])
+@pytest.mark.parametrize('transform', [MATRIX, ROTATION], ids=['Matrix4', 'Quaternion'])
+def test_round_trip(tmp_path, source, transform, chunkSize, prefetch):
+    target = str(tmp_path / 'out.lm')
+    chunks = Stream.transform(source, transform, chunkSize, prefetch)
+    assert Stream.write(target, chunks) == 103
+    result = Storage.load(target)
+    assert isinstance(result, Vector3Array)
+    # the exact values of the scalar methods, whatever the chunking
+    assert result.data == Vector3Array.fromVectors([transform.multiplyPoint(v) for v in cloud(103)]).data
+    assert not prefetchThreads()
+
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_read_chunks(source, prefetch):
+    chunks = list(Stream.read(source, 10, prefetch))
+    assert [len(c) for c in chunks] == [10] * 10 + [3]
+    assert Vector3Array([c for chunk in chunks for c in chunk.data]).data == cloud(103).data
+    for other in (cloud(103), cloud(103).toVectors(), [tuple(v.toBuffer()) for v in cloud(103)],
+                  [cloud(50), cloud(53)]):
+        assert [len(c) for c in Stream.read(other, 10, prefetch)] == [10] * 10 + [3]
+
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_transform_error(tmp_path, source, prefetch):
+    target = str(tmp_path / 'out.lm')
+    seen = []
+
+    def failing(chunk):
+        if len(seen) == 3:
+            raise RuntimeError('transform failed')
+        seen.append(len(chunk))
+        return chunk
+
+    with pytest.raises(RuntimeError, match='transform failed'):
+        Stream.write(target, Stream.transform(source, failing, 10, prefetch))
+    # the chunks before the failure are in a readable file
+    assert Storage.load(target).data == cloud(30).data
+    assert not prefetchThreads()
+
+
+def test_source_error():
+    def points():
+        yield Vector3(1, 2, 3)
+        raise ValueError('bad source')
+
+    with pytest.raises(ValueError, match='bad source'):
+        list(Stream.read(points(), 1, prefetch=True))
+    assert not prefetchThreads()
+
+
+def test_abandoned_prefetch_stops():
+    chunks = Stream.read(cloud(100), 1, prefetch=True)
+    next(chunks)
+    chunks.close()
+    assert not prefetchThreads()
@@ -0,0 +1,103 @@
+import random
+import pytest
+from LitMath import Backend, Matrix4, Quaternion, TransformChain, Util, Vector3, Vector3Array
+
+AXIS = Vector3(1, 2, -2)
+PROJECTION = Matrix4(1.5, 0, 0.2, 0,
+                     0, 2, 0.1, 0,
+                     0, 0, -1.1, -0.2,
+                     0, 0, -1, 0)
+
+# (chain, parameter values, the factories it stands for in call order)
+CHAINS = [
+    ('constant', TransformChain().scale(2, 3, 4).rotateZ(30).translate(1, -2, 3), {},
+     [Matrix4.scale(2, 3, 4), Matrix4.rotateZ(30), Matrix4.translate(1, -2, 3)]),
+    ('free translate', TransformChain().rotateX(45).translate('tx', 'ty', 0), {'tx': 2.5, 'ty': -1.0},
+     [Matrix4.rotateX(45), Matrix4.translate(2.5, -1.0, 0)]),
+    ('free angles', TransformChain().rotateY('a').rotateXInRadian('b').scale('s', 1, 's'),
+     {'a': 33.0, 'b': 0.7, 's': 1.5},
+     [Matrix4.rotateY(33.0), Matrix4.rotateXInRadian(0.7), Matrix4.scale(1.5, 1, 1.5)]),
+    ('axis angle', TransformChain().axisAngle(AXIS, 'a').axisAngleInRadian(AXIS, 0.4), {'a': -70.0},
+     [Matrix4.axisAngle(AXIS, -70.0), Matrix4.axisAngleInRadian(AXIS, 0.4)]),
+    ('quaternions', TransformChain().rotate('q').rotate(Quaternion.axisAngle(AXIS, 20)).rotateZInRadian('z'),
+     {'q': Quaternion.axisAngle(Vector3(0, 1, 1), 50), 'z': 1.2},
+     [Quaternion.axisAngle(Vector3(0, 1, 1), 50).toMatrix4(), Quaternion.axisAngle(AXIS, 20).toMatrix4(),
+      Matrix4.rotateZInRadian(1.2)]),
+    ('matrices', TransformChain().matrix('m').translate(0, 0, -5).matrix(PROJECTION),
+     {'m': Matrix4.rotateX(10) * Matrix4.scale(1, 2, 1)},
+     [Matrix4.rotateX(10) * Matrix4.scale(1, 2, 1), Matrix4.translate(0, 0, -5), PROJECTION]),
+    ('empty', TransformChain(), {}, []),
+]
+
+
+def dense(factories):
+    m = Matrix4()
+    for f in factories:
+        m = f * m
+    return m
+
+
+def points(n):
+    rnd = random.Random(n)
+    return [Vector3(rnd.uniform(-5, 5), rnd.uniform(-5, 5), rnd.uniform(-5, 5)) for _ in range(n)]
+
+
+def close(a, b):
+    return len(a) == len(b) and all(Util.isEqual(x, y) for x, y in zip(a, b))
+
+
+@pytest.fixture(autouse=True)
+def emptyCache():
+    TransformChain.clearCache()
+    yield
+    TransformChain.clearCache()
+
+
+@pytest.mark.parametrize('name, chain, params, factories', CHAINS, ids=[c[0] for c in CHAINS])
+@pytest.mark.parametrize('n', [0, 1, 7])
+def test_compiled_matches_dense_product(backend, name, chain, params, factories, n):
+    m = dense(factories)
+    assert chain.matrix4(**params) == m
+    vectors = points(n)
+    for homogeneous in (False, True):
+        transform = chain.compile(homogeneous)
+        expected = m.multiplyPoints(Vector3Array.fromVectors(vectors), homogeneous=homogeneous).data
+        assert close(transform(Vector3Array.fromVectors(vectors), **params).data, expected)
+        assert close(transform(Vector3Array.fromVectors(vectors).data, **params), expected)
+        result = transform(vectors, **params)
+        assert all(isinstance(v, Vector3) for v in result)
+        assert close([c for v in result for c in v.toBuffer()], expected)
+        out = Vector3Array.zeros(n)
+        assert transform(vectors, out=out, **params) is out
+        assert close(out.data, expected)
+
+
+def test_positional_parameters(backend):
+    chain = TransformChain().translate('tx', 0, 0).rotateZ('a')
+    assert chain.parameters == ['tx', 'a']
+    transform = chain.compile()
+    assert close(transform([Vector3(1, 0, 0)], 1.0, 90.0)[0].toBuffer(), [0.0, 2.0, 0.0])
+
+
+def test_cache_key_includes_the_threshold():
+    if 'numpy' not in Backend.available():
+        pytest.skip('needs NumPy')
+    chain = TransformChain().translate('tx', 0, 0)
+    try:
+        Backend.use('numpy', threshold=2)
+        small = chain.source()
+        Backend.use('numpy', threshold=1000)
+        large = chain.source()
+        Backend.use('python')
+        python = chain.source()
+    finally:
+        Backend.use()
+    assert 'len(_flat) < 6:' in small and 'len(_flat) < 3000:' in large
+    assert 'len(_flat) <' not in python
+    assert TransformChain.cacheInfo()[1:] == (3, 3)
+
+
+def test_invalid_parameter_names():
+    for name in ('points', 'out', '_x', 'len', 'class', '1a'):
+        with pytest.raises(ValueError):
+            TransformChain().translate(name, 0, 0)
@@ -0,0 +1,91 @@
+from array import array
+import pytest
+from LitMath import Matrix3, Matrix4, Quaternion, Util, Vector2, Vector2Array, Vector3, Vector3Array
+
+
+def test_matrix4_out_is_written_in_place():
+    m = Matrix4.translate(1, 2, 3)
+    points = Vector3Array(range(6))
+    data = array('d', bytes(48))
+    out = Vector3Array.fromBuffer(data)
+    assert m.multiplyPoints(points, out) is out
+    assert list(data) == [1.0, 3.0, 5.0, 4.0, 6.0, 8.0]
+
+
+@pytest.mark.parametrize('out', [Vector3Array(range(3)), Vector3Array(range(9)),
+                                 Vector3Array.fromBuffer(array('d', bytes(24)))])
+def test_matrix4_out_must_match(out):
+    before = list(out.data)
+    with pytest.raises(AssertionError):
+        Matrix4().multiplyPoints(Vector3Array(range(6)), out)
+    assert list(out.data) == before
+
+
+def test_matrix3_out_must_match():
+    with pytest.raises(AssertionError):
+        Matrix3().multiplyPoints(Vector2Array(range(4)), Vector2Array.fromBuffer(array('d', bytes(16))))
+
+
+# every accepted pairing of the kind of values with the kind of out
+PAIRS = [('vectors', 'vectors'), ('vectors', 'array'), ('array', 'array'), ('array', 'buffer'),
+         ('buffer', 'array'), ('buffer', 'buffer')]
+
+
+def make(kind, points, cls, arrayCls):
+    if kind == 'vectors':
+        return [cls(*p.toBuffer()) for p in points]
+    if kind == 'array':
+        return arrayCls.fromVectors(points)
+    return arrayCls.fromVectors(points).data
+
+
+def flat(out):
+    # the written floats of any out kind
+    if isinstance(out, list):
+        return [c for v in out for c in v.toBuffer()]
+    if isinstance(out, (Vector2Array, Vector3Array)):
+        return list(out.data)
+    return list(out)
+
+
+def close(a, b):
+    return len(a) == len(b) and all(Util.isEqual(x, y) for x, y in zip(a, b))
+
+
+@pytest.mark.parametrize('kind, outKind', PAIRS)
+def test_matrix4_out_kinds(backend, kind, outKind):
+    m = Matrix4.translate(1, 2, 3) * Matrix4.rotateZ(30)
+    points = [Vector3(1, 2, 3), Vector3(-4, 5, 0.5), Vector3(0, 0, -2)]
+    values = make(kind, points, Vector3, Vector3Array)
+    zeros = [Vector3() for _ in points]
+    out = make(outKind, zeros, Vector3, Vector3Array)
+    assert m.multiplyPoints(values, out) is out
+    assert close(flat(out), [c for p in points for c in m.multiplyPoint(p).toBuffer()])
+
+
+@pytest.mark.parametrize('kind, outKind', PAIRS)
+def test_matrix3_out_kinds(backend, kind, outKind):
+    m = Matrix3.translate(1, 2) * Matrix3.rotate(30)
+    points = [Vector2(1, 2), Vector2(-4, 0.5), Vector2(0, -2)]
+    values = make(kind, points, Vector2, Vector2Array)
+    zeros = [Vector2() for _ in points]
+    out = make(outKind, zeros, Vector2, Vector2Array)
+    assert m.multiplyPoints(values, out) is out
+    assert close(flat(out), [c for p in points for c in m.multiplyPoint(p).toBuffer()])
+
+
+def test_quaternion_out_array(backend):
+    q = Quaternion.axisAngle(Vector3(0, 0, 1), 90)
+    points = [Vector3(1, 2, 3), Vector3(-4, 5, 0.5), Vector3(0, 0, -2)]
+    out = Vector3Array.zeros(3)
+    assert q.multiplyPoints(points, out) is out
+    assert close(flat(out), [c for p in points for c in q.multiplyPoint(p).toBuffer()])
+
+
+def test_out_must_hold_vectors():
+    with pytest.raises(AssertionError):
+        Matrix4().multiplyPoints([Vector3(1, 2, 3)], [0.0])
+    with pytest.raises(AssertionError):
+        Matrix3().multiplyPoints([Vector2(1, 2)], [None])
+    with pytest.raises(AssertionError):
+        Matrix4().multiplyPoints([Vector3(1, 2, 3)], array('d', bytes(24)))